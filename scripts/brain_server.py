@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Brain Server - asyncio front end serving many bridge channels at once
+======================================================================
+Today's brain blocks on one FIFO. This front end runs one asyncio event
+loop over any number of request channels - FIFO pairs and Unix-socket
+connections, typically one per traced subtree - so several interceptors on
+one host can share a single brain process.
+
+    channel        read side               write side
+    FIFO pair      <name>_req (O_RDWR)     <name>_resp (O_RDWR)
+    Unix socket    accepted connection     same connection
+
+Every channel fd is non-blocking and registered with the loop. A readable
+channel is drained in one read(), its whole batch decided, and the verdicts
+written back in one write(); whatever the peer is not ready to take is kept
+in that channel's outbox and flushed when the fd turns writable. A slow or
+stalled interceptor therefore never holds up the other channels.
+
+Both per-channel buffers are bounded. Once MAX_OUTBOX verdict bytes are
+waiting, the channel is not read again until its outbox has drained, so a
+peer that never reads its verdicts stops being served rather than growing
+the brain. More than MAX_LINE bytes without a newline is no interceptor
+talking: the channel is closed.
+
+Protocol (same as the single-FIFO bridge, see ipc_benchmark.py):
+    SYSCALL:<verb>:<argument>\\n      →  <verdict>\\n          in order
+    SEQ:<seq>:<verb>:<argument>\\n    →  <seq>:<verdict>\\n    any order
+
+FIFOs are opened O_RDWR so neither open() blocks on the interceptor and an
+interceptor restarting does not EOF the channel (Linux semantics).
+
+asyncio, socket and signal are imported by BrainServer, not at module
+level: asyncio alone costs tens of milliseconds of startup, and the protocol
+helpers (answer_lines, PolicyDecider) are used without a server too.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    server = BrainServer(PolicyDecider(SemanticMapper(), ExfiltrationDetector()))
+    server.add_fifo_channel("/tmp/sentinel_req", "/tmp/sentinel_resp")
+    server.add_unix_listener("/run/sentinel/brain.sock")
+    server.run()                         # until SIGTERM / SIGINT
+"""
+
+import errno
+import os
+
+ALLOW = b"1"
+BLOCK = b"0"
+
+MAX_LINE = 65536            # pending bytes without a newline before a channel is dropped
+MAX_OUTBOX = 1 << 20        # unsent verdict bytes before a channel stops being read
+
+
+# ═══════════════════════════════════════════════════════════════
+#  PROTOCOL
+# ═══════════════════════════════════════════════════════════════
+
+def answer_lines(lines, decide):
+    """
+    Verdict bytes for a batch of request lines (without trailing newlines).
+
+    decide(verb, argument) -> ALLOW / BLOCK. Every line is decided in
+    arrival order, since a stateful detector must see events as they
+    happened; only the replies are regrouped, untagged SYSCALL verdicts
+    first and in order, tagged SEQ verdicts after them. Unknown or
+    malformed lines are answered BLOCK.
+    """
+    in_order, tagged = [], []
+    for line in lines:
+        kind, _, rest = line.partition(b":")
+        if kind == b"SEQ":
+            fields = rest.split(b":", 2)
+            verdict = decide(fields[1], fields[2]) if len(fields) == 3 else BLOCK
+            tagged.append(b"%s:%s\n" % (fields[0], verdict))
+        elif kind == b"SYSCALL":
+            verb, _, argument = rest.partition(b":")
+            in_order.append(decide(verb, argument) + b"\n")
+        else:
+            in_order.append(BLOCK + b"\n")
+    return b"".join(in_order + tagged)
+
+
+class PolicyDecider:
+    """
+    Fan a request out to a SemanticMapper and an ExfiltrationDetector.
+
+    The text protocol carries no pid, so each channel (one traced subtree)
+    is one detector key. Any mapper with classify() and any detector with
+    process_event() will do, e.g. PathClassifier + SequenceDetector.
+    """
+
+    def __init__(self, mapper, detector):
+        self.mapper = mapper
+        self.detector = detector
+
+    def for_channel(self, channel_id):
+        classify = self.mapper.classify
+        process_event = self.detector.process_event
+
+        def decide(verb, argument):
+            verb = verb.decode()
+            concept = classify(argument.decode("utf-8", "surrogateescape")) if argument.startswith(b"/") else ""
+            verdict = process_event(channel_id, verb, {}, concept)
+            return BLOCK if verdict and verdict.alert else ALLOW
+        return decide
+
+
+# ═══════════════════════════════════════════════════════════════
+#  CHANNELS
+# ═══════════════════════════════════════════════════════════════
+
+class Channel:
+    """One interceptor connection: non-blocking fds, line buffer, outbox."""
+
+    def __init__(self, server, name, read_fd, write_fd):
+        self.server = server
+        self.name = name
+        self.read_fd = read_fd
+        self.write_fd = write_fd
+        self.decide = server.decider.for_channel(server.next_channel_id())
+        self.pending = b""
+        self.outbox = bytearray()
+        self.requests = 0
+        self.batches = 0
+        self.paused = False
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        server.loop.add_reader(read_fd, self.on_readable)
+
+    def on_readable(self):
+        try:
+            data = os.read(self.read_fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self.close()
+            return
+        *lines, self.pending = (self.pending + data).split(b"\n")
+        if len(self.pending) > MAX_LINE:
+            self.close()
+            return
+        if lines:
+            self.requests += len(lines)
+            self.batches += 1
+            self.send(answer_lines(lines, self.decide))
+
+    def send(self, data):
+        if not self.outbox:
+            try:
+                sent = os.write(self.write_fd, data)
+            except BlockingIOError:
+                sent = 0
+            except OSError as e:
+                if e.errno in (errno.EPIPE, errno.ECONNRESET):
+                    self.close()
+                    return
+                raise
+            if sent == len(data):
+                return
+            data = data[sent:]
+            self.server.loop.add_writer(self.write_fd, self.on_writable)
+        self.outbox += data
+        if len(self.outbox) >= MAX_OUTBOX and not self.paused:
+            self.server.loop.remove_reader(self.read_fd)
+            self.paused = True
+
+    def on_writable(self):
+        try:
+            sent = os.write(self.write_fd, self.outbox)
+        except BlockingIOError:
+            return
+        del self.outbox[:sent]
+        if not self.outbox:
+            self.server.loop.remove_writer(self.write_fd)
+            if self.paused:
+                self.server.loop.add_reader(self.read_fd, self.on_readable)
+                self.paused = False
+
+    def close(self):
+        loop = self.server.loop
+        loop.remove_reader(self.read_fd)
+        loop.remove_writer(self.write_fd)
+        os.close(self.read_fd)
+        if self.write_fd != self.read_fd:
+            os.close(self.write_fd)
+        self.server.channels.remove(self)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SERVER
+# ═══════════════════════════════════════════════════════════════
+
+class BrainServer:
+    """One event loop, many channels, one decider."""
+
+    def __init__(self, decider, loop=None):
+        if loop is None:
+            import asyncio
+            loop = asyncio.new_event_loop()
+        self.decider = decider
+        self.loop = loop
+        self.channels = []
+        self.listeners = []
+        self._channel_ids = 0
+        self._stopped = None
+
+    def next_channel_id(self):
+        self._channel_ids += 1
+        return self._channel_ids
+
+    def add_fifo_channel(self, req_path, resp_path):
+        """Serve one FIFO pair, creating the FIFOs if they do not exist."""
+        for path in (req_path, resp_path):
+            if not os.path.exists(path):
+                os.mkfifo(path, 0o600)
+        read_fd = os.open(req_path, os.O_RDWR | os.O_NONBLOCK)
+        write_fd = os.open(resp_path, os.O_RDWR | os.O_NONBLOCK)
+        channel = Channel(self, os.path.basename(req_path), read_fd, write_fd)
+        self.channels.append(channel)
+        return channel
+
+    def add_unix_listener(self, path, backlog=64):
+        """Accept interceptors on a Unix socket; each connection is a channel."""
+        import socket
+        if os.path.exists(path):
+            os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen(backlog)
+        listener.setblocking(False)
+        self.listeners.append(listener)
+        self.loop.add_reader(listener.fileno(), self._accept, listener)
+        return listener
+
+    def _accept(self, listener):
+        try:
+            conn, _ = listener.accept()
+        except BlockingIOError:
+            return
+        fd = conn.detach()
+        self.channels.append(Channel(self, f"unix:{fd}", fd, fd))
+
+    def stats(self):
+        return [{"channel": c.name, "requests": c.requests, "batches": c.batches}
+                for c in self.channels]
+
+    async def serve(self):
+        import asyncio
+        self._stopped = asyncio.Event()
+        await self._stopped.wait()
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def run(self):
+        """Serve until SIGTERM / SIGINT, then close every channel."""
+        import signal
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            self.loop.add_signal_handler(sig, self.stop)
+        try:
+            self.loop.run_until_complete(self.serve())
+        finally:
+            for channel in list(self.channels):
+                channel.close()
+            for listener in self.listeners:
+                self.loop.remove_reader(listener.fileno())
+                listener.close()
+            self.loop.close()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Brain Startup - Time-to-first-verdict of a freshly started brain
+=================================================================
+The tracee sits stopped at its first syscall until the brain answers it, so
+a short-lived sandboxed session (see benchmark_process_creation in
+head_to_head.py) pays the brain's whole cold start. This measures it from
+the interceptor's side: spawn the brain with its first request already
+queued on stdin and stop the clock when the verdict line comes back.
+
+    interpreter   fork/exec + Python startup (site, encodings, ...)
+    imports       brain modules
+    build         mapper + detector construction (taxonomy compile / load)
+    decide        the first verdict
+
+Brains:
+    semantic   today's path: semantic + state_machine from src/analysis,
+               SemanticMapper(), ExfiltrationDetector()
+    trie       PathClassifier(engine="trie") + SequenceDetector. Nothing
+               off the verdict path is imported (no re, no asyncio), and
+               with cache_path the taxonomy is restored from a marshal
+               snapshot instead of being compiled
+
+forked_first_verdict() measures the alternative of not starting a brain at
+all: one long-lived, fully built brain forks a decider per session.
+
+Bytecode:
+    Python never caches bytecode for a __main__ script, so the brain is
+    started through a one-line -c stub that imports serve_first_request(),
+    and precompile() byte-compiles the brain modules first, as an installed
+    brain would ship them (PYTHONDONTWRITEBYTECODE environments otherwise
+    recompile every module on every start).
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/)
+    (together with path_classifier.py, sequence_detector.py,
+    brain_server.py, event_types.py and latency_histogram.py).
+
+    time_to_first_verdict("semantic")                      # today's cold start
+    time_to_first_verdict("trie", cache_path="/var/cache/sentinel/taxonomy.trie",
+                          flags=("-S",))                    # lazy, cached, no site
+    import_profile("semantic")                             # slowest imports
+"""
+
+import marshal
+import os
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_DIR = os.path.join(SCRIPTS_DIR, '..', 'src', 'analysis')
+
+BRAINS = ("semantic", "trie")
+FIRST_REQUEST = b"SYSCALL:openat:/etc/passwd"
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BRAIN SIDE
+# ═══════════════════════════════════════════════════════════════
+
+def brain_factories(brain, taxonomy=None, cache_path=None):
+    """Import a brain's modules; returns (mapper_factory, detector_factory)."""
+    if brain == "semantic":
+        if ANALYSIS_DIR not in sys.path:
+            sys.path.insert(0, ANALYSIS_DIR)
+        from semantic import SemanticMapper
+        from state_machine import ExfiltrationDetector
+        return SemanticMapper, ExfiltrationDetector
+    if brain == "trie":
+        from path_classifier import PathClassifier
+        from sequence_detector import SequenceDetector
+        return (lambda: PathClassifier(taxonomy, engine="trie", cache=cache_path)), SequenceDetector
+    raise ValueError(f"unknown brain {brain!r} (choose from {', '.join(BRAINS)})")
+
+
+def serve_first_request(brain, taxonomy_path=None, cache_path=None):
+    """
+    Brain process entry: answer the request waiting on stdin, then report.
+
+    Writes the verdict line first (the interceptor's clock stops there),
+    then "<imports_ns> <build_ns> <decide_ns> <cache>".
+    """
+    start = time.perf_counter_ns()
+    from brain_server import PolicyDecider, answer_lines
+    taxonomy = None
+    if taxonomy_path is not None:
+        with open(taxonomy_path, "rb") as f:
+            taxonomy = marshal.loads(f.read())
+    mapper_factory, detector_factory = brain_factories(brain, taxonomy, cache_path)
+    imported = time.perf_counter_ns()
+    mapper = mapper_factory()
+    decide = PolicyDecider(mapper, detector_factory()).for_channel(1)
+    built = time.perf_counter_ns()
+
+    line = sys.stdin.buffer.readline().rstrip(b"\n")
+    decide_start = time.perf_counter_ns()
+    verdict = answer_lines([line], decide)
+    decided = time.perf_counter_ns()
+    out = sys.stdout.buffer
+    out.write(verdict)
+    out.flush()
+
+    cache = (getattr(mapper, "last_reload", None) or {}).get("cache", "-")
+    out.write(b"%d %d %d %s\n" % (imported - start, built - imported, decided - decide_start,
+                                  cache.encode()))
+    out.flush()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  INTERCEPTOR SIDE
+# ═══════════════════════════════════════════════════════════════
+
+def precompile():
+    """Byte-compile the brain modules once (compileall writes regardless of PYTHONDONTWRITEBYTECODE)."""
+    import compileall
+    for directory in (SCRIPTS_DIR, ANALYSIS_DIR):
+        if os.path.isdir(directory):
+            compileall.compile_dir(directory, maxlevels=0, quiet=1)
+
+
+def _write_taxonomy(directory, taxonomy):
+    """Hand a taxonomy to a brain process as a marshal file (None: the default)."""
+    if taxonomy is None:
+        return None
+    path = os.path.join(directory, "taxonomy.marshal")
+    with open(path, "wb") as f:
+        f.write(marshal.dumps(list(taxonomy)))
+    return path
+
+
+def brain_command(brain, flags=(), taxonomy_path=None, cache_path=None):
+    stub = (f"import sys; sys.path[:0] = {[SCRIPTS_DIR, ANALYSIS_DIR]!r}; "
+            f"from brain_startup import serve_first_request; "
+            f"serve_first_request({brain!r}, {taxonomy_path!r}, {cache_path!r})")
+    return [sys.executable, *flags, "-c", stub]
+
+
+def _first_verdict(cmd, request):
+    """Spawn one brain; (ns until the verdict line, verdict, report fields, stderr)."""
+    import subprocess
+    start = time.perf_counter_ns()
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE)
+    proc.stdin.write(request + b"\n")
+    proc.stdin.flush()
+    verdict = proc.stdout.readline()
+    elapsed = time.perf_counter_ns() - start
+    report = proc.stdout.readline().split()
+    _, err = proc.communicate()
+    if not verdict or len(report) != 4:
+        raise RuntimeError(f"brain did not answer: {err.decode(errors='replace').strip()}")
+    return elapsed, verdict.strip(), report, err
+
+
+def time_to_first_verdict(brain, runs=20, flags=(), taxonomy=None, cache_path=None,
+                          request=FIRST_REQUEST):
+    """
+    Spawn the brain runs times; time-to-first-verdict and its phases.
+
+    taxonomy (trie brain) is handed over as a marshal file, the way a
+    deployed brain would load its rules. One unrecorded run first warms the
+    page cache and writes the taxonomy cache.
+    """
+    import tempfile
+    from latency_histogram import LatencyHistogram
+
+    precompile()
+    with tempfile.TemporaryDirectory(prefix="sentinel_startup_") as tmpdir:
+        taxonomy_path = _write_taxonomy(tmpdir, taxonomy)
+        cmd = brain_command(brain, flags, taxonomy_path, cache_path)
+        _first_verdict(cmd, request)
+
+        ttfv = LatencyHistogram()
+        phases_ns = {"imports": 0, "build": 0, "decide": 0}
+        for _ in range(runs):
+            elapsed, verdict, report, _ = _first_verdict(cmd, request)
+            ttfv.record(elapsed)
+            for key, value in zip(phases_ns, report):
+                phases_ns[key] += int(value)
+            cache = report[3].decode()
+
+    stats = ttfv.summary(scale=1_000_000)
+    phases = {f"{key}_ms": total / runs / 1e6 for key, total in phases_ns.items()}
+    return {
+        "test": "startup",
+        "brain": brain,
+        "flags": " ".join(flags),
+        "rules": len(taxonomy) if taxonomy is not None else None,
+        "cache": cache,
+        "verdict": verdict.decode(),
+        "runs": runs,
+        "mean_ms": stats["mean"],
+        "p50_ms": stats["p50"],
+        "p99_ms": stats["p99"],
+        "max_ms": stats["max"],
+        "interpreter_ms": stats["mean"] - sum(phases.values()),
+        **phases,
+        "histogram": ttfv.to_dict(),
+    }
+
+
+def forked_first_verdict(brain, runs=20, taxonomy=None, request=FIRST_REQUEST):
+    """
+    Time-to-first-verdict when a built brain forks one decider per session.
+
+    The brain is imported and built once in this process; every session
+    then costs a fork plus the decision itself, on a copy of the clean
+    detector state.
+    """
+    from brain_server import PolicyDecider, answer_lines
+    from latency_histogram import LatencyHistogram
+
+    mapper_factory, detector_factory = brain_factories(brain, taxonomy)
+    decider = PolicyDecider(mapper_factory(), detector_factory())
+    ttfv = LatencyHistogram()
+    for session in range(runs):
+        req_r, req_w = os.pipe()
+        resp_r, resp_w = os.pipe()
+        os.write(req_w, request + b"\n")
+        start = time.perf_counter_ns()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                line = os.read(req_r, 65536).split(b"\n")[0]
+                os.write(resp_w, answer_lines([line], decider.for_channel(session)))
+            finally:
+                os._exit(0)
+        verdict = os.read(resp_r, 64)
+        ttfv.record(time.perf_counter_ns() - start)
+        os.waitpid(pid, 0)
+        for fd in (req_r, req_w, resp_r, resp_w):
+            os.close(fd)
+
+    stats = ttfv.summary(scale=1_000_000)
+    return {
+        "test": "startup",
+        "brain": f"{brain} (forked)",
+        "flags": "",
+        "rules": len(taxonomy) if taxonomy is not None else None,
+        "cache": "-",
+        "verdict": verdict.strip().decode(),
+        "runs": runs,
+        "mean_ms": stats["mean"],
+        "p50_ms": stats["p50"],
+        "p99_ms": stats["p99"],
+        "max_ms": stats["max"],
+        "histogram": ttfv.to_dict(),
+    }
+
+
+def spawn_baseline(runs=20):
+    """Mean ms to fork/exec /bin/true - the floor for any per-session brain."""
+    import subprocess
+    total = 0
+    for _ in range(runs):
+        start = time.perf_counter_ns()
+        subprocess.run(["/bin/true"], check=True)
+        total += time.perf_counter_ns() - start
+    return total / runs / 1e6
+
+
+def import_profile(brain, flags=(), taxonomy=None, cache_path=None, top=10):
+    """
+    Slowest imports of one brain start, from python -X importtime.
+
+    Returns [{"module", "self_ms", "cumulative_ms"}] sorted by self time.
+    """
+    import tempfile
+
+    precompile()
+    with tempfile.TemporaryDirectory(prefix="sentinel_startup_") as tmpdir:
+        taxonomy_path = _write_taxonomy(tmpdir, taxonomy)
+        cmd = brain_command(brain, ("-X", "importtime", *flags), taxonomy_path, cache_path)
+        _, _, _, err = _first_verdict(cmd, FIRST_REQUEST)
+
+    modules = []
+    for line in err.decode().splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append({"module": name.strip(), "self_ms": int(self_us) / 1000,
+                        "cumulative_ms": int(cumulative_us) / 1000})
+    modules.sort(key=lambda m: m["self_ms"], reverse=True)
+    return modules[:top]
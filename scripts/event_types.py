@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Event Types - Interned syscall verbs and semantic concepts
+===========================================================
+Small-int IDs for the decision hot path. The interceptor already knows
+which syscall it trapped as a number, so the brain should not be
+re-deriving it from a string and comparing "sendto" against "sendmsg" on
+every event.
+
+    event = SyscallEvent(pid, VERB_OPEN, fd=3, ret=0, concept=CONCEPT_SSH_KEYS)
+    classifier.classify_id(path)        # PathClassifier -> concept id
+    detector.process_syscall(*event)    # SequenceDetector -> Verdict
+
+ID stability:
+    The built-in tables below only ever grow at the end, so their IDs can
+    be written into traces. They are this module's own numbering, one ID
+    per syscall name (unlink and unlinkat stay apart), not a copy of any
+    C-side table. Names that are not
+    built in (a new syscall, a custom taxonomy concept) are appended at
+    runtime by verb_id() / concept_id(); those IDs are only stable within
+    one process.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    event = SyscallEvent.from_strings(1234, "open", {"fd": "3", "ret": "0"}, "SSH_KEYS")
+    event.verb == VERB_OPEN              # True
+    event.as_strings()                   # (1234, "open", {...}, "SSH_KEYS")
+"""
+
+from operator import itemgetter
+
+# ═══════════════════════════════════════════════════════════════
+#  VERBS
+# ═══════════════════════════════════════════════════════════════
+
+VERB_UNKNOWN = 0
+VERB_OPEN = 1
+VERB_OPENAT = 2
+VERB_READ = 3
+VERB_WRITE = 4
+VERB_CLOSE = 5
+VERB_SOCKET = 6
+VERB_CONNECT = 7
+VERB_SENDTO = 8
+VERB_SENDMSG = 9
+VERB_RECVFROM = 10
+VERB_RECVMSG = 11
+VERB_DUP2 = 12
+VERB_DUP3 = 13
+VERB_EXECVE = 14
+VERB_UNLINK = 15
+VERB_UNLINKAT = 16
+VERB_RENAME = 17
+VERB_RENAMEAT = 18
+VERB_CHMOD = 19
+VERB_MMAP = 20
+VERB_MPROTECT = 21
+VERB_CLONE = 22
+VERB_FORK = 23
+VERB_VFORK = 24
+VERB_KILL = 25
+VERB_PTRACE = 26
+VERB_EXIT = 27
+VERB_EXIT_GROUP = 28
+
+_BUILTIN_VERBS = {
+    VERB_UNKNOWN: "unknown",
+    VERB_OPEN: "open",
+    VERB_OPENAT: "openat",
+    VERB_READ: "read",
+    VERB_WRITE: "write",
+    VERB_CLOSE: "close",
+    VERB_SOCKET: "socket",
+    VERB_CONNECT: "connect",
+    VERB_SENDTO: "sendto",
+    VERB_SENDMSG: "sendmsg",
+    VERB_RECVFROM: "recvfrom",
+    VERB_RECVMSG: "recvmsg",
+    VERB_DUP2: "dup2",
+    VERB_DUP3: "dup3",
+    VERB_EXECVE: "execve",
+    VERB_UNLINK: "unlink",
+    VERB_UNLINKAT: "unlinkat",
+    VERB_RENAME: "rename",
+    VERB_RENAMEAT: "renameat",
+    VERB_CHMOD: "chmod",
+    VERB_MMAP: "mmap",
+    VERB_MPROTECT: "mprotect",
+    VERB_CLONE: "clone",
+    VERB_FORK: "fork",
+    VERB_VFORK: "vfork",
+    VERB_KILL: "kill",
+    VERB_PTRACE: "ptrace",
+    VERB_EXIT: "exit",
+    VERB_EXIT_GROUP: "exit_group",
+}
+
+# ═══════════════════════════════════════════════════════════════
+#  CONCEPTS (SemanticMapper tags + stress-test chain labels)
+# ═══════════════════════════════════════════════════════════════
+
+CONCEPT_NONE = 0            # no path argument
+CONCEPT_UNKNOWN = 1         # path did not match any rule
+CONCEPT_CRITICAL_AUTH = 2
+CONCEPT_SSH_KEYS = 3
+CONCEPT_SYSTEM_BIN = 4
+CONCEPT_TEMP_FILE = 5
+CONCEPT_SENSITIVE_USER_FILE = 6
+CONCEPT_SYSTEM_SECURITY_FILE = 7
+CONCEPT_SYSTEM_LOG_FILE = 8
+
+_BUILTIN_CONCEPTS = {
+    CONCEPT_NONE: "",
+    CONCEPT_UNKNOWN: "UNKNOWN",
+    CONCEPT_CRITICAL_AUTH: "CRITICAL_AUTH",
+    CONCEPT_SSH_KEYS: "SSH_KEYS",
+    CONCEPT_SYSTEM_BIN: "SYSTEM_BIN",
+    CONCEPT_TEMP_FILE: "TEMP_FILE",
+    CONCEPT_SENSITIVE_USER_FILE: "SENSITIVE_USER_FILE",
+    CONCEPT_SYSTEM_SECURITY_FILE: "SYSTEM_SECURITY_FILE",
+    CONCEPT_SYSTEM_LOG_FILE: "SYSTEM_LOG_FILE",
+}
+
+# id -> name and name -> id; both grow together when new names are interned
+VERB_NAMES = [_BUILTIN_VERBS[i] for i in range(len(_BUILTIN_VERBS))]
+VERB_IDS = {name: i for i, name in enumerate(VERB_NAMES)}
+CONCEPT_NAMES = [_BUILTIN_CONCEPTS[i] for i in range(len(_BUILTIN_CONCEPTS))]
+CONCEPT_IDS = {name: i for i, name in enumerate(CONCEPT_NAMES)}
+
+# Batches store ids as unsigned 16-bit columns
+MAX_ID = 0xFFFF
+
+
+def _intern(ids, names, name):
+    index = ids.get(name)
+    if index is None:
+        index = len(names)
+        if index > MAX_ID:
+            raise OverflowError("too many distinct names to intern")
+        ids[name] = index
+        names.append(name)
+    return index
+
+
+def verb_id(name):
+    """ID for a syscall name, interning it if it is not built in."""
+    return _intern(VERB_IDS, VERB_NAMES, name)
+
+
+def concept_id(name):
+    """ID for a concept tag ("" / None = CONCEPT_NONE), interning it if new."""
+    return _intern(CONCEPT_IDS, CONCEPT_NAMES, name or "")
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TYPED EVENT
+# ═══════════════════════════════════════════════════════════════
+
+class SyscallEvent(tuple):
+    """
+    One intercepted syscall: (pid, verb id, fd, ret, concept id), all ints.
+
+    A tuple, so an event costs one small allocation and unpacks straight
+    into the int hot-path APIs: detector.process_syscall(*event). Code that
+    decodes the wire format can skip the object entirely and pass the five
+    ints.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, pid, verb, fd=-1, ret=0, concept=CONCEPT_NONE):
+        return tuple.__new__(cls, (pid, verb, fd, ret, concept))
+
+    pid = property(itemgetter(0))
+    verb = property(itemgetter(1))
+    fd = property(itemgetter(2))
+    ret = property(itemgetter(3))
+    concept = property(itemgetter(4))
+
+    @classmethod
+    def from_strings(cls, pid, verb, args, concept):
+        """Convert a process_event-style (pid, verb, args, concept) call."""
+        return cls(pid, verb_id(verb), int(args.get("fd", -1)), int(args.get("ret", 0)),
+                   concept_id(concept))
+
+    def as_strings(self):
+        """The equivalent (pid, verb, args, concept) for string-only components."""
+        pid, verb, fd, ret, concept = self
+        return pid, VERB_NAMES[verb], {"fd": str(fd), "ret": str(ret)}, CONCEPT_NAMES[concept]
+
+    def __repr__(self):
+        pid, verb, fd, ret, concept = self
+        return (f"<SyscallEvent pid={pid} {VERB_NAMES[verb]} fd={fd} ret={ret} "
+                f"concept={CONCEPT_NAMES[concept] or '-'}>")
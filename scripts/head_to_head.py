@@ -10,25 +10,83 @@ a comparison report.
 
 Usage:
     1. Run baseline (no security): python3 scripts/head_to_head.py baseline
-    2. Run with Sentinel attached: python3 scripts/head_to_head.py sentinel  
-    3. Run with Hyperion active:   python3 scripts/head_to_head.py hyperion
-    4. Generate report:            python3 scripts/head_to_head.py report
+    2. Run under a bare tracer:    python3 scripts/head_to_head.py traced
+    3. Run under Sentinel:         python3 scripts/head_to_head.py sentinel
+    4. Run with Hyperion active:   python3 scripts/head_to_head.py hyperion
+    5. Generate report:            python3 scripts/head_to_head.py report
 
-Or run everything automatically:
+Or run baseline, traced and sentinel unattended, then report:
     python3 scripts/head_to_head.py auto
+
+    traced and sentinel launch the workload as a child of a tracer this
+    script controls, so nothing attaches or detaches mid-run. Sentinel is
+    H2H_SENTINEL_PREFIX (e.g. "./bin/sentinel test") when set; otherwise
+    ptrace_tracer.py stands in, with the Python brain deciding every
+    syscall it knows. traced is the stand-in with no brain at all:
+        traced   vs baseline   cost of the ptrace stop/resume per syscall
+        sentinel vs traced     cost of the brain's decisions
+
+Repeated trials with confidence intervals:
+    python3 scripts/head_to_head.py trials 10 baseline hyperion [--cpu 3]
+    python3 scripts/head_to_head.py trials-report
+
+    Every trial runs each mode once, in a fresh worker process pinned to
+    one CPU, with the mode order rotated from trial to trial. traced and
+    sentinel run the worker under the stand-in tracer; other modes (and a
+    real Sentinel) are switched per worker through environment hooks:
+        H2H_<MODE>_PREFIX   command prefix for the worker (e.g. H2H_SENTINEL_PREFIX="./bin/sentinel test")
+        H2H_<MODE>_START    shell command run before the worker (e.g. start hyperion_ctrl)
+        H2H_<MODE>_STOP     shell command run after it
+    Each workload is warmed up until consecutive rounds agree, and every
+    metric gets a bootstrap confidence interval; a delta against baseline
+    is significant only when the intervals do not overlap.
+
+Concurrent workers:
+    python3 scripts/head_to_head.py <mode> --parallel 8    (also auto / trials)
+    python3 scripts/head_to_head.py scaling [max_workers] [modes]
+    python3 scripts/head_to_head.py scaling-report
+
+    --parallel N runs every benchmark in N forked workers at once (each
+    doing the full iteration count) and reports their aggregate throughput
+    and merged latency histogram; under a tracer each worker is its own
+    tracee. scaling repeats every mode at 1, 2, 4, ... max_workers (default:
+    all cores) and shows how the overhead vs baseline moves with them.
+
+Batched network:
+    benchmark_network_loopback is one blocking sendto/recvfrom per packet.
+    The network_batched benchmarks (udp_batch.py) move up to 64 datagrams
+    (as many as the receive buffer holds) per sendmmsg/recvmmsg over SO_REUSEPORT sender/receiver pairs, at each of
+        H2H_UDP_SIZES="64,1472,8192"    packet sizes in bytes
+        H2H_UDP_PAIRS=4                 socket pairs (default: min(4, cores))
+    and report PPS, Gbps and the packet latency distribution.
+
+Syscall mixes:
+    After the fixed benchmarks every run replays weighted syscall mixes
+    (syscall_mix.py), by default the build_server, web_server and
+    ransomware profiles. Choose others, or your own profile files, with
+        H2H_PROFILES="web_server,/path/to/profile.json"
+    The report adds the mean cost of each syscall type under every mode.
 """
 
 import os
 import sys
 import json
 import time
-import subprocess
+import random
+import shlex
 import statistics
+import subprocess
 import socket
 import struct
+import tempfile
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
+from latency_histogram import LatencyHistogram
+from syscall_mix import OPS, load_profile, run_profile
+from udp_batch import run_udp
+
 # Results storage
 RESULTS_DIR = Path("/tmp/head_to_head_results")
 RESULTS_DIR.mkdir(exist_ok=True)
@@ -46,26 +104,29 @@ def benchmark_syscall_storm(iterations=100000):
     import ctypes
     libc = ctypes.CDLL("libc.so.6", use_errno=True)
     
-    latencies = []
+    latencies = LatencyHistogram()
     start_total = time.time()
     
     for _ in range(iterations):
         start = time.perf_counter_ns()
         libc.getpid()
         end = time.perf_counter_ns()
-        latencies.append(end - start)
+        latencies.record(end - start)
     
     elapsed = time.time() - start_total
+    stats = latencies.summary(scale=1)
     
     return {
         "test": "syscall_storm",
         "iterations": iterations,
         "total_time_sec": elapsed,
         "throughput": iterations / elapsed,
-        "mean_ns": statistics.mean(latencies),
-        "p50_ns": statistics.median(latencies),
-        "p99_ns": statistics.quantiles(latencies, n=100)[98] if len(latencies) >= 100 else max(latencies),
-        "max_ns": max(latencies),
+        "mean_ns": stats["mean"],
+        "p50_ns": stats["p50"],
+        "p99_ns": stats["p99"],
+        "p999_ns": stats["p999"],
+        "max_ns": stats["max"],
+        "histogram": latencies.to_dict(),
     }
 
 
@@ -74,10 +135,10 @@ def benchmark_file_operations(iterations=5000):
     Measure file I/O overhead (create, write, read, delete).
     Sentinel intercepts open/read/write/unlink; Hyperion monitors network, not local I/O.
     """
-    test_dir = Path("/tmp/benchmark_files")
+    test_dir = Path(f"/tmp/benchmark_files_{os.getpid()}")
     test_dir.mkdir(exist_ok=True)
     
-    latencies = []
+    latencies = LatencyHistogram()
     payload = b"BENCHMARK_PAYLOAD_" * 100  # 1.8KB
     
     start_total = time.time()
@@ -95,7 +156,7 @@ def benchmark_file_operations(iterations=5000):
         filepath.unlink()
         
         end = time.perf_counter_ns()
-        latencies.append(end - start)
+        latencies.record(end - start)
     
     elapsed = time.time() - start_total
     
@@ -105,15 +166,19 @@ def benchmark_file_operations(iterations=5000):
     except:
         pass
     
+    stats = latencies.summary()
+    
     return {
         "test": "file_operations",
         "iterations": iterations,
         "total_time_sec": elapsed,
         "iops": iterations / elapsed,
-        "mean_us": statistics.mean(latencies) / 1000,
-        "p50_us": statistics.median(latencies) / 1000,
-        "p99_us": statistics.quantiles(latencies, n=100)[98] / 1000 if len(latencies) >= 100 else max(latencies) / 1000,
-        "max_us": max(latencies) / 1000,
+        "mean_us": stats["mean"],
+        "p50_us": stats["p50"],
+        "p99_us": stats["p99"],
+        "p999_us": stats["p999"],
+        "max_us": stats["max"],
+        "histogram": latencies.to_dict(),
     }
 
 
@@ -122,7 +187,7 @@ def benchmark_process_creation(iterations=500):
     Measure fork/exec overhead.
     Sentinel intercepts fork/clone/execve; important for detecting spawning attacks.
     """
-    latencies = []
+    latencies = LatencyHistogram()
     
     start_total = time.time()
     
@@ -138,19 +203,22 @@ def benchmark_process_creation(iterations=500):
         proc.wait()
         
         end = time.perf_counter_ns()
-        latencies.append(end - start)
+        latencies.record(end - start)
     
     elapsed = time.time() - start_total
+    stats = latencies.summary(scale=1_000_000)
     
     return {
         "test": "process_creation",
         "iterations": iterations,
         "total_time_sec": elapsed,
         "forks_per_sec": iterations / elapsed,
-        "mean_ms": statistics.mean(latencies) / 1_000_000,
-        "p50_ms": statistics.median(latencies) / 1_000_000,
-        "p99_ms": statistics.quantiles(latencies, n=100)[98] / 1_000_000 if len(latencies) >= 100 else max(latencies) / 1_000_000,
-        "max_ms": max(latencies) / 1_000_000,
+        "mean_ms": stats["mean"],
+        "p50_ms": stats["p50"],
+        "p99_ms": stats["p99"],
+        "p999_ms": stats["p999"],
+        "max_ms": stats["max"],
+        "histogram": latencies.to_dict(),
     }
 
 
@@ -159,7 +227,7 @@ def benchmark_network_loopback(iterations=1000, packet_size=1024):
     Measure local network latency (UDP loopback).
     Hyperion (XDP) intercepts network; Sentinel doesn't directly monitor packets.
     """
-    latencies = []
+    latencies = LatencyHistogram()
     
     # Create UDP sockets
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -186,7 +254,7 @@ def benchmark_network_loopback(iterations=1000, packet_size=1024):
             
             # Extract send timestamp
             orig_time = struct.unpack("Q", data[:8])[0]
-            latencies.append(recv_time - orig_time)
+            latencies.record(recv_time - orig_time)
         except socket.timeout:
             pass  # Drop packet
     
@@ -195,28 +263,42 @@ def benchmark_network_loopback(iterations=1000, packet_size=1024):
     client_sock.close()
     server_sock.close()
     
-    if not latencies:
+    if not latencies.count:
         return {"test": "network_loopback", "error": "No packets received"}
     
+    stats = latencies.summary()
+    
     return {
         "test": "network_loopback",
-        "iterations": len(latencies),
+        "iterations": latencies.count,
         "packet_size": packet_size,
         "total_time_sec": elapsed,
-        "pps": len(latencies) / elapsed,
-        "mean_us": statistics.mean(latencies) / 1000,
-        "p50_us": statistics.median(latencies) / 1000,
-        "p99_us": statistics.quantiles(latencies, n=100)[98] / 1000 if len(latencies) >= 100 else max(latencies) / 1000,
-        "max_us": max(latencies) / 1000,
+        "pps": latencies.count / elapsed,
+        "mean_us": stats["mean"],
+        "p50_us": stats["p50"],
+        "p99_us": stats["p99"],
+        "p999_us": stats["p999"],
+        "max_us": stats["max"],
+        "histogram": latencies.to_dict(),
     }
 
 
+def benchmark_network_batched(iterations=200000, packet_size=1024, batch=64, pairs=1):
+    """
+    Measure loopback packet rate with sendmmsg/recvmmsg over SO_REUSEPORT pairs.
+    Batching lifts the rate to where per-packet filter cost (Hyperion) shows; see udp_batch.py.
+    """
+    result = run_udp(packet_size, batch, pairs, packets=iterations)
+    result["test"] = f"network_batched_{packet_size}"
+    return result
+
+
 def benchmark_memory_operations(iterations=10000):
     """
     Measure memory allocation patterns.
     May trigger mmap/brk syscalls that Sentinel intercepts.
     """
-    latencies = []
+    latencies = LatencyHistogram()
     
     start_total = time.time()
     
@@ -229,35 +311,112 @@ def benchmark_memory_operations(iterations=10000):
         del data
         
         end = time.perf_counter_ns()
-        latencies.append(end - start)
+        latencies.record(end - start)
     
     elapsed = time.time() - start_total
+    stats = latencies.summary()
     
     return {
         "test": "memory_operations",
         "iterations": iterations,
         "total_time_sec": elapsed,
         "ops_per_sec": iterations / elapsed,
-        "mean_us": statistics.mean(latencies) / 1000,
-        "p50_us": statistics.median(latencies) / 1000,
-        "p99_us": statistics.quantiles(latencies, n=100)[98] / 1000 if len(latencies) >= 100 else max(latencies) / 1000,
-        "max_us": max(latencies) / 1000,
+        "mean_us": stats["mean"],
+        "p50_us": stats["p50"],
+        "p99_us": stats["p99"],
+        "p999_us": stats["p999"],
+        "max_us": stats["max"],
+        "histogram": latencies.to_dict(),
     }
 
 
+def benchmark_syscall_mix(iterations=20000, profile="web_server"):
+    """
+    Replay a weighted syscall mix (see syscall_mix.py) from a profile.
+    Tracer cost differs per syscall type; the result keeps a per-op breakdown.
+    """
+    return run_profile(profile, iterations)
+
+
 # ═══════════════════════════════════════════════════════════════════════
 #  RUNNER
 # ═══════════════════════════════════════════════════════════════════════
 
+# (label, test, benchmark, iterations per run)
+BENCHMARKS = [
+    ("Syscall Storm (100K getpid)", "syscall_storm", benchmark_syscall_storm, 100000),
+    ("File Operations (5K cycles)", "file_operations", benchmark_file_operations, 5000),
+    ("Process Creation (500 forks)", "process_creation", benchmark_process_creation, 500),
+    ("Network Loopback (1K packets)", "network_loopback", benchmark_network_loopback, 1000),
+    ("Memory Operations (10K allocs)", "memory_operations", benchmark_memory_operations, 10000),
+]
+
+TEST_NAMES = {
+    "syscall_storm": "Syscall Storm",
+    "file_operations": "File I/O",
+    "process_creation": "Process Creation",
+    "network_loopback": "Network (UDP)",
+    "memory_operations": "Memory Alloc",
+}
+
+# Headline throughput metric per test
+METRICS = {
+    "syscall_storm": "throughput",
+    "file_operations": "iops",
+    "process_creation": "forks_per_sec",
+    "network_loopback": "pps",
+    "memory_operations": "ops_per_sec",
+}
+
+# Syscall-mix profiles run after the fixed benchmarks: built-in names or
+# profile JSON files, comma-separated (inherited by trial workers)
+MIX_PROFILES = os.environ.get("H2H_PROFILES", "build_server,web_server,ransomware")
+MIX_ITERATIONS = 20000
+
+
+def add_mix_benchmarks(profiles=MIX_PROFILES):
+    for profile in filter(None, profiles.split(",")):
+        name = load_profile(profile)["name"]
+        BENCHMARKS.append((f"Syscall Mix: {name} ({MIX_ITERATIONS // 1000}K ops)", f"mix_{name}",
+                           partial(benchmark_syscall_mix, profile=profile), MIX_ITERATIONS))
+        TEST_NAMES[f"mix_{name}"] = f"Mix: {name}"
+        METRICS[f"mix_{name}"] = "ops_per_sec"
+
+
+add_mix_benchmarks()
+
+# Batched UDP loopback at each packet size (comma-separated bytes), with
+# H2H_UDP_PAIRS sender/receiver pairs
+UDP_SIZES = os.environ.get("H2H_UDP_SIZES", "64,1472,8192")
+UDP_PAIRS = int(os.environ.get("H2H_UDP_PAIRS", min(4, os.cpu_count() or 1)))
+UDP_BATCH = 64
+UDP_PACKETS = 200000
+
+
+def add_network_benchmarks(sizes=UDP_SIZES, pairs=UDP_PAIRS):
+    for size in map(int, filter(None, sizes.split(","))):
+        BENCHMARKS.append((f"Network Batched ({UDP_PACKETS // 1000}K x {size}B, {pairs} pair(s))",
+                           f"network_batched_{size}",
+                           partial(benchmark_network_batched, packet_size=size, batch=UDP_BATCH, pairs=pairs),
+                           UDP_PACKETS))
+        TEST_NAMES[f"network_batched_{size}"] = f"UDP batch {size}B"
+        METRICS[f"network_batched_{size}"] = "pps"
+
+
+add_network_benchmarks()
+
 def run_all_benchmarks(mode="baseline"):
     """Run all benchmarks and save results."""
     print(f"\n{'='*70}")
-    print(f"  RUNNING BENCHMARKS - Mode: {mode.upper()}")
+    workers = parallel_workers()
+    print(f"  RUNNING BENCHMARKS - Mode: {mode.upper()}"
+          + (f" ({workers} workers per benchmark)" if workers > 1 else ""))
     print(f"{'='*70}\n")
     
     results = {
         "mode": mode,
         "timestamp": datetime.now().isoformat(),
+        "parallel": workers,
         "benchmarks": []
     }
     
@@ -267,18 +426,10 @@ def run_all_benchmarks(mode="baseline"):
     benchmark_file_operations(100)
     
     # Run benchmarks
-    benchmarks = [
-        ("Syscall Storm (100K getpid)", lambda: benchmark_syscall_storm(100000)),
-        ("File Operations (5K cycles)", lambda: benchmark_file_operations(5000)),
-        ("Process Creation (500 forks)", lambda: benchmark_process_creation(500)),
-        ("Network Loopback (1K packets)", lambda: benchmark_network_loopback(1000)),
-        ("Memory Operations (10K allocs)", lambda: benchmark_memory_operations(10000)),
-    ]
-    
-    for name, bench_fn in benchmarks:
+    for name, _, bench_fn, iterations in BENCHMARKS:
         print(f"[*] {name}...")
         try:
-            result = bench_fn()
+            result = run_benchmark(bench_fn, iterations)
             results["benchmarks"].append(result)
             
             # Print quick summary
@@ -288,6 +439,9 @@ def run_all_benchmarks(mode="baseline"):
                 print(f"    → {result['iops']:,.0f} IOPS")
             elif "forks_per_sec" in result:
                 print(f"    → {result['forks_per_sec']:,.0f} forks/sec")
+            elif "gbps" in result:
+                print(f"    → {result['pps']:,.0f} PPS, {result['gbps']:.2f} Gbps, "
+                      f"p99 {result['p99_us']:.0f} μs")
             elif "pps" in result:
                 print(f"    → {result['pps']:,.0f} PPS")
             elif "ops_per_sec" in result:
@@ -305,6 +459,45 @@ def run_all_benchmarks(mode="baseline"):
     return results
 
 
+def print_op_breakdown(by_mode):
+    """
+    Mean μs per syscall type across the syscall-mix benchmarks, per mode.
+
+    by_mode is {mode: [benchmark results, ...]}. A mix's headline
+    throughput averages over its ops; this shows which ops the tracer
+    actually makes expensive.
+    """
+    costs = {}
+    for mode, benchmarks in by_mode.items():
+        for bench in benchmarks:
+            for op, s in bench.get("ops", {}).items():
+                count, total_us = costs.setdefault(op, {}).get(mode, (0, 0.0))
+                costs[op][mode] = (count + s["count"], total_us + s["count"] * s["mean_us"])
+    if not costs or "baseline" not in by_mode:
+        return
+    others = [mode for mode in ("traced", "sentinel", "hyperion") if mode in by_mode]
+    
+    print("\n" + "="*70)
+    print("  PER-SYSCALL COST (syscall-mix benchmarks, mean μs per op)")
+    print("="*70 + "\n")
+    print(f"  {'Op':<8} │ {'Baseline':>9} │ " + " │ ".join(f"{mode.capitalize():>16}" for mode in others))
+    print(f"  {'─'*8}─┼─{'─'*9}─┼─" + "─┼─".join("─"*16 for _ in others))
+    for op in OPS:
+        if "baseline" not in costs.get(op, {}):
+            continue
+        count, total_us = costs[op]["baseline"]
+        base = total_us / count
+        cells = []
+        for mode in others:
+            if mode not in costs[op]:
+                cells.append(f"{'—':>16}")
+                continue
+            count, total_us = costs[op][mode]
+            mean = total_us / count
+            cells.append(f"{mean:>7.2f} ({mean / base:>5.1f}×)")
+        print(f"  {op:<8} │ {base:>9.2f} │ " + " │ ".join(cells))
+
+
 def generate_report():
     """Generate comparison report from saved results."""
     print("\n" + "="*70)
@@ -313,7 +506,7 @@ def generate_report():
     
     # Load available results
     modes = {}
-    for mode in ["baseline", "sentinel", "hyperion"]:
+    for mode in ["baseline", "traced", "sentinel", "hyperion"]:
         result_file = RESULTS_DIR / f"{mode}_results.json"
         if result_file.exists():
             with open(result_file) as f:
@@ -322,6 +515,7 @@ def generate_report():
     if not modes:
         print("No results found! Run benchmarks first:")
         print("  python3 scripts/head_to_head.py baseline")
+        print("  python3 scripts/head_to_head.py traced")
         print("  python3 scripts/head_to_head.py sentinel")
         print("  python3 scripts/head_to_head.py hyperion")
         return
@@ -331,6 +525,10 @@ def generate_report():
         return
     
     baseline = modes["baseline"]
+    parallel = {mode: results.get("parallel", 1) for mode, results in modes.items()}
+    if len(set(parallel.values())) > 1:
+        print("⚠️  Runs used different --parallel counts: "
+              + ", ".join(f"{mode} {n}" for mode, n in parallel.items()) + "\n")
     
     # Build comparison table
     print("┌" + "─"*68 + "┐")
@@ -339,21 +537,8 @@ def generate_report():
     print(f"│ {'Benchmark':<23} │ {'Sentinel':<18} │ {'Hyperion':<18} │")
     print("├" + "─"*25 + "┼" + "─"*20 + "┼" + "─"*20 + "┤")
     
-    test_names = {
-        "syscall_storm": "Syscall Storm",
-        "file_operations": "File I/O",
-        "process_creation": "Process Creation",
-        "network_loopback": "Network (UDP)",
-        "memory_operations": "Memory Alloc",
-    }
-    
-    metrics = {
-        "syscall_storm": "throughput",
-        "file_operations": "iops",
-        "process_creation": "forks_per_sec",
-        "network_loopback": "pps",
-        "memory_operations": "ops_per_sec",
-    }
+    test_names = TEST_NAMES
+    metrics = METRICS
     
     for bench in baseline["benchmarks"]:
         test = bench.get("test", "")
@@ -436,6 +621,17 @@ def generate_report():
     
     print("└" + "─"*20 + "┴" + "─"*15 + "┴" + "─"*15 + "┴" + "─"*15 + "┘")
     
+    throughput = {}
+    for mode in ["baseline", "traced", "sentinel"]:
+        for bench in modes.get(mode, {}).get("benchmarks", []):
+            test = bench.get("test")
+            if METRICS.get(test) in bench:
+                throughput.setdefault(test, {})[mode] = bench[METRICS[test]]
+    tracer = {mode: [modes[mode]["tracer"]] for mode in ["traced", "sentinel"]
+              if modes.get(mode, {}).get("tracer")}
+    print_cost_breakdown(throughput, tracer)
+    print_op_breakdown({mode: results["benchmarks"] for mode, results in modes.items()})
+    
     # Bottom line analysis
     print("\n" + "="*70)
     print("  ANALYSIS")
@@ -476,6 +672,557 @@ def generate_report():
     print(f"\n[+] Report available at: {report_file}")
 
 
+# ═══════════════════════════════════════════════════════════════════════
+#  PARALLEL WORKERS (--parallel N: concurrent tracees / senders)
+# ═══════════════════════════════════════════════════════════════════════
+
+SCALING_FILE = RESULTS_DIR / "scaling_results.json"
+LATENCY_SCALES = {"ns": 1, "us": 1000, "ms": 1_000_000}
+
+
+def parallel_workers():
+    """Worker processes per benchmark (--parallel N, inherited by child runs as H2H_PARALLEL)."""
+    return int(os.environ.get("H2H_PARALLEL", "1"))
+
+
+def worker_counts(max_workers):
+    """1, 2, 4, ... up to and including max_workers."""
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def run_benchmark(bench_fn, iterations, cpus=None):
+    """bench_fn(iterations) here, or in parallel_workers() processes at once."""
+    workers = parallel_workers()
+    if workers <= 1:
+        return bench_fn(iterations)
+    return run_parallel(bench_fn, iterations, workers, cpus)
+
+
+def run_parallel(bench_fn, iterations, workers, cpus=None):
+    """
+    bench_fn(iterations) in `workers` forked processes, released together.
+    
+    Every worker does the full iteration count, so the aggregate rate is
+    all their work over the wall time from the first worker's timed loop
+    starting to the last one finishing. Setup (scratch files, sockets) is
+    left out, as it is at one worker: a worker's loop is taken to end when
+    bench_fn returns and to have run for its total_time_sec. Worker i is
+    pinned to cpus[i % len(cpus)] when given. A tracer that follows forks
+    sees each worker as its own tracee.
+    """
+    sys.stdout.flush()      # or every child flushes a copy of it
+    release_r, release_w = os.pipe()
+    children = []
+    for i in range(workers):
+        result_r, result_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                os.close(release_w)
+                os.close(result_r)
+                if cpus:
+                    os.sched_setaffinity(0, {cpus[i % len(cpus)]})
+                os.read(release_r, 1)
+                try:
+                    result = bench_fn(iterations)
+                except Exception as e:
+                    result = {"error": str(e)}
+                result["finished_ns"] = time.perf_counter_ns()
+                if "total_time_sec" in result:
+                    result["started_ns"] = result["finished_ns"] - int(result["total_time_sec"] * 1e9)
+                with os.fdopen(result_w, "w") as f:
+                    json.dump(result, f)
+                status = 0
+            finally:
+                os._exit(status)
+        os.close(result_w)
+        children.append((pid, result_r))
+    os.close(release_r)
+    os.write(release_w, b"x" * workers)
+    os.close(release_w)
+    
+    results = []
+    for pid, result_r in children:
+        with os.fdopen(result_r) as f:
+            data = f.read()
+        os.waitpid(pid, 0)
+        results.append(json.loads(data) if data else {"error": "worker died"})
+    return merge_worker_results(results)
+
+
+def merge_worker_results(results):
+    """One result dict from per-worker ones: summed work, merged latency histogram."""
+    test = next((r["test"] for r in results if "test" in r), None)
+    errors = [r["error"] for r in results if "error" in r]
+    if errors:
+        return {"test": test, "error": f"{len(errors)}/{len(results)} workers failed: {errors[0]}"}
+    
+    metric = METRICS[test]
+    wall_sec = (max(r["finished_ns"] for r in results) - min(r["started_ns"] for r in results)) / 1e9
+    histogram = LatencyHistogram.from_dict(results[0]["histogram"])
+    for r in results[1:]:
+        histogram.merge(LatencyHistogram.from_dict(r["histogram"]))
+    
+    merged = {k: v for k, v in results[0].items() if k not in ("started_ns", "finished_ns")}
+    merged.update({
+        "workers": len(results),
+        "iterations": sum(r["iterations"] for r in results),
+        "total_time_sec": wall_sec,
+        # each worker's rate x its own time = the work it did
+        metric: sum(r[metric] * r["total_time_sec"] for r in results) / wall_sec,
+        f"{metric}_per_worker": [r[metric] for r in results],
+        "histogram": histogram.to_dict(),
+    })
+    if "gbps" in merged:
+        merged["gbps"] = merged[metric] * merged["packet_size"] * 8 / 1e9
+    key = latency_metric(merged)
+    if key:
+        unit = key.rsplit("_", 1)[1]
+        stats = histogram.summary(scale=LATENCY_SCALES[unit])
+        for stat in ("mean", "p50", "p99", "p999", "max"):
+            merged[f"{stat}_{unit}"] = stats[stat]
+    if "ops" in merged:
+        ops = {}
+        for r in results:
+            for op, s in r["ops"].items():
+                count, total_us = ops.get(op, (0, 0.0))
+                ops[op] = (count + s["count"], total_us + s["count"] * s["mean_us"])
+        merged["ops"] = {op: {"count": count, "mean_us": total_us / count}
+                         for op, (count, total_us) in ops.items()}
+    return merged
+
+
+def run_scaling(modes, max_workers=None):
+    """
+    Every mode at 1, 2, 4, ... max_workers workers per benchmark.
+    
+    Each point is one trial worker (run_trial) with H2H_PARALLEL set, so a
+    traced mode gets one tracee per worker, all under the same tracer.
+    """
+    for mode in modes:
+        if mode != "baseline" and mode not in TRACED_MODES and not any(mode_hooks(mode)):
+            print(f"⚠️  No hooks for mode {mode!r}; set H2H_{mode.upper()}_PREFIX or "
+                  f"H2H_{mode.upper()}_START/STOP (see usage)")
+            return None
+    max_workers = max_workers or os.cpu_count() or 1
+    
+    print(f"\n{'='*70}")
+    print(f"  RUNNING SCALING SWEEP - Modes: {', '.join(modes)} (1 → {max_workers} workers)")
+    print(f"{'='*70}\n")
+    
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "modes": modes,
+        "cpus": os.cpu_count(),
+        "runs": [],
+    }
+    for workers in worker_counts(max_workers):
+        os.environ["H2H_PARALLEL"] = str(workers)
+        for mode in modes:
+            print(f"[*] {workers} worker(s): {mode}...")
+            run = run_trial(mode, None)
+            run["workers"] = workers
+            results["runs"].append(run)
+        with open(SCALING_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+    
+    print(f"\n[+] Scaling results saved to {SCALING_FILE}")
+    return results
+
+
+def scaling_report(path=SCALING_FILE):
+    """Aggregate throughput and overhead vs baseline at each worker count."""
+    if not path.exists():
+        print("No scaling results found! Run: python3 scripts/head_to_head.py scaling 8")
+        return
+    with open(path) as f:
+        results = json.load(f)
+    throughput = {}
+    tracer = {}
+    for run in results["runs"]:
+        for bench in run["benchmarks"]:
+            test = bench.get("test")
+            if METRICS.get(test) in bench:
+                throughput.setdefault(test, {}).setdefault(run["workers"], {})[run["mode"]] = bench[METRICS[test]]
+        if run.get("tracer"):
+            tracer.setdefault(run["mode"], {})[run["workers"]] = run["tracer"]
+    others = [mode for mode in results["modes"] if mode != "baseline"]
+    
+    print("\n" + "="*70)
+    print(f"  SCALING WITH CONCURRENT WORKERS ({results['cpus']} CPUs, aggregate throughput)")
+    print("="*70 + "\n")
+    print(f"  {'Benchmark':<17} │ {'Workers':>7} │ {'Baseline':>11} │ "
+          + " │ ".join(f"{mode.capitalize():>20}" for mode in others))
+    print(f"  {'─'*17}─┼─{'─'*7}─┼─{'─'*11}─┼─" + "─┼─".join("─"*20 for _ in others))
+    for test, label in TEST_NAMES.items():
+        for workers, by_mode in sorted(throughput.get(test, {}).items()):
+            base = by_mode.get("baseline")
+            cells = []
+            for mode in others:
+                value = by_mode.get(mode)
+                if value is None:
+                    cells.append(f"{'—':>20}")
+                elif base:
+                    cells.append(f"{value:>11,.0f} ({(value - base) / base * 100:+6.1f}%)")
+                else:
+                    cells.append(f"{value:>20,.0f}")
+            base_str = f"{base:>11,.0f}" if base is not None else f"{'—':>11}"
+            print(f"  {label if workers == 1 else '':<17} │ {workers:>7} │ {base_str} │ " + " │ ".join(cells))
+    
+    print("\n  (%) = overhead vs baseline at the same worker count")
+    for mode, by_workers in tracer.items():
+        print(f"  {mode:<9} tracer work per stop: " + ", ".join(
+            f"{workers}w {s['tracer_us_per_stop']:.2f} μs" for workers, s in sorted(by_workers.items())))
+    if tracer:
+        print("  The stand-in tracer is one thread for all tracees: once it is busy,")
+        print("  tracees queue for it and overhead grows with the worker count.")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  TRACED RUNS (workload launched as a child of a tracer we control)
+# ═══════════════════════════════════════════════════════════════════════
+
+TRACED_MODES = ("traced", "sentinel")
+
+
+def make_tracer(mode):
+    """
+    Stand-in tracer for a traced mode: (PtraceTracer, brain name or None).
+
+    sentinel decides with the semantic brain from src/analysis, or with
+    PathClassifier + SequenceDetector where that is not checked out.
+    """
+    from ptrace_tracer import PtraceTracer, brain_decider
+    if mode == "traced":
+        return PtraceTracer(), None
+    from brain_startup import brain_factories
+    for brain in ("semantic", "trie"):
+        try:
+            mapper_factory, detector_factory = brain_factories(brain)
+        except ImportError:
+            continue
+        return PtraceTracer(brain_decider(mapper_factory(), detector_factory())), brain
+    raise RuntimeError("no brain to decide with (src/analysis or path_classifier.py)")
+
+
+def run_traced(mode, cmd, stdout=None):
+    """
+    Run cmd to completion under mode's tracer; returns the tracer stats.
+
+    A configured H2H_<MODE>_PREFIX / START / STOP (e.g. the real Sentinel)
+    takes precedence, and then there are no stats to return.
+    """
+    prefix, start_cmd, stop_cmd = mode_hooks(mode)
+    if any((prefix, start_cmd, stop_cmd)):
+        if start_cmd:
+            subprocess.run(start_cmd, shell=True, check=True)
+        try:
+            subprocess.run(prefix + cmd, stdout=stdout, check=True)
+        finally:
+            if stop_cmd:
+                subprocess.run(stop_cmd, shell=True, check=False)
+        return None
+    tracer, brain = make_tracer(mode)
+    returncode = tracer.run(cmd, stdout=stdout)
+    if returncode != 0:
+        raise RuntimeError(f"traced workload exited with status {returncode}")
+    return {"brain": brain, **tracer.stats()}
+
+
+def run_traced_benchmarks(mode):
+    """run_all_benchmarks(mode) in a child under the tracer, plus the tracer's own stats."""
+    stats = run_traced(mode, [sys.executable, os.path.abspath(__file__), "run-as", mode])
+    output_file = RESULTS_DIR / f"{mode}_results.json"
+    with open(output_file) as f:
+        results = json.load(f)
+    results["tracer"] = stats
+    with open(output_file, "w") as f:
+        json.dump(results, f, indent=2)
+    if stats:
+        print(f"[+] Tracer: {stats['stops']:,} stops, {stats['tracer_us_per_stop']:.2f} μs per stop"
+              + (f", {stats['decide_us_per_decision']:.2f} μs per decision ({stats['brain']} brain)"
+                 if stats["brain"] else ""))
+    return results
+
+
+def print_cost_breakdown(throughput, tracer):
+    """
+    Split Sentinel's overhead into ptrace stop/resume and brain decisions.
+
+    throughput is {test: {mode: headline metric}}, tracer is {mode: [tracer
+    stats, ...]}. Deltas are in % of baseline throughput, so the ptrace and
+    brain columns add up to the total.
+    """
+    if not any("traced" in by_mode for by_mode in throughput.values()):
+        return
+    print("\n" + "="*70)
+    print("  SENTINEL COST BREAKDOWN (Δ % of baseline throughput)")
+    print("="*70 + "\n")
+    print(f"  {'Benchmark':<17} │ {'ptrace stop/resume':>18} │ {'brain decisions':>15} │ {'total':>8}")
+    print(f"  {'─'*17}─┼─{'─'*18}─┼─{'─'*15}─┼─{'─'*8}")
+    for test, label in TEST_NAMES.items():
+        by_mode = throughput.get(test, {})
+        base, traced, sentinel = (by_mode.get(m) for m in ("baseline", "traced", "sentinel"))
+        if not base or traced is None:
+            continue
+        ptrace_str = f"{(traced - base) / base * 100:+.1f}%"
+        brain_str = f"{(sentinel - traced) / base * 100:+.1f}%" if sentinel is not None else "—"
+        total_str = f"{(sentinel - base) / base * 100:+.1f}%" if sentinel is not None else "—"
+        print(f"  {label:<17} │ {ptrace_str:>18} │ {brain_str:>15} │ {total_str:>8}")
+    
+    for mode, runs in tracer.items():
+        stops = sum(s["stops"] for s in runs)
+        decisions = sum(s["decisions"] for s in runs)
+        tracer_sec = sum(s["tracer_sec"] for s in runs)
+        decide_sec = sum(s["decide_sec"] for s in runs)
+        print(f"\n  {mode:<9} {stops:,} stops, "
+              f"{tracer_sec / stops * 1e6 if stops else 0:.2f} μs tracer work per stop")
+        if decisions:
+            print(f"  {'':<9} {decisions:,} decisions ({runs[0]['brain']} brain), "
+                  f"{decide_sec / decisions * 1e6:.2f} μs each, {decide_sec / tracer_sec:.0%} of tracer work")
+    if tracer:
+        print("\n  Tracer work is waitpid() → PTRACE_SYSCALL in the tracer; the kernel's")
+        print("  context switches make up the rest of the ptrace stop/resume cost.")
+
+
+# ═══════════════════════════════════════════════════════════════════════
+#  TRIAL RUNNER (repeated, interleaved, bootstrap confidence intervals)
+# ═══════════════════════════════════════════════════════════════════════
+
+TRIALS_FILE = RESULTS_DIR / "trials_results.json"
+BOOTSTRAP_RESAMPLES = 10000
+CONFIDENCE = 0.95
+
+
+def latency_metric(result):
+    """The p99 key of a benchmark result, whatever its unit (p99_ns / p99_us / p99_ms)."""
+    for key in ("p99_ns", "p99_us", "p99_ms"):
+        if key in result:
+            return key
+    return None
+
+
+def warm_up(bench_fn, iterations, metric, max_rounds=10, window=3, tolerance=0.05):
+    """
+    Run short rounds of a workload until it reaches steady state.
+
+    Steady means the last `window` rounds agree within ±tolerance of their
+    mean. Returns (rounds run, steady?).
+    """
+    history = []
+    for rounds in range(1, max_rounds + 1):
+        history.append(bench_fn(max(iterations // 10, 1)).get(metric, 0))
+        recent = history[-window:]
+        if len(recent) == window and max(recent) - min(recent) <= tolerance * statistics.fmean(recent):
+            return rounds, True
+    return max_rounds, False
+
+
+def run_trial_worker(mode, cpu):
+    """
+    One trial of every workload in this process, pinned to cpu; returns the results dict.
+
+    With --parallel N the workloads run in N processes, pinned round robin
+    to the allowed CPUs starting at cpu.
+    """
+    workers = parallel_workers()
+    cpus = None
+    if cpu is not None and workers > 1:
+        allowed = sorted(os.sched_getaffinity(0))
+        start = allowed.index(cpu) if cpu in allowed else 0
+        cpus = allowed[start:] + allowed[:start]
+    elif cpu is not None:
+        os.sched_setaffinity(0, {cpu})
+    trial = {"mode": mode, "cpu": cpu, "parallel": workers, "pid": os.getpid(),
+             "benchmarks": [], "warmup": {}}
+    for name, test, bench_fn, iterations in BENCHMARKS:
+        # a failed warmup is reported once, as the benchmark's error
+        trial["warmup"][test] = {"rounds": 0, "steady": True}
+        try:
+            rounds, steady = warm_up(bench_fn, iterations, METRICS[test])
+            trial["warmup"][test] = {"rounds": rounds, "steady": steady}
+            trial["benchmarks"].append(run_benchmark(bench_fn, iterations, cpus))
+        except Exception as e:
+            trial["benchmarks"].append({"test": test, "error": str(e)})
+    return trial
+
+
+def mode_hooks(mode):
+    """(command prefix, start command, stop command) for a mode, from H2H_<MODE>_* variables."""
+    env = f"H2H_{mode.upper()}_"
+    return (shlex.split(os.environ.get(env + "PREFIX", "")),
+            os.environ.get(env + "START"), os.environ.get(env + "STOP"))
+
+
+def run_trial(mode, cpu):
+    """Run one trial worker under mode's hooks or tracer; the worker prints its results as JSON."""
+    cmd = [sys.executable, os.path.abspath(__file__), "worker", mode,
+           str(cpu if cpu is not None else -1)]
+    tracer_stats = None
+    if mode in TRACED_MODES:
+        # a file, not a pipe: the tracer cannot drain a pipe while it waits on the tracee
+        with tempfile.TemporaryFile() as out_file:
+            tracer_stats = run_traced(mode, cmd, stdout=out_file)
+            out_file.seek(0)
+            out = out_file.read()
+    else:
+        prefix, start_cmd, stop_cmd = mode_hooks(mode)
+        if start_cmd:
+            subprocess.run(start_cmd, shell=True, check=True)
+        try:
+            out = subprocess.run(prefix + cmd, stdout=subprocess.PIPE, check=True).stdout
+        finally:
+            if stop_cmd:
+                subprocess.run(stop_cmd, shell=True, check=False)
+    # tracers may print to the shared stdout; the results are the last line
+    trial = json.loads(out.strip().splitlines()[-1])
+    if tracer_stats:
+        trial["tracer"] = tracer_stats
+    return trial
+
+
+def run_trials(modes, trials=10, cpu=None):
+    """
+    trials rounds of every mode, interleaved, order rotated per round.
+
+    Rotation spreads slow drift (thermal, background load) evenly over the
+    modes instead of letting it land on whichever mode runs last.
+    """
+    for mode in modes:
+        if mode != "baseline" and mode not in TRACED_MODES and not any(mode_hooks(mode)):
+            print(f"⚠️  No hooks for mode {mode!r}; set H2H_{mode.upper()}_PREFIX or "
+                  f"H2H_{mode.upper()}_START/STOP (see usage)")
+            return None
+    if cpu is None:
+        cpu = max(os.sched_getaffinity(0))
+    
+    print(f"\n{'='*70}")
+    print(f"  RUNNING {trials} INTERLEAVED TRIALS - Modes: {', '.join(modes)} (CPU {cpu})")
+    print(f"{'='*70}\n")
+    
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "modes": modes,
+        "cpu": cpu,
+        "confidence": CONFIDENCE,
+        "trials": [],
+    }
+    for t in range(trials):
+        order = modes[t % len(modes):] + modes[:t % len(modes)]
+        for mode in order:
+            print(f"[*] Trial {t + 1}/{trials}: {mode}...")
+            trial = run_trial(mode, cpu)
+            trial["trial"] = t
+            results["trials"].append(trial)
+            unsteady = [test for test, w in trial["warmup"].items() if not w["steady"]]
+            if unsteady:
+                print(f"    ⚠️  no steady state after warmup: {', '.join(unsteady)}")
+        # save after every round, so an interrupted run still has a report
+        with open(TRIALS_FILE, "w") as f:
+            json.dump(results, f, indent=2)
+    
+    print(f"\n[+] Per-trial results saved to {TRIALS_FILE}")
+    return results
+
+
+def bootstrap_ci(values, confidence=CONFIDENCE, resamples=BOOTSTRAP_RESAMPLES, seed=0):
+    """(mean, low, high): percentile bootstrap interval of the mean."""
+    rng = random.Random(seed)
+    n = len(values)
+    means = sorted(statistics.fmean(rng.choices(values, k=n)) for _ in range(resamples))
+    tail = (1 - confidence) / 2
+    return (statistics.fmean(values), means[int(tail * resamples)],
+            means[min(int((1 - tail) * resamples), resamples - 1)])
+
+
+def summarize_trials(results):
+    """{test: {metric: {mode: (mean, low, high, n)}}} from saved per-trial results."""
+    samples = {}
+    for trial in results["trials"]:
+        for bench in trial["benchmarks"]:
+            test = bench.get("test")
+            if test not in METRICS or "error" in bench:
+                continue
+            for metric in (METRICS[test], latency_metric(bench)):
+                if metric and metric in bench:
+                    samples.setdefault(test, {}).setdefault(metric, {}).setdefault(
+                        trial["mode"], []).append(bench[metric])
+    summary = {}
+    for test, by_metric in samples.items():
+        for metric, by_mode in by_metric.items():
+            for mode, values in by_mode.items():
+                summary.setdefault(test, {}).setdefault(metric, {})[mode] = (
+                    *bootstrap_ci(values, results.get("confidence", CONFIDENCE)), len(values))
+    return summary
+
+
+def trial_report(path=TRIALS_FILE):
+    """Confidence-interval comparison table, regenerated from the saved trials."""
+    if not path.exists():
+        print("No trial results found! Run: python3 scripts/head_to_head.py trials 10 baseline ...")
+        return
+    with open(path) as f:
+        results = json.load(f)
+    summary = summarize_trials(results)
+    others = [mode for mode in results["modes"] if mode != "baseline"]
+    confidence = results.get("confidence", CONFIDENCE)
+    
+    print("\n" + "="*70)
+    print(f"  HEAD-TO-HEAD TRIALS ({len(results['trials'])} runs, {confidence:.0%} bootstrap CIs)")
+    print("="*70 + "\n")
+    print(f"  {'Benchmark':<17} │ {'Metric':<13} │ {'Baseline [CI]':<32} │ "
+          + " │ ".join(f"{mode.capitalize() + ' Δ':<16}" for mode in others))
+    print(f"  {'─'*17}─┼─{'─'*13}─┼─{'─'*32}─┼─" + "─┼─".join("─"*16 for _ in others))
+    
+    for test, label in TEST_NAMES.items():
+        for metric, by_mode in summary.get(test, {}).items():
+            if "baseline" not in by_mode:
+                continue
+            base, base_lo, base_hi, n = by_mode["baseline"]
+            cells = []
+            for mode in others:
+                if mode not in by_mode:
+                    cells.append(f"{'—':<16}")
+                    continue
+                mean, lo, hi, _ = by_mode[mode]
+                delta = (mean - base) / base * 100 if base else 0.0
+                significant = hi < base_lo or lo > base_hi
+                marker = "*" if significant else " (n.s.)"
+                cells.append(f"{delta:+7.1f}%{marker:<8}")
+            digits = 0 if base >= 1000 else 2
+            base_str = f"{base:,.{digits}f} [{base_lo:,.{digits}f}, {base_hi:,.{digits}f}]"
+            print(f"  {label:<17} │ {metric:<13} │ {base_str:<32} │ " + " │ ".join(cells))
+    
+    print(f"\n  * = {confidence:.0%} intervals of mode and baseline do not overlap")
+    print("  Throughput: Δ < 0 is overhead. Latency (p99_*): Δ > 0 is overhead.")
+    
+    throughput = {test: {mode: ci[0] for mode, ci in by_metric[METRICS[test]].items()}
+                  for test, by_metric in summary.items() if METRICS[test] in by_metric}
+    tracer = {}
+    for trial in results["trials"]:
+        if trial.get("tracer"):
+            tracer.setdefault(trial["mode"], []).append(trial["tracer"])
+    print_cost_breakdown(throughput, tracer)
+    by_mode = {}
+    for trial in results["trials"]:
+        by_mode.setdefault(trial["mode"], []).extend(trial["benchmarks"])
+    print_op_breakdown(by_mode)
+    
+    unsteady = {}
+    for trial in results["trials"]:
+        for test, w in trial["warmup"].items():
+            if not w["steady"]:
+                unsteady[test] = unsteady.get(test, 0) + 1
+    if unsteady:
+        print("\n  ⚠️  Workloads that never reached steady state in warmup: "
+              + ", ".join(f"{TEST_NAMES.get(t, t)} ({n}×)" for t, n in unsteady.items()))
+
+
 def print_usage():
     """Print usage information."""
     print(__doc__)
@@ -486,15 +1233,18 @@ def main():
         print_usage()
         return
     
+    if "--parallel" in sys.argv:
+        i = sys.argv.index("--parallel")
+        os.environ["H2H_PARALLEL"] = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
     cmd = sys.argv[1].lower()
     
     if cmd == "baseline":
         run_all_benchmarks("baseline")
-    elif cmd == "sentinel":
-        print("⚠️  Make sure Sentinel is attached to THIS process!")
-        print("    Run: ./bin/sentinel --pid $$ (in another terminal)")
-        input("Press Enter when ready...")
-        run_all_benchmarks("sentinel")
+    elif cmd in TRACED_MODES:
+        run_traced_benchmarks(cmd)
+    elif cmd == "run-as":
+        run_all_benchmarks(sys.argv[2])
     elif cmd == "hyperion":
         print("⚠️  Make sure Hyperion is running on loopback!")
         print("    Run: sudo ./bin/hyperion_ctrl -iface lo")
@@ -502,14 +1252,38 @@ def main():
         run_all_benchmarks("hyperion")
     elif cmd == "report":
         generate_report()
+    elif cmd == "trials":
+        args = sys.argv[2:]
+        cpu = None
+        if "--cpu" in args:
+            i = args.index("--cpu")
+            cpu = int(args[i + 1])
+            del args[i:i + 2]
+        trials = int(args.pop(0)) if args and args[0].isdigit() else 10
+        modes = args or ["baseline", *TRACED_MODES] + (["hyperion"] if any(mode_hooks("hyperion")) else [])
+        if run_trials(modes, trials, cpu):
+            trial_report()
+    elif cmd == "trials-report":
+        trial_report()
+    elif cmd == "scaling":
+        args = sys.argv[2:]
+        max_workers = int(args.pop(0)) if args and args[0].isdigit() else None
+        modes = args or ["baseline", *TRACED_MODES] + (["hyperion"] if any(mode_hooks("hyperion")) else [])
+        if run_scaling(modes, max_workers):
+            scaling_report()
+    elif cmd == "scaling-report":
+        scaling_report()
+    elif cmd == "worker":
+        cpu = int(sys.argv[3])
+        print(json.dumps(run_trial_worker(sys.argv[2], cpu if cpu >= 0 else None)))
     elif cmd == "auto":
-        print("Running baseline automatically...")
         run_all_benchmarks("baseline")
+        for mode in TRACED_MODES:
+            run_traced_benchmarks(mode)
+        generate_report()
         print("\n" + "="*70)
-        print("Baseline complete. Now run with each runtime and then generate report:")
-        print("  1. Start Sentinel, then: python3 scripts/head_to_head.py sentinel")
-        print("  2. Start Hyperion, then: python3 scripts/head_to_head.py hyperion")
-        print("  3. Generate report:      python3 scripts/head_to_head.py report")
+        print("For Hyperion, start it, then: python3 scripts/head_to_head.py hyperion")
+        print("and regenerate the report:    python3 scripts/head_to_head.py report")
     else:
         print_usage()
 
@@ -4,103 +4,624 @@ IPC Latency Benchmark - Measure Named Pipes round-trip
 =======================================================
 This measures the actual IPC latency between Sentinel C engine and Python brain.
 
+The round-trip test is self-contained: it forks a local stand-in brain that
+speaks the real bridge protocol, so no Sentinel C binary (and no root) is
+needed. Three transports are compared side by side:
+
+    FIFO          persistent named-pipe pair (the current bridge)
+                  request SYSCALL:<verb>:<argument>\n, response 1\n / 0\n
+    Unix socket   the same text protocol over one AF_UNIX stream socket
+    Shared ring   binary slots in an mmap'ed SPSC ring pair with an eventfd
+                  doorbell (shm_ring.py)
+
+Lock-step (depth 1) is what a single tracee sees: send, block on the
+response, repeat. Pipelined runs keep N requests in flight, as N paused
+tracees would. Either way each sample is one request's send → response.
+
+A multi-threaded tracee is simulated too: N threads stopped at once, served
+lock-step or pipelined with sequence-tagged requests (SEQ:<seq>:<verb>:
+<argument> → <seq>:<verdict>) that the brain drains and answers in batches.
+
+Finally K interceptors share one multi-channel brain (brain_server.py),
+each on its own FIFO pair or Unix-socket connection, and tail latency is
+reported per channel - with and without one stalled interceptor that never
+reads its verdicts.
+
+Before the round trips, the per-message encode + decode cost of the JSON,
+colon-text and binary (wire_format.py) encodings is measured for typical
+and ADVERSARIAL_PATHS-style (up to 4 KB) paths.
+
 Usage:
-    1. Terminal 1: Run the Sentinel C binary normally
-       sudo ./bin/sentinel test /bin/bash
-       
-    2. Terminal 2: Run this benchmark (requires pipes to exist)
-       python3 scripts/ipc_benchmark.py
+    1. Copy to sentinel-runtime/scripts/ipc_benchmark.py
+       (together with latency_histogram.py, event_types.py, shm_ring.py,
+       wire_format.py, brain_server.py, path_classifier.py and
+       sequence_detector.py)
+    2. Run: python3 scripts/ipc_benchmark.py
 
-Note: This simulates messages through the Named Pipes to measure real latency.
+The FIFOs are created in a private temp directory, so a running Sentinel
+on /tmp/sentinel_req and /tmp/sentinel_resp is left alone.
 """
 
 import os
+import sys
 import time
-import statistics
 import json
+import shutil
+import signal
+import socket
+import selectors
+import tempfile
+from collections import deque
+
+import wire_format
+from brain_server import ALLOW, BLOCK, BrainServer, PolicyDecider, answer_lines
+from event_types import VERB_NAMES, verb_id
+from latency_histogram import LatencyHistogram
+from path_classifier import PathClassifier
+from sequence_detector import SequenceDetector
+from shm_ring import DEFAULT_SPIN, RingClient, ShmRing, serve_ring
+
+# A little of everything the interceptor forwards; the stand-in blocks
+# unlinks of protected files, like the M1 closed-loop ping-pong test
+BRIDGE_REQUESTS = [
+    b"SYSCALL:open:/etc/passwd\n",
+    b"SYSCALL:read:3\n",
+    b"SYSCALL:unlink:/home/user/protected.txt\n",
+    b"SYSCALL:connect:192.168.1.1:443\n",
+    b"SYSCALL:execve:/usr/bin/bash\n",
+    b"SYSCALL:unlink:/tmp/scratch.txt\n",
+]
 
-REQ_PIPE = "/tmp/sentinel_req"
-RESP_PIPE = "/tmp/sentinel_resp"
 
-def benchmark_ipc_roundtrip(iterations=100):
+# ═══════════════════════════════════════════════════════════════
+#  ECHO BRAIN STAND-INS (one per transport)
+# ═══════════════════════════════════════════════════════════════
+
+def echo_brain_verdict(verb, argument):
+    """Stand-in policy: block unlink of anything called protected*."""
+    if verb == b"unlink" and b"protected" in argument:
+        return BLOCK
+    return ALLOW
+
+
+def serve_bridge_lines(requests, respond):
     """
-    Measure IPC round-trip by sending messages through Named Pipes.
-    
-    IMPORTANT: This requires a modified sentinel to echo back.
-    For standalone testing, this measures pipe write/read latency only.
+    Serve the text protocol until the request stream closes.
+
+    Mirrors brain.py's loop: one blocking readline() per request, one
+    write() per verdict, channel held open for the whole session.
     """
+    for line in requests:
+        kind, verb, argument = line.rstrip(b"\n").split(b":", 2)
+        verdict = echo_brain_verdict(verb, argument) if kind == b"SYSCALL" else BLOCK
+        respond(verdict + b"\n")
+
+
+def serve_bridge_batches(read, write):
+    """
+    Batch-draining brain loop for the tagged (pipelined) protocol.
+
+        SEQ:<seq>:<verb>:<argument>\n  →  <seq>:<verdict>\n   any order
+        SYSCALL:<verb>:<argument>\n    →  <verdict>\n         in order
+
+    Every read() drains all requests queued so far and the verdicts for the
+    whole batch go back in one write(). Within a batch, tagged requests
+    with no path argument skip classification, so they are answered ahead
+    of path lookups queued alongside them. Untagged lines keep lock-step
+    clients working unchanged.
+    """
+    pending = b""
+    while True:
+        chunk = read(65536)
+        if not chunk:
+            return
+        *lines, pending = (pending + chunk).split(b"\n")
+        write(answer_lines(lines, echo_brain_verdict))
+
+
+class _EchoBrain:
+    """Forked stand-in brain; subclasses provide the channel."""
+
+    def _spawn(self, serve):
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                serve()
+            finally:
+                os._exit(0)
+
+    def encode(self, line):
+        """Transport-specific form of a SYSCALL:<verb>:<argument> line."""
+        return line
+
+    def _recv_line(self, read):
+        while b"\n" not in self._pending:
+            chunk = read(4096)
+            if not chunk:
+                raise EOFError("echo brain closed the channel")
+            self._pending += chunk
+        line, _, self._pending = self._pending.partition(b"\n")
+        return line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FifoEchoBrain(_EchoBrain):
+    """Text protocol over a pair of persistent named pipes (the current bridge)."""
+
+    name = "FIFO"
+
+    def __init__(self):
+        self.tmpdir = tempfile.mkdtemp(prefix="sentinel_ipc_")
+        self.req_path = os.path.join(self.tmpdir, "sentinel_req")
+        self.resp_path = os.path.join(self.tmpdir, "sentinel_resp")
+        os.mkfifo(self.req_path)
+        os.mkfifo(self.resp_path)
+        self._spawn(self._serve)
+        # Request pipe first, matching _serve(): each FIFO open blocks
+        # until the other end shows up
+        self.req_fd = os.open(self.req_path, os.O_WRONLY)
+        self.resp_fd = os.open(self.resp_path, os.O_RDONLY)
+        self._pending = b""
+
+    def _serve(self):
+        with open(self.req_path, "rb") as requests:
+            resp_fd = os.open(self.resp_path, os.O_WRONLY)
+            serve_bridge_lines(requests, lambda verdict: os.write(resp_fd, verdict))
+            os.close(resp_fd)
+
+    def send(self, request):
+        os.write(self.req_fd, request)
+
+    def recv(self):
+        """Next verdict; blocks until one full response line is in."""
+        return self._recv_line(lambda n: os.read(self.resp_fd, n))
+
+    def close(self):
+        os.close(self.req_fd)      # EOF on the brain's readline loop
+        os.waitpid(self.pid, 0)
+        os.close(self.resp_fd)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+class BatchingFifoEchoBrain(FifoEchoBrain):
+    """FIFO bridge whose brain drains tagged requests in batches."""
+
+    name = "FIFO tagged"
+
+    def _serve(self):
+        req_fd = os.open(self.req_path, os.O_RDONLY)
+        resp_fd = os.open(self.resp_path, os.O_WRONLY)
+        serve_bridge_batches(lambda n: os.read(req_fd, n), lambda data: os.write(resp_fd, data))
+        os.close(resp_fd)
+        os.close(req_fd)
+
+    def recv_all(self):
+        """Every complete response line available; blocks for at least one."""
+        lines = [self.recv()]
+        while b"\n" in self._pending:
+            line, _, self._pending = self._pending.partition(b"\n")
+            lines.append(line)
+        return lines
+
+
+class UnixSocketEchoBrain(_EchoBrain):
+    """Same text protocol over one connected AF_UNIX stream socket."""
+
+    name = "Unix socket"
+
+    def __init__(self):
+        self.sock, brain_end = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._spawn(lambda: self._serve(brain_end))
+        brain_end.close()
+        self._pending = b""
+
+    def _serve(self, sock):
+        self.sock.close()
+        with sock.makefile("rb") as requests:
+            serve_bridge_lines(requests, sock.sendall)
+
+    def send(self, request):
+        self.sock.sendall(request)
+
+    def recv(self):
+        return self._recv_line(self.sock.recv)
+
+    def close(self):
+        self.sock.shutdown(socket.SHUT_WR)
+        os.waitpid(self.pid, 0)
+        self.sock.close()
+
+
+class RingEchoBrain(_EchoBrain):
+    """Binary request / verdict slots in a shared-memory SPSC ring pair."""
+
+    name = "Shared ring"
+
+    STOP = 0xFFFF      # verb id that ends the serve loop
+
+    def __init__(self):
+        self.requests = ShmRing()
+        self.verdicts = ShmRing(slot_size=16)
+        self._spawn(self._serve)
+        self.client = RingClient(self.requests, self.verdicts)
+
+    def _serve(self):
+        verb_names = [name.encode() for name in VERB_NAMES]
+        decide = lambda pid, verb, argument: echo_brain_verdict(verb_names[verb], argument) == ALLOW
+        serve_ring(self.requests, self.verdicts, decide, stop_verb=self.STOP)
+
+    def encode(self, line):
+        _, verb, argument = line.rstrip(b"\n").split(b":", 2)
+        return (1234, verb_id(verb.decode()), argument)
+
+    def send(self, request):
+        self.client.send(*request)
+
+    def recv(self):
+        _, allow = self.client.recv()
+        return ALLOW if allow else BLOCK
+
+    def close(self):
+        self.client.send(0, self.STOP, b"")
+        os.waitpid(self.pid, 0)
+        self.requests.close()
+        self.verdicts.close()
+
+
+TRANSPORTS = {
+    "fifo": FifoEchoBrain,
+    "unix": UnixSocketEchoBrain,
+    "ring": RingEchoBrain,
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ROUND-TRIP BENCHMARKS
+# ═══════════════════════════════════════════════════════════════
+
+def benchmark_ipc_roundtrip(iterations=10000, depth=1, transport="fifo"):
+    """
+    True request → verdict round trip against a forked echo brain.
+
+    depth is the number of requests kept in flight: 1 is lock-step, >1 is
+    pipelined (responses come back in request order, so each one is
+    matched to the oldest outstanding send). Returns (histogram,
+    requests/sec, verdict counts).
+    """
+    latencies = LatencyHistogram()
+    verdicts = {ALLOW: 0, BLOCK: 0}
+    in_flight = deque()
+    sent = 0
     
-    if not os.path.exists(REQ_PIPE) or not os.path.exists(RESP_PIPE):
-        print("[!] Named Pipes don't exist. Creating for standalone test...")
-        if not os.path.exists(REQ_PIPE): os.mkfifo(REQ_PIPE)
-        if not os.path.exists(RESP_PIPE): os.mkfifo(RESP_PIPE)
-    
-    # Standalone test: measure pipe open/write latency
-    latencies = []
+    with TRANSPORTS[transport]() as brain:
+        requests = [brain.encode(line) for line in BRIDGE_REQUESTS]
+        # Warm the channel and the brain's code paths before measuring
+        for request in requests:
+            brain.send(request)
+            brain.recv()
+        
+        start = time.perf_counter_ns()
+        while sent < iterations or in_flight:
+            while sent < iterations and len(in_flight) < depth:
+                in_flight.append(time.perf_counter_ns())
+                brain.send(requests[sent % len(requests)])
+                sent += 1
+            verdict = brain.recv()
+            latencies.record(time.perf_counter_ns() - in_flight.popleft())
+            verdicts[verdict] = verdicts.get(verdict, 0) + 1
+        elapsed_ns = time.perf_counter_ns() - start
     
-    print(f"[*] Testing pipe write latency ({iterations} iterations)...")
+    return latencies, iterations / (elapsed_ns / 1e9), verdicts
+
+
+# ═══════════════════════════════════════════════════════════════
+#  STOPPED TRACEES (multi-threaded tracee simulation)
+# ═══════════════════════════════════════════════════════════════
+
+def benchmark_stopped_tracees(tracees, requests=10000, pipelined=True):
+    """
+    N threads of a traced process, each stopped at a syscall until its verdict.
+
+    Each simulated tracee stops, waits for its verdict, resumes and at once
+    stops again at its next syscall. Latency is measured from stop to
+    verdict, so in lock-step mode it includes the wait behind every other
+    stopped thread.
+      lock-step   one untagged request at a time, oldest stopped thread first
+      pipelined   every stopped thread's request in flight, tagged with a
+                  sequence id; verdicts come back in batches, in any order,
+                  and the threads they release are resubmitted in one write()
+    Returns (histogram, verdicts/sec).
+    """
+    bodies = [line[len(b"SYSCALL:"):] for line in BRIDGE_REQUESTS]
+    latencies = LatencyHistogram()
     
-    for i in range(iterations):
-        test_msg = json.dumps({
-            "verb": "open",
-            "path": f"/tmp/test_{i}.txt",
-            "pid": 12345,
-            "fd": 3,
-            "ret": 0
-        }) + "\n"
+    with BatchingFifoEchoBrain() as brain:
+        for line in BRIDGE_REQUESTS:   # warm up
+            brain.send(line)
+            brain.recv()
         
         start = time.perf_counter_ns()
-        
-        # Open, write, close - this is what brain.py sees as IPC overhead
-        try:
-            # In real usage, pipes stay open. This measures worst-case.
-            f_req = open(REQ_PIPE, "w")
-            f_req.write(test_msg)
-            f_req.flush()
-            f_req.close()
-        except Exception as e:
-            print(f"[!] Error: {e}")
-            break
-        
-        end = time.perf_counter_ns()
-        latencies.append(end - start)
+        if pipelined:
+            stopped = {}      # seq -> stop time
+            seq = sent = done = 0
+            
+            def stop_threads(count, now):
+                nonlocal seq, sent
+                out = []
+                for _ in range(min(count, requests - sent)):
+                    seq += 1
+                    stopped[seq] = now
+                    out.append(b"SEQ:%d:%s" % (seq, bodies[seq % len(bodies)]))
+                sent += len(out)
+                if out:
+                    brain.send(b"".join(out))
+            
+            stop_threads(tracees, time.perf_counter_ns())
+            while done < requests:
+                lines = brain.recv_all()
+                now = time.perf_counter_ns()
+                for line in lines:
+                    tag, _, _ = line.partition(b":")
+                    latencies.record(now - stopped.pop(int(tag)))
+                done += len(lines)
+                stop_threads(len(lines), now)
+        else:
+            queue = deque([(i, start) for i in range(tracees)])
+            for n in range(requests):
+                tracee, stopped_at = queue.popleft()
+                brain.send(BRIDGE_REQUESTS[n % len(BRIDGE_REQUESTS)])
+                brain.recv()
+                now = time.perf_counter_ns()
+                latencies.record(now - stopped_at)
+                queue.append((tracee, now))
+        elapsed_ns = time.perf_counter_ns() - start
     
-    return latencies
+    return latencies, requests / (elapsed_ns / 1e9)
+
 
+# ═══════════════════════════════════════════════════════════════
+#  MULTI-CHANNEL BRAIN (brain_server.py)
+# ═══════════════════════════════════════════════════════════════
 
-def benchmark_json_parsing(iterations=1000):
-    """Measure JSON parse/serialize overhead (part of IPC cost)."""
+STALLED_BURST = 200000   # ~3 MB of requests; the verdicts overflow any pipe or socket buffer
+
+
+class MultiChannelBrain:
+    """
+    Forked BrainServer with one channel per simulated interceptor.
+
+    Channels alternate FIFO pair / Unix-socket connection (or are all one
+    kind). Decisions go through PolicyDecider(PathClassifier(),
+    SequenceDetector()), i.e. classification plus chain detection per
+    request, not the echo policy.
+    """
+
+    def __init__(self, channels, transport="mixed"):
+        self.tmpdir = tempfile.mkdtemp(prefix="sentinel_brain_")
+        kinds = [transport] * channels if transport != "mixed" else \
+                ["fifo" if k % 2 == 0 else "unix" for k in range(channels)]
+        fifos = [(os.path.join(self.tmpdir, f"ch{k}_req"), os.path.join(self.tmpdir, f"ch{k}_resp"))
+                 for k, kind in enumerate(kinds) if kind == "fifo"]
+        sock_path = os.path.join(self.tmpdir, "brain.sock")
+        ready_r, ready_w = os.pipe()
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                os.close(ready_r)
+                server = BrainServer(PolicyDecider(PathClassifier(), SequenceDetector()))
+                for req_path, resp_path in fifos:
+                    server.add_fifo_channel(req_path, resp_path)
+                server.add_unix_listener(sock_path)
+                os.write(ready_w, b"1")
+                os.close(ready_w)
+                server.run()
+            finally:
+                os._exit(0)
+        os.close(ready_w)
+        os.read(ready_r, 1)
+        os.close(ready_r)
+        
+        self.channels = []      # (send_fd, recv_fd)
+        self._fifo_fds = []
+        self._socks = []
+        fifo_paths = iter(fifos)
+        for kind in kinds:
+            if kind == "fifo":
+                req_path, resp_path = next(fifo_paths)
+                channel = (os.open(req_path, os.O_WRONLY), os.open(resp_path, os.O_RDONLY))
+                self._fifo_fds.extend(channel)
+                self.channels.append(channel)
+            else:
+                self.channels.append(self.connect())
     
-    test_messages = [
-        '{"verb":"open","path":"/etc/passwd","pid":1234,"fd":3,"ret":0}',
-        '{"verb":"sendto","path":"","pid":1234,"fd":5,"ret":1024}',
-        '{"verb":"execve","path":"/usr/bin/bash","pid":5678,"fd":-1,"ret":0}',
-    ]
+    def connect(self):
+        """One more Unix-socket channel (an interceptor attaching late)."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(os.path.join(self.tmpdir, "brain.sock"))
+        self._socks.append(sock)
+        return sock.fileno(), sock.fileno()
     
-    latencies = []
+    def close(self):
+        for fd in self._fifo_fds:
+            os.close(fd)
+        for sock in self._socks:
+            sock.close()
+        os.kill(self.pid, signal.SIGTERM)
+        os.waitpid(self.pid, 0)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
     
-    for _ in range(iterations):
-        for msg in test_messages:
-            start = time.perf_counter_ns()
-            parsed = json.loads(msg)
-            _ = json.dumps(parsed)
-            end = time.perf_counter_ns()
-            latencies.append(end - start)
+    def __enter__(self):
+        return self
     
-    return latencies
+    def __exit__(self, *exc):
+        self.close()
 
 
-def print_stats(name, latencies_ns):
-    """Print statistics."""
-    latencies_us = [l / 1000 for l in latencies_ns]
+def benchmark_multi_channel(channels, requests_per_channel=2000, transport="mixed", stalled=False):
+    """
+    K interceptors, one channel each, sharing one multi-channel brain.
+
+    Every channel runs lock-step (send, wait for the verdict, send the
+    next), all K at once from one selector loop. With stalled=True one
+    extra interceptor floods STALLED_BURST requests and never reads a
+    verdict, so the brain's outbox for it stays full for the whole run.
+    Returns (per-channel histograms, overall requests/sec).
+    """
+    with MultiChannelBrain(channels, transport) as brain:
+        if stalled:
+            send_fd, _ = brain.connect()
+            os.write(send_fd, b"SYSCALL:read:3\n" * STALLED_BURST)
+        
+        selector = selectors.DefaultSelector()
+        latencies = [LatencyHistogram() for _ in range(channels)]
+        sent = [0] * channels
+        pending = [b""] * channels
+        sent_at = [0] * channels
+        for k, (_, recv_fd) in enumerate(brain.channels):
+            selector.register(recv_fd, selectors.EVENT_READ, k)
+        
+        def send(k):
+            sent_at[k] = time.perf_counter_ns()
+            os.write(brain.channels[k][0], BRIDGE_REQUESTS[sent[k] % len(BRIDGE_REQUESTS)])
+            sent[k] += 1
+        
+        start = time.perf_counter_ns()
+        for k in range(channels):
+            send(k)
+        done, total = 0, channels * requests_per_channel
+        while done < total:
+            for key, _ in selector.select():
+                k = key.data
+                pending[k] += os.read(key.fd, 4096)
+                if not pending[k].endswith(b"\n"):
+                    continue
+                latencies[k].record(time.perf_counter_ns() - sent_at[k])
+                pending[k] = b""
+                done += 1
+                if sent[k] < requests_per_channel:
+                    send(k)
+        elapsed_ns = time.perf_counter_ns() - start
+        selector.close()
+    
+    return latencies, total / (elapsed_ns / 1e9)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  WIRE FORMATS
+# ═══════════════════════════════════════════════════════════════
+
+# (verb, path, pid, fd, ret)
+WIRE_MESSAGES = {
+    "typical": [
+        ("open", "/etc/passwd", 1234, 3, 0),
+        ("sendto", "", 1234, 5, 1024),
+        ("execve", "/usr/bin/bash", 5678, -1, 0),
+    ],
+    # ADVERSARIAL_PATHS-style (sentinel_stress_test.py): PATH_MAX, deep
+    # nesting, non-ASCII and embedded control bytes
+    "adversarial": [
+        ("open", "/" + "x" * 4095, 1234, 3, 0),
+        ("open", "/".join(["a" * 10] * 50), 1234, 4, 0),
+        ("unlink", "/home/user/документы/секретный.pdf", 5678, -1, 0),
+        ("open", "/tmp/\x00\x01\x02malicious", 5678, 5, 0),
+    ],
+}
+
+
+def json_roundtrip(verb, path, pid, fd, ret):
+    wire = json.dumps({"verb": verb, "path": path, "pid": pid, "fd": fd, "ret": ret}).encode()
+    message = json.loads(wire)
+    return len(wire), message["path"]
+
+
+def text_roundtrip(verb, path, pid, fd, ret):
+    # SYSCALL:<verb>:<argument> carries no pid / fd / ret at all
+    wire = f"SYSCALL:{verb}:{path}\n".encode("utf-8", "surrogateescape")
+    _, verb, argument = wire.rstrip(b"\n").split(b":", 2)
+    return len(wire), argument.decode("utf-8", "surrogateescape")
+
+
+def text_full_roundtrip(verb, path, pid, fd, ret):
+    # The same fields as JSON / binary: SYSCALL:<pid>:<verb>:<fd>:<ret>:<path>
+    wire = f"SYSCALL:{pid}:{verb}:{fd}:{ret}:{path}\n".encode("utf-8", "surrogateescape")
+    _, pid, verb, fd, ret, argument = wire.rstrip(b"\n").split(b":", 5)
+    pid, fd, ret = int(pid), int(fd), int(ret)
+    return len(wire), argument.decode("utf-8", "surrogateescape")
+
+
+# The brain reads into one preallocated buffer and decodes from a view of it
+_WIRE_BUFFER = memoryview(bytearray(64 * 1024))
+
+
+def binary_roundtrip(verb, path, pid, fd, ret):
+    raw = path.encode("utf-8", "surrogateescape")
+    size = wire_format.encode_into(_WIRE_BUFFER, 0, verb, pid, fd, ret, raw)
+    verb, pid, fd, ret, path, _ = wire_format.decode(_WIRE_BUFFER)
+    return size, wire_format.decode_path(path)
+
+
+WIRE_CODECS = {
+    "JSON": json_roundtrip,
+    "text": text_roundtrip,
+    "text-all": text_full_roundtrip,
+    "binary": binary_roundtrip,
+}
+
+
+def benchmark_wire_formats(iterations=1000):
+    """
+    Encode + decode cost per message for each bridge wire format.
+
+    Every decode ends with the path as a str, which is what the classifier
+    needs. For binary, verbs are event_types ids, as the C side would send
+    them. Returns one dict per (format, message set) with a histogram
+    and the mean message size.
+    """
+    results = []
+    for set_name, messages in WIRE_MESSAGES.items():
+        binary_messages = [(verb_id(verb), *rest) for verb, *rest in messages]
+        for codec_name, roundtrip in WIRE_CODECS.items():
+            batch = binary_messages if codec_name == "binary" else messages
+            for (_, path, *_), message in zip(messages, batch):
+                if roundtrip(*message)[1] != path:
+                    raise AssertionError(f"{codec_name} mangled {path[:40]!r}")
+            
+            latencies = LatencyHistogram()
+            wire_bytes = 0
+            for _ in range(iterations):
+                for message in batch:
+                    start = time.perf_counter_ns()
+                    size, _ = roundtrip(*message)
+                    end = time.perf_counter_ns()
+                    latencies.record(end - start)
+                    wire_bytes += size
+            results.append({
+                "format": codec_name,
+                "messages": set_name,
+                "histogram": latencies,
+                "bytes_per_message": wire_bytes / latencies.count,
+            })
+    return results
+
+
+def print_stats(name, latencies):
+    """Print statistics (latencies is a LatencyHistogram in ns)."""
+    stats = latencies.summary()  # μs
     
     print(f"\n{name}")
-    print(f"  Mean:    {statistics.mean(latencies_us):.2f} μs")
-    print(f"  Median:  {statistics.median(latencies_us):.2f} μs")
-    print(f"  P95:     {statistics.quantiles(latencies_us, n=20)[18]:.2f} μs")
-    print(f"  P99:     {statistics.quantiles(latencies_us, n=100)[98]:.2f} μs")
+    print(f"  Mean:    {stats['mean']:.2f} μs")
+    print(f"  Median:  {stats['p50']:.2f} μs")
+    print(f"  P95:     {stats['p95']:.2f} μs")
+    print(f"  P99:     {stats['p99']:.2f} μs")
+    print(f"  P99.9:   {stats['p999']:.2f} μs")
+    print(f"  Max:     {stats['max']:.2f} μs")
     
-    return statistics.mean(latencies_us)
+    return stats["mean"]
 
 
 def main():
@@ -109,17 +630,130 @@ def main():
     print("╚══════════════════════════════════════════════════════════════╝")
     print()
     
-    # JSON overhead
-    print("[*] Measuring JSON serialization overhead...")
-    json_latencies = benchmark_json_parsing(1000)
-    json_mean = print_stats("JSON Parse + Serialize", json_latencies)
+    if not all(hasattr(os, name) for name in ("mkfifo", "fork", "eventfd")):
+        print("[!] Named pipes, fork() and eventfd are required (Linux, Python 3.10+)")
+        sys.exit(1)
+    
+    # Wire format cost
+    print("[*] Measuring wire format encode + decode (JSON / text / binary)...")
+    wire_results = []
+    for r in benchmark_wire_formats(1000):
+        mean = print_stats(f"{r['format']} encode + decode ({r['messages']} paths)", r["histogram"])
+        print(f"  Size:    {r['bytes_per_message']:.0f} bytes/message")
+        stats = r["histogram"].summary()
+        wire_results.append({
+            "format": r["format"],
+            "messages": r["messages"],
+            "mean_us": mean,
+            "p99_us": stats["p99"],
+            "bytes_per_message": r["bytes_per_message"],
+        })
+    
+    # Bridge round trip against a forked echo brain, per transport
+    results = {"wire_formats": wire_results, "roundtrip": []}
+    for transport, brain_cls in TRANSPORTS.items():
+        for depth in (1, 4, 16, 64):
+            mode = "lock-step" if depth == 1 else f"pipelined x{depth}"
+            print(f"\n[*] Measuring {brain_cls.name} round trip, {mode} (10,000 requests)...")
+            latencies, rate, verdicts = benchmark_ipc_roundtrip(10000, depth, transport)
+            mean = print_stats(f"{brain_cls.name} Round Trip ({mode})", latencies)
+            print(f"  Rate:    {rate:,.0f} requests/sec")
+            print(f"  Verdicts: {verdicts[ALLOW]:,} allow / {verdicts[BLOCK]:,} block")
+            stats = latencies.summary()
+            results["roundtrip"].append({
+                "transport": transport,
+                "depth": depth,
+                "mean_us": mean,
+                "p50_us": stats["p50"],
+                "p99_us": stats["p99"],
+                "p999_us": stats["p999"],
+                "max_us": stats["max"],
+                "requests_per_sec": rate,
+                "histogram": latencies.to_dict(),
+            })
+    
+    # N concurrently stopped tracee threads, lock-step vs tagged pipelining
+    results["stopped_tracees"] = []
+    for tracees in (1, 4, 16, 64, 256):
+        for pipelined in (False, True):
+            mode = "pipelined" if pipelined else "lock-step"
+            print(f"\n[*] Simulating {tracees} stopped tracees, {mode} (10,000 verdicts)...")
+            latencies, rate = benchmark_stopped_tracees(tracees, 10000, pipelined)
+            mean = print_stats(f"{tracees} Stopped Tracees ({mode})", latencies)
+            print(f"  Rate:    {rate:,.0f} verdicts/sec")
+            stats = latencies.summary()
+            results["stopped_tracees"].append({
+                "tracees": tracees,
+                "mode": mode,
+                "mean_us": mean,
+                "p99_us": stats["p99"],
+                "max_us": stats["max"],
+                "verdicts_per_sec": rate,
+                "histogram": latencies.to_dict(),
+            })
+    
+    # K interceptors on one asyncio brain, per-channel tail latency
+    results["multi_channel"] = []
+    for channels, stalled in ((1, False), (4, False), (16, False), (64, False), (16, True)):
+        label = f"{channels} channels" + (" + 1 stalled" if stalled else "")
+        print(f"\n[*] Serving {label} from one brain (2,000 requests each)...")
+        per_channel, rate = benchmark_multi_channel(channels, 2000, "mixed", stalled)
+        overall = LatencyHistogram()
+        for hist in per_channel:
+            overall.merge(hist)
+        mean = print_stats(f"{label} (all channels)", overall)
+        p99s = [hist.summary()["p99"] for hist in per_channel]
+        print(f"  Rate:    {rate:,.0f} requests/sec")
+        print(f"  Per-channel P99: best {min(p99s):.2f} μs, worst {max(p99s):.2f} μs")
+        stats = overall.summary()
+        results["multi_channel"].append({
+            "channels": channels,
+            "stalled": stalled,
+            "mean_us": mean,
+            "p99_us": stats["p99"],
+            "max_us": stats["max"],
+            "channel_p99_us": p99s,
+            "requests_per_sec": rate,
+        })
     
     print("\n" + "="*60)
     print("SUMMARY FOR DOSSIER:")
-    print(f"  JSON Overhead: {json_mean:.2f} μs")
+    print(f"  {'Format':<8} │ {'Paths':<11} │ {'Encode+Decode':>13} │ {'P99':>10} │ {'Size':>11}")
+    print(f"  {'─'*8}─┼─{'─'*11}─┼─{'─'*13}─┼─{'─'*10}─┼─{'─'*11}")
+    # text = SYSCALL:<verb>:<argument> only; text-all adds pid, fd and ret
+    for r in wire_results:
+        print(f"  {r['format']:<8} │ {r['messages']:<11} │ {r['mean_us']:>10.2f} μs │ "
+              f"{r['p99_us']:>7.2f} μs │ {r['bytes_per_message']:>5.0f} bytes")
+    print()
+    print(f"  {'Transport':<12} │ {'Depth':>5} │ {'Mean RTT':>11} │ {'P99 RTT':>11} │ {'Requests/sec':>12}")
+    print(f"  {'─'*12}─┼─{'─'*5}─┼─{'─'*11}─┼─{'─'*11}─┼─{'─'*12}")
+    for r in results["roundtrip"]:
+        print(f"  {TRANSPORTS[r['transport']].name:<12} │ {r['depth']:>5} │ {r['mean_us']:>8.2f} μs │ "
+              f"{r['p99_us']:>8.2f} μs │ {r['requests_per_sec']:>12,.0f}")
     print()
-    print("Note: For full IPC round-trip, add instrumentation to brain.py main loop")
+    print(f"  {'Tracees':>7} │ {'Mode':<9} │ {'Mean latency':>12} │ {'P99':>11} │ {'Verdicts/sec':>12}")
+    print(f"  {'─'*7}─┼─{'─'*9}─┼─{'─'*12}─┼─{'─'*11}─┼─{'─'*12}")
+    for r in results["stopped_tracees"]:
+        print(f"  {r['tracees']:>7} │ {r['mode']:<9} │ {r['mean_us']:>9.2f} μs │ "
+              f"{r['p99_us']:>8.2f} μs │ {r['verdicts_per_sec']:>12,.0f}")
+    print()
+    print(f"  {'Channels':<17} │ {'Mean':>11} │ {'P99 (all)':>11} │ {'Worst ch. P99':>13} │ {'Requests/sec':>12}")
+    print(f"  {'─'*17}─┼─{'─'*11}─┼─{'─'*11}─┼─{'─'*13}─┼─{'─'*12}")
+    for r in results["multi_channel"]:
+        label = f"{r['channels']}" + (" + 1 stalled" if r["stalled"] else "")
+        print(f"  {label:<17} │ {r['mean_us']:>8.2f} μs │ {r['p99_us']:>8.2f} μs │ "
+              f"{max(r['channel_p99_us']):>10.2f} μs │ {r['requests_per_sec']:>12,.0f}")
+    print()
+    print("Note: the stand-in brain answers instantly; the gap to the ~40 μs")
+    print("      closed-loop RTT is the C engine and ptrace side of the bridge")
+    if DEFAULT_SPIN == 0:
+        print("Note: single CPU - the ring cannot spin, so every hand-off still")
+        print("      sleeps on the doorbell and Python slot copies dominate")
     print("="*60)
+    
+    with open("ipc_benchmark_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n[+] Results saved to ipc_benchmark_results.json")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Latency Histogram - Fixed-memory recorder shared by all benchmark scripts
+==========================================================================
+A log-bucketed (HDR-style) histogram for nanosecond latencies.
+
+Appending every perf_counter_ns() delta to a list costs one boxed int per
+sample, and the list growth plus GC pauses leak into the very latencies being
+measured. This recorder keeps a fixed array of counters instead: memory is
+the same after 1K samples or 1B samples.
+
+Bucketing:
+    Values below 2^SUB_BUCKET_BITS are recorded exactly. Above that, each
+    power-of-two range is split into 2^(SUB_BUCKET_BITS - 1) linear
+    sub-buckets, so the relative error of any reported value is bounded by
+    1 / 2^(SUB_BUCKET_BITS - 1) (~0.8% with the default of 8 bits).
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    hist = LatencyHistogram()
+    hist.record(end - start)
+    hist.percentile(99.9)        # ns
+    hist.summary()               # dict in μs for the dossier tables
+    json.dumps(hist.to_dict())   # sparse, mergeable with merge()
+"""
+
+from array import array
+
+# 1 hour in ns - anything slower is clamped into the top bucket
+DEFAULT_MAX_VALUE_NS = 3_600_000_000_000
+DEFAULT_SUB_BUCKET_BITS = 8
+
+SUMMARY_PERCENTILES = (("p50", 50.0), ("p95", 95.0), ("p99", 99.0), ("p999", 99.9))
+
+
+class LatencyHistogram:
+    """Log-bucketed latency recorder with constant memory."""
+
+    def __init__(self, max_value_ns=DEFAULT_MAX_VALUE_NS, sub_bucket_bits=DEFAULT_SUB_BUCKET_BITS):
+        if sub_bucket_bits < 2:
+            raise ValueError("sub_bucket_bits must be >= 2")
+        self.max_value_ns = int(max_value_ns)
+        self.sub_bucket_bits = sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self._max_index = self._index_of(self.max_value_ns)
+        self.counts = array("Q", bytes(8 * (self._max_index + 1)))
+        self.reset()
+
+    def reset(self):
+        """Zero all counters without reallocating."""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total_ns = 0
+        self.total_sq_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+
+    # ───────────────────────────────────────────────────────────────
+    #  Bucket layout
+    # ───────────────────────────────────────────────────────────────
+
+    def _index_of(self, value):
+        shift = value.bit_length() - self.sub_bucket_bits
+        if shift <= 0:
+            return value
+        return shift * self._half + (value >> shift)
+
+    def _bucket_range(self, index):
+        """Return the inclusive (low, high) value range covered by a bucket."""
+        if index < (self._half << 1):
+            return index, index
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        low = mantissa << shift
+        return low, low + (1 << shift) - 1
+
+    # ───────────────────────────────────────────────────────────────
+    #  Recording
+    # ───────────────────────────────────────────────────────────────
+
+    def record(self, value_ns):
+        """Record a single latency sample (ns). Negative values count as 0."""
+        value = int(value_ns)
+        if value < 0:
+            value = 0
+        index = self._index_of(value)
+        if index > self._max_index:
+            index = self._max_index
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ns += value
+        self.total_sq_ns += value * value
+        if self.min_ns is None or value < self.min_ns:
+            self.min_ns = value
+        if self.max_ns is None or value > self.max_ns:
+            self.max_ns = value
+
+    def record_many(self, values_ns):
+        """Record an iterable of latency samples (ns)."""
+        for value in values_ns:
+            self.record(value)
+
+    def merge(self, other):
+        """Add another histogram's samples into this one (layouts must match)."""
+        if (other.sub_bucket_bits, other.max_value_ns) != (self.sub_bucket_bits, self.max_value_ns):
+            raise ValueError("cannot merge histograms with different bucket layouts")
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.total_sq_ns += other.total_sq_ns
+        if other.min_ns is not None:
+            self.min_ns = other.min_ns if self.min_ns is None else min(self.min_ns, other.min_ns)
+        if other.max_ns is not None:
+            self.max_ns = other.max_ns if self.max_ns is None else max(self.max_ns, other.max_ns)
+        return self
+
+    # ───────────────────────────────────────────────────────────────
+    #  Queries (all values in ns)
+    # ───────────────────────────────────────────────────────────────
+
+    def mean(self):
+        return self.total_ns / self.count if self.count else 0.0
+
+    def stdev(self):
+        """Sample standard deviation (matches statistics.stdev)."""
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq_ns - self.total_ns * self.total_ns / self.count) / (self.count - 1)
+        return max(variance, 0.0) ** 0.5
+
+    def percentile(self, pct):
+        """
+        Value at the given percentile (0-100).
+
+        Reports the highest value equivalent to the matching bucket, clamped
+        to the observed min/max so P100 is always the exact maximum.
+        """
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * pct // 100))  # ceil without floats drifting
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if not n:
+                continue
+            seen += n
+            if seen >= target:
+                _, high = self._bucket_range(index)
+                return max(self.min_ns, min(high, self.max_ns))
+        return self.max_ns
+
+    def summary(self, scale=1000):
+        """
+        Standard stats dict used by the benchmark tables.
+
+        scale divides ns into the reporting unit (1000 → μs, 1 → ns,
+        1_000_000 → ms). Keys are unit-less; callers add their own suffix.
+        """
+        stats = {
+            "samples": self.count,
+            "mean": self.mean() / scale,
+            "stdev": self.stdev() / scale,
+            "min": (self.min_ns or 0) / scale,
+            "max": (self.max_ns or 0) / scale,
+        }
+        for key, pct in SUMMARY_PERCENTILES:
+            stats[key] = self.percentile(pct) / scale
+        return stats
+
+    # ───────────────────────────────────────────────────────────────
+    #  Serialization
+    # ───────────────────────────────────────────────────────────────
+
+    def to_dict(self):
+        """Sparse JSON-serializable form (only non-empty buckets)."""
+        return {
+            "max_value_ns": self.max_value_ns,
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "total_sq_ns": self.total_sq_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "buckets": [[index, n] for index, n in enumerate(self.counts) if n],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data["max_value_ns"], data["sub_bucket_bits"])
+        for index, n in data["buckets"]:
+            hist.counts[index] = n
+        hist.count = data["count"]
+        hist.total_ns = data["total_ns"]
+        hist.total_sq_ns = data["total_sq_ns"]
+        hist.min_ns = data["min_ns"]
+        hist.max_ns = data["max_ns"]
+        return hist
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"<LatencyHistogram samples={self.count} mean={self.mean():.0f}ns max={self.max_ns}ns>"
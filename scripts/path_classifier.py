@@ -0,0 +1,673 @@
+#!/usr/bin/env python3
+"""
+Path Classifier - Compiled engines for the SemanticMapper taxonomy
+===================================================================
+Drop-in classification engines for the M3.0 regex taxonomy
+(src/analysis/semantic.py). Each engine exposes the same two calls:
+
+    classify(path)          -> concept
+    classify_batch(paths)   -> [concept, ...]
+
+PathClassifier adds classify_id(path), which returns the interned concept
+id from event_types.py for the int-based decision path.
+
+Engines:
+    regex      Prioritized regex list, tested one rule at a time.
+               Reference semantics - identical to SemanticMapper.
+    combined   The whole taxonomy compiled into ONE alternation. Python's
+               regex alternation is ordered, so the first rule that matches
+               still wins, but a path is scanned once per call instead of
+               once per rule.
+    trie       The taxonomy compiled into a path-component trie with
+               wildcard segments. Cost grows with path depth, not with the
+               number of rules. Rules that are not simple anchored path
+               patterns stay as regexes and are consulted in priority order.
+
+Cold start:
+    Only the modules a first verdict needs are imported up front; re is
+    imported on the first regex compile, threading and collections by the
+    reload and cache paths. A trie classifier can be restored from a marshal
+    snapshot on disk (PathClassifier(..., engine="trie", cache=path)) instead
+    of being rebuilt; a snapshot of a different taxonomy, or one that fails
+    its checksum or does not load, is ignored and rewritten.
+
+CachedClassifier puts a bounded LRU memo in front of any of these (or of
+SemanticMapper itself) for workloads that reopen the same few paths.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    classifier = PathClassifier(engine="combined")
+    concepts = classifier.classify_batch(listing)   # readdir+openat burst
+
+    cached = CachedClassifier(classifier, maxsize=4096)
+    cached.classify("/etc/passwd")
+    cached.reload(new_taxonomy)                     # rebuilds + invalidates
+    classifier.reload_async(new_taxonomy)           # background build, atomic swap
+    classifier.reload_async(new_taxonomy, freeze=True)  # + no full-GC pauses
+"""
+
+import gc
+import marshal
+import os
+import time
+from _thread import allocate_lock
+
+from event_types import concept_id
+
+DEFAULT_CONCEPT = "UNKNOWN"
+CACHE_FORMAT = 2    # bump when the trie snapshot layout changes
+
+# Prioritized taxonomy from the M3.0 Cognitive Engine log - first match wins
+M3_TAXONOMY = [
+    ("CRITICAL_AUTH", r"^/etc/(shadow|passwd|sudoers)"),
+    ("SSH_KEYS", r"^/home/.*/\.ssh/.*"),
+    ("SYSTEM_BIN", r"^/usr/bin/.*"),
+    ("TEMP_FILE", r"^/tmp/.*"),
+]
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ENGINES
+# ═══════════════════════════════════════════════════════════════
+
+def _compile(pattern):
+    """re.compile, importing re on first use - a cached trie never needs it."""
+    import re
+    return re.compile(pattern)
+
+
+def _cache_digest(payload):
+    """Checksum stored next to a trie snapshot; hashlib is only needed by the cache."""
+    import hashlib
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class RegexEngine:
+    """Prioritized regex list - one re.match per rule until a hit."""
+
+    name = "regex"
+    hooks = ("compile",)
+
+    def __init__(self, taxonomy, default=DEFAULT_CONCEPT, compile=_compile):
+        self.default = default
+        self.rules = [(concept, compile(pattern)) for concept, pattern in taxonomy]
+
+    def classify(self, path):
+        for concept, regex in self.rules:
+            if regex.match(path):
+                return concept
+        return self.default
+
+    def classify_batch(self, paths):
+        classify = self.classify
+        return [classify(path) for path in paths]
+
+
+class CombinedRegexEngine:
+    """
+    Whole taxonomy as a single ordered alternation.
+
+    Every rule is wrapped in its own capturing group. Inner groups of a rule
+    always close before its wrapper, so match.lastindex identifies the rule
+    that matched; a precomputed table maps that index back to the concept.
+    """
+
+    name = "combined"
+    hooks = ("compile",)
+
+    def __init__(self, taxonomy, default=DEFAULT_CONCEPT, compile=_compile):
+        self.default = default
+        alternatives = []
+        concepts = {}
+        group = 1
+        for concept, pattern in taxonomy:
+            alternatives.append(f"({pattern})")
+            concepts[group] = concept
+            group += 1 + compile(pattern).groups
+        self.pattern = _compile("|".join(alternatives)) if alternatives else None
+        self.concepts = concepts
+
+    def classify(self, path):
+        if self.pattern is None:
+            return self.default
+        m = self.pattern.match(path)
+        return self.concepts[m.lastindex] if m else self.default
+
+    def classify_batch(self, paths):
+        if self.pattern is None:
+            return [self.default] * len(paths)
+        match = self.pattern.match
+        concepts = self.concepts
+        default = self.default
+        return [concepts[m.lastindex] if (m := match(path)) else default for path in paths]
+
+
+# ───────────────────────────────────────────────────────────────
+#  Path-component trie
+# ───────────────────────────────────────────────────────────────
+
+_NO_RULE = float("inf")
+_REGEX_META = set(".^$*+?{}[]|()\\")
+
+# Segment tokens produced by _parse_rule()
+_GLOB = "glob"      # .*      - one or more whole segments
+_STAR = "star"      # [^/]*   - exactly one segment
+_WORDS = "words"    # literal / (a|b|c) alternation of literals
+
+# '[^/]*' contains a slash, so it is swapped for this (invalid-regex) marker
+# before the pattern is split into segments
+_STAR_MARKER = "(*)"
+
+
+def _parse_literal(text):
+    """Unescape a regex literal, or return None if it has metacharacters."""
+    out = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\":
+            if i + 1 >= len(text) or text[i + 1].isalnum():
+                return None
+            out.append(text[i + 1])
+            i += 2
+            continue
+        if ch in _REGEX_META:
+            return None
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _parse_segment(text):
+    if text == ".*":
+        return (_GLOB, None)
+    if text == _STAR_MARKER:
+        return (_STAR, None)
+    if text.startswith("(") and text.endswith(")"):
+        inner = text[3:-1] if text.startswith("(?:") else text[1:-1]
+        words = [_parse_literal(alt) for alt in inner.split("|")]
+        if any(w is None for w in words):
+            return None
+        return (_WORDS, words)
+    word = _parse_literal(text)
+    return None if word is None else (_WORDS, [word])
+
+
+def _parse_rule(pattern):
+    """
+    Split an anchored path regex into segment tokens.
+
+    Returns (tokens, anchored_end) or None when the pattern is not a plain
+    '^/seg/seg/...' path pattern the trie can represent exactly.
+    """
+    if not pattern.startswith("^/"):
+        return None
+    body = pattern[1:]
+    anchored_end = body.endswith("$") and not body.endswith("\\$")
+    if anchored_end:
+        body = body[:-1]
+    tokens = []
+    for text in body.replace("[^/]*", _STAR_MARKER).split("/"):
+        token = _parse_segment(text)
+        if token is None:
+            return None
+        tokens.append(token)
+    return tokens, anchored_end
+
+
+class _TrieNode:
+    __slots__ = ("exact", "prefixes", "prefix_lengths", "star", "glob", "loop",
+                 "end_rule", "open_rule", "min_rule")
+
+    def __init__(self, loop=False):
+        self.exact = {}
+        self.prefixes = {}
+        self.prefix_lengths = ()
+        self.star = None
+        self.glob = None
+        self.loop = loop
+        self.end_rule = _NO_RULE
+        self.open_rule = _NO_RULE
+        self.min_rule = _NO_RULE
+
+
+class TrieEngine:
+    """
+    Path-component trie with wildcard segments.
+
+    A path is split on '/' once and walked segment by segment. Each trie
+    node can have exact children, a one-segment wildcard ([^/]*), a glob
+    (.*, one or more segments) and open-ended prefix matches for the final,
+    unanchored segment of a rule (^/etc/(shadow|passwd) matches
+    /etc/shadow.bak). Every rule keeps its priority index; the lowest index
+    among all accepting states wins, exactly like the prioritized regex list.
+    """
+
+    name = "trie"
+    hooks = ("compile", "parse")
+
+    def __init__(self, taxonomy, default=DEFAULT_CONCEPT, compile=_compile, parse=None):
+        self.default = default
+        self.concepts = []
+        self.residual = []  # (priority, compiled regex) for untranslatable rules
+        self.root = _TrieNode()
+        self._fallback = None
+        self._compile = compile
+        self._taxonomy = list(taxonomy)
+        for priority, (concept, pattern) in enumerate(self._taxonomy):
+            self.concepts.append(concept)
+            parsed = (parse or _parse_rule)(pattern)
+            if parsed is None:
+                self.residual.append((priority, compile(pattern)))
+            else:
+                self._insert(parsed[0], parsed[1], priority)
+        self._finalize(self.root)
+
+    def _insert(self, tokens, anchored_end, priority):
+        nodes = [self.root]
+        last = len(tokens) - 1
+        for i, (kind, words) in enumerate(tokens):
+            final = i == last
+            following = []
+            for node in nodes:
+                node.min_rule = min(node.min_rule, priority)
+                if kind == _GLOB:
+                    if final and not anchored_end:
+                        # trailing '/.*' - any one segment, then anything
+                        node.star = node.star or _TrieNode()
+                        node.star.open_rule = min(node.star.open_rule, priority)
+                        continue
+                    node.glob = node.glob or _TrieNode(loop=True)
+                    following.append(node.glob)
+                elif kind == _STAR:
+                    node.star = node.star or _TrieNode()
+                    if final and not anchored_end:
+                        node.star.open_rule = min(node.star.open_rule, priority)
+                        continue
+                    following.append(node.star)
+                elif final and not anchored_end:
+                    for word in words:
+                        node.prefixes[word] = min(node.prefixes.get(word, _NO_RULE), priority)
+                else:
+                    for word in words:
+                        following.append(node.exact.setdefault(word, _TrieNode()))
+            nodes = following
+        for node in nodes:
+            node.end_rule = min(node.end_rule, priority)
+            node.min_rule = min(node.min_rule, priority)
+
+    def _finalize(self, node):
+        """Propagate subtree minimum priorities used for pruning."""
+        best = min(node.min_rule, node.end_rule, node.open_rule, *node.prefixes.values(), _NO_RULE)
+        node.prefix_lengths = tuple(sorted({len(word) for word in node.prefixes}))
+        for child in (*node.exact.values(), node.star, node.glob):
+            if child is not None:
+                best = min(best, self._finalize(child))
+        node.min_rule = best
+        return best
+
+    def _match(self, path):
+        best = _NO_RULE
+        states = [self.root]
+        for seg in path.split("/"):
+            following = []
+            for node in states:
+                if node.min_rule >= best:
+                    continue
+                if node.open_rule < best:
+                    best = node.open_rule
+                if node.prefix_lengths:
+                    prefixes = node.prefixes
+                    for length in node.prefix_lengths:
+                        rule = prefixes.get(seg[:length], _NO_RULE)
+                        if rule < best:
+                            best = rule
+                child = node.exact.get(seg)
+                if child is not None and child not in following:
+                    following.append(child)
+                if node.star is not None and node.star not in following:
+                    following.append(node.star)
+                if node.glob is not None and node.glob not in following:
+                    following.append(node.glob)
+                if node.loop and node not in following:
+                    following.append(node)
+            states = following
+            if not states:
+                break
+        for node in states:
+            best = min(best, node.end_rule, node.open_rule)
+        return best
+
+    def classify(self, path):
+        if "\n" in path:
+            # '.' never matches a newline; defer to exact regex semantics
+            if self._fallback is None:
+                self._fallback = RegexEngine(self._taxonomy, self.default, self._compile)
+            return self._fallback.classify(path)
+        best = self._match(path)
+        for priority, regex in self.residual:
+            if priority >= best:
+                break
+            if regex.match(path):
+                best = priority
+                break
+        return self.concepts[best] if best != _NO_RULE else self.default
+
+    def classify_batch(self, paths):
+        classify = self.classify
+        return [classify(path) for path in paths]
+
+    def snapshot(self):
+        """The built trie as plain tuples / dicts / strings, for marshal."""
+        def dump(node):
+            if node is None:
+                return None
+            return ({word: dump(child) for word, child in node.exact.items()}, node.prefixes,
+                    node.prefix_lengths, dump(node.star), dump(node.glob), node.loop,
+                    node.end_rule, node.open_rule, node.min_rule)
+        residual = [(priority, regex.pattern) for priority, regex in self.residual]
+        return self.default, self.concepts, residual, self._taxonomy, dump(self.root)
+
+    @classmethod
+    def restore(cls, state, compile=_compile):
+        """Rebuild an engine from snapshot() without parsing a single rule."""
+        new_node = _TrieNode.__new__
+
+        def load(fields):
+            node = new_node(_TrieNode)
+            (exact, node.prefixes, node.prefix_lengths, star, glob, node.loop,
+             node.end_rule, node.open_rule, node.min_rule) = fields
+            node.exact = {word: load(child) for word, child in exact.items()} if exact else {}
+            node.star = load(star) if star else None
+            node.glob = load(glob) if glob else None
+            return node
+
+        default, concepts, residual, taxonomy, root = state
+        engine = cls.__new__(cls)
+        engine.default = default
+        engine.concepts = list(concepts)
+        engine.residual = [(priority, compile(pattern)) for priority, pattern in residual]
+        engine.root = load(root)
+        engine._fallback = None
+        engine._compile = compile
+        engine._taxonomy = list(taxonomy)
+        return engine
+
+
+ENGINES = {
+    RegexEngine.name: RegexEngine,
+    CombinedRegexEngine.name: CombinedRegexEngine,
+    TrieEngine.name: TrieEngine,
+}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  SEMANTICMAPPER-COMPATIBLE FRONT END
+# ═══════════════════════════════════════════════════════════════
+
+class PathClassifier:
+    """
+    SemanticMapper-compatible classifier with a pluggable engine.
+
+    Hot reload: build() compiles a taxonomy without touching the live
+    engine, reusing the compiled regex of every rule whose pattern is
+    unchanged; swap() then installs the result with plain attribute
+    assignments, which are atomic, so a concurrent classify() sees either
+    the old or the new taxonomy and never waits. reload_async() runs the
+    build on a background thread, so verdicts keep flowing while a large
+    taxonomy recompiles (under the GIL the decision thread is only held up
+    for a switch interval at a time).
+    """
+
+    def __init__(self, taxonomy=None, engine="combined", default=DEFAULT_CONCEPT, cache=None):
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r} (choose from {', '.join(ENGINES)})")
+        if cache is not None and engine != "trie":
+            raise ValueError("only the trie engine can be cached (compiled regexes do not serialize)")
+        self.engine_name = engine
+        self.default = default
+        self.reloads = 0
+        self.last_reload = None
+        self._rules = {}          # (kind, pattern) -> compiled rule, carried across reloads
+        self._reload_lock = allocate_lock()
+        taxonomy = M3_TAXONOMY if taxonomy is None else taxonomy
+        if cache is None:
+            self.reload(taxonomy)
+        else:
+            self._load_cached(list(taxonomy), cache)
+
+    def _load_cached(self, taxonomy, path):
+        """Restore the trie from the snapshot at path, or build it and write one."""
+        start = time.perf_counter()
+        # ~10 objects per trie node: collections triggered mid-load would
+        # only walk the snapshot being built
+        enabled = gc.isenabled()
+        gc.disable()
+        engine = None
+        try:
+            try:
+                with open(path, "rb") as f:
+                    # loads(read()): marshal.load() on a file reads object by object
+                    fmt, digest, payload = marshal.loads(f.read())
+                if fmt == CACHE_FORMAT and digest == _cache_digest(payload):
+                    cached_taxonomy, default, state = marshal.loads(payload)
+                    if default == self.default and cached_taxonomy == taxonomy:
+                        engine = TrieEngine.restore(state)
+            except Exception:
+                engine = None     # missing, truncated or corrupt: rebuild and rewrite
+        finally:
+            if enabled:
+                gc.enable()
+        if engine is not None:
+            concept_ids = {concept: concept_id(concept)
+                           for concept in [self.default] + [c for c, _ in taxonomy]}
+            stats = {"rules": len(taxonomy), "reused": 0, "compiled": 0, "cache": "hit",
+                     "build_sec": time.perf_counter() - start}
+            self.swap((taxonomy, engine, concept_ids, {}, stats))
+            return
+        stats = self.reload(taxonomy)
+        stats["cache"] = "miss"
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                payload = marshal.dumps((taxonomy, self.default, self.engine.snapshot()))
+                f.write(marshal.dumps((CACHE_FORMAT, _cache_digest(payload), payload)))
+            os.replace(tmp, path)
+        except OSError:
+            stats["cache"] = "unwritable"    # the classifier works, the next start rebuilds
+
+    def build(self, taxonomy):
+        """Compile a taxonomy into a ready-to-swap engine; the live one is untouched."""
+        taxonomy = list(taxonomy)
+        previous = self._rules
+        rules = {}
+        stats = {"rules": len(taxonomy), "reused": 0, "compiled": 0}
+
+        def reusing(kind, compile_fn):
+            # per-rule compile (regex) / parse (trie) results, keyed by pattern
+            def compile_rule(pattern):
+                key = (kind, pattern)
+                if key in rules:
+                    return rules[key]
+                if key in previous:
+                    stats["reused"] += 1
+                    result = previous[key]
+                else:
+                    stats["compiled"] += 1
+                    result = compile_fn(pattern)
+                rules[key] = result
+                return result
+            return compile_rule
+
+        start = time.perf_counter()
+        engine_cls = ENGINES[self.engine_name]
+        hooks = {"compile": reusing("regex", _compile), "parse": reusing("trie", _parse_rule)}
+        engine = engine_cls(taxonomy, self.default, **{name: hooks[name] for name in engine_cls.hooks})
+        concept_ids = {concept: concept_id(concept)
+                       for concept in [self.default] + [c for c, _ in taxonomy]}
+        stats["build_sec"] = time.perf_counter() - start
+        return taxonomy, engine, concept_ids, rules, stats
+
+    def swap(self, built):
+        """
+        Install a build() result.
+
+        concept_ids only grows, and is replaced before the engine, so a
+        classify_id() racing the swap finds an id for whatever either
+        engine returns.
+        """
+        taxonomy, engine, concept_ids, rules, stats = built
+        self.concept_ids = {**getattr(self, "concept_ids", {}), **concept_ids}
+        self.engine = engine
+        self.taxonomy = taxonomy
+        self._rules = rules
+        self.reloads += 1
+        self.last_reload = stats
+        return stats
+
+    def reload(self, taxonomy):
+        """Recompile the engine for a new taxonomy, in the calling thread."""
+        with self._reload_lock:
+            return self.swap(self.build(taxonomy))
+
+    def reload_async(self, taxonomy, on_swap=None, freeze=False):
+        """
+        Rebuild on a background thread, then swap atomically.
+
+        Reloads are serialized; on_swap(stats) runs right after the swap
+        (e.g. to invalidate a cache in front of this classifier). Returns
+        the started thread.
+
+        The build itself yields the GIL every switch interval, but the
+        cyclic GC does not: the allocation burst of a large build triggers
+        full collections that walk both tries while holding it. freeze=True
+        pauses automatic collection during the build and gc.freeze()s the
+        heap after the swap, so later full collections skip the live engine
+        (the trie is acyclic, old engines are still freed by refcount; any
+        cyclic garbage alive at that moment is kept until gc.unfreeze(),
+        which is the caller's to run once it stops reloading).
+        """
+        def run():
+            with self._reload_lock:
+                paused = freeze and gc.isenabled()
+                if paused:
+                    gc.disable()
+                try:
+                    stats = self.swap(self.build(taxonomy))
+                    if freeze:
+                        gc.freeze()
+                finally:
+                    if paused:
+                        gc.enable()
+            if on_swap is not None:
+                on_swap(stats)
+
+        import threading
+        thread = threading.Thread(target=run, name="taxonomy-reload", daemon=True)
+        thread.start()
+        return thread
+
+    def classify(self, path):
+        return self.engine.classify(path)
+
+    def classify_id(self, path):
+        """Interned concept id (event_types.CONCEPT_*) instead of the tag string."""
+        return self.concept_ids[self.engine.classify(path)]
+
+    def classify_batch(self, paths):
+        """Classify a whole array of paths in one call."""
+        return self.engine.classify_batch(paths)
+
+
+class CachedClassifier:
+    """
+    Bounded LRU memo in front of a mapper's classify().
+
+    Only paths up to max_path_len are cached, so a flood of huge unique
+    paths cannot pin more than maxsize * max_path_len bytes of keys; longer
+    paths are classified directly and counted as bypasses. Every bypass is
+    also a miss.
+    """
+
+    def __init__(self, mapper, maxsize=4096, max_path_len=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.mapper = mapper
+        self.maxsize = maxsize
+        self.max_path_len = max_path_len
+        from collections import OrderedDict
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypasses = 0
+        self.invalidations = 0
+
+    def classify(self, path):
+        entries = self._entries
+        concept = entries.get(path)
+        if concept is not None:
+            entries.move_to_end(path)
+            self.hits += 1
+            return concept
+        self.misses += 1
+        # read before classifying: a reload swapping in meanwhile bumps it,
+        # and a concept from the old engine must not outlive the invalidate
+        generation = getattr(self.mapper, "reloads", 0)
+        concept = self.mapper.classify(path)
+        if len(path) > self.max_path_len:
+            self.bypasses += 1
+            return concept
+        if getattr(self.mapper, "reloads", 0) != generation:
+            return concept
+        entries[path] = concept
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return concept
+
+    def classify_batch(self, paths):
+        classify = self.classify
+        return [classify(path) for path in paths]
+
+    def invalidate(self):
+        """Drop every cached verdict (call after any taxonomy change)."""
+        self._entries.clear()
+        self.invalidations += 1
+
+    def reload(self, taxonomy):
+        """Hot-reload the wrapped mapper's taxonomy and invalidate the cache."""
+        self.mapper.reload(taxonomy)
+        self.invalidate()
+
+    def reload_async(self, taxonomy, freeze=False):
+        """Background rebuild of the wrapped PathClassifier; invalidated on swap."""
+        return self.mapper.reload_async(taxonomy, on_swap=lambda stats: self.invalidate(), freeze=freeze)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bypasses": self.bypasses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def classify_batch(mapper, paths):
+    """
+    Batch-classify with any mapper.
+
+    Uses mapper.classify_batch() when the mapper provides it, otherwise
+    falls back to a tight loop over the bound classify() method.
+    """
+    batch = getattr(mapper, "classify_batch", None)
+    if batch is not None:
+        return batch(paths)
+    classify = mapper.classify
+    return [classify(path) for path in paths]
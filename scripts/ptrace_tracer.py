@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Ptrace Tracer - Minimal pure-Python stand-in for the Sentinel interceptor
+=========================================================================
+A ctypes ptrace(2) tracer that launches a command as its own tracee and
+stops it at every syscall entry and exit, the way bin/sentinel does. It
+lets the benchmarks measure traced overhead unattended when the real
+binary is absent, and it times its own work per stop so the cost of the
+ptrace round trip can be told apart from the cost of the brain.
+
+    tracee ──syscall──▶ kernel stop ──waitpid──▶ tracer
+                                                  │ regs, path (entry only)
+                                                  │ decide(pid, verb, path)
+    tracee ◀─────────── PTRACE_SYSCALL ◀──────────┘
+
+Per tracer run:
+    stops        syscall-entry + syscall-exit stops handled
+    syscalls     syscall entries
+    decisions    entries of a syscall the brain knows (event_types verbs)
+    tracer_sec   time between waitpid() returning and the tracee resumed
+    decide_sec   part of tracer_sec spent inside decide()
+    would_block  decisions that returned True (the stand-in never blocks)
+
+Children are followed across fork / vfork / clone. Registers are read with
+PTRACE_GETREGSET, so x86_64 and aarch64 are both supported. Path arguments
+are read through /proc/<pid>/mem.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/)
+    (together with event_types.py; brain_decider() also needs the brain).
+
+    tracer = PtraceTracer(brain_decider(SemanticMapper(), ExfiltrationDetector()))
+    returncode = tracer.run(["python3", "workload.py"])
+    tracer.stats()
+"""
+
+import ctypes
+import os
+import platform
+import signal
+import time
+
+PTRACE_TRACEME = 0
+PTRACE_SYSCALL = 24
+PTRACE_SETOPTIONS = 0x4200
+PTRACE_GETREGSET = 0x4204
+NT_PRSTATUS = 1
+
+PTRACE_O_TRACESYSGOOD = 0x1
+PTRACE_O_TRACEFORK = 0x2
+PTRACE_O_TRACEVFORK = 0x4
+PTRACE_O_TRACECLONE = 0x8
+PTRACE_O_TRACEEXEC = 0x10
+PTRACE_O_EXITKILL = 0x100000
+PTRACE_EVENT_EXEC = 4
+
+TRACE_OPTIONS = (PTRACE_O_TRACESYSGOOD | PTRACE_O_TRACEFORK | PTRACE_O_TRACEVFORK
+                 | PTRACE_O_TRACECLONE | PTRACE_O_TRACEEXEC | PTRACE_O_EXITKILL)
+SYSCALL_STOP = signal.SIGTRAP | 0x80
+
+PATH_MAX = 4096
+WAIT_ALL = 0x40000000                          # __WALL: threads and clone children too
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ARCHITECTURE TABLES
+# ═══════════════════════════════════════════════════════════════
+
+# register index of (syscall number, arg0 .. arg5) in the NT_PRSTATUS set
+_X86_64_REGS = (15, 14, 13, 12, 7, 9, 8)      # orig_rax, rdi, rsi, rdx, r10, r8, r9
+_AARCH64_REGS = (8, 0, 1, 2, 3, 4, 5)         # x8, x0 .. x5
+
+# syscall number -> (event_types verb, index of the path argument or None)
+_X86_64_SYSCALLS = {
+    0: ("read", None), 1: ("write", None), 2: ("open", 0), 3: ("close", None),
+    9: ("mmap", None), 10: ("mprotect", None), 33: ("dup2", None),
+    41: ("socket", None), 42: ("connect", None), 44: ("sendto", None),
+    45: ("recvfrom", None), 46: ("sendmsg", None), 47: ("recvmsg", None),
+    56: ("clone", None), 57: ("fork", None), 58: ("vfork", None), 59: ("execve", 0),
+    60: ("exit", None), 62: ("kill", None), 82: ("rename", 0), 87: ("unlink", 0),
+    90: ("chmod", 0), 101: ("ptrace", None), 231: ("exit_group", None),
+    257: ("openat", 1), 263: ("unlinkat", 1), 264: ("renameat", 1), 292: ("dup3", None),
+}
+_AARCH64_SYSCALLS = {
+    24: ("dup3", None), 35: ("unlinkat", 1), 38: ("renameat", 1), 56: ("openat", 1),
+    57: ("close", None), 63: ("read", None), 64: ("write", None), 93: ("exit", None),
+    94: ("exit_group", None), 117: ("ptrace", None), 129: ("kill", None),
+    198: ("socket", None), 203: ("connect", None), 206: ("sendto", None),
+    207: ("recvfrom", None), 211: ("sendmsg", None), 212: ("recvmsg", None),
+    220: ("clone", None), 221: ("execve", 0), 222: ("mmap", None), 226: ("mprotect", None),
+}
+
+ARCHES = {
+    "x86_64": (_X86_64_REGS, _X86_64_SYSCALLS, 27),
+    "aarch64": (_AARCH64_REGS, _AARCH64_SYSCALLS, 34),
+}
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("base", ctypes.c_void_p), ("len", ctypes.c_size_t)]
+
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_libc.ptrace.restype = ctypes.c_long
+_libc.ptrace.argtypes = [ctypes.c_long, ctypes.c_long, ctypes.c_void_p, ctypes.c_void_p]
+
+
+def ptrace(request, pid=0, addr=None, data=None):
+    result = _libc.ptrace(request, pid, addr, data)
+    if result == -1:
+        err = ctypes.get_errno()
+        if err:
+            raise OSError(err, f"ptrace({request:#x}, {pid}): {os.strerror(err)}")
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════
+#  TRACER
+# ═══════════════════════════════════════════════════════════════
+
+def brain_decider(mapper, detector):
+    """decide(pid, verb, path) over a SemanticMapper-style mapper and detector."""
+    classify = mapper.classify
+    process_event = detector.process_event
+
+    def decide(pid, verb, path):
+        concept = classify(path) if path.startswith("/") else ""
+        verdict = process_event(pid, verb, {}, concept)
+        return bool(verdict and verdict.alert)
+    return decide
+
+
+class PtraceTracer:
+    """Launch a command under ptrace and stop it at every syscall."""
+
+    def __init__(self, decide=None):
+        machine = platform.machine()
+        if machine not in ARCHES:
+            raise OSError(f"ptrace stand-in does not know the {machine} register layout")
+        self.regs_index, self.syscalls_table, regs_words = ARCHES[machine]
+        self.decide = decide
+        self._regs = (ctypes.c_ulonglong * regs_words)()
+        self._iov = _IoVec(ctypes.cast(self._regs, ctypes.c_void_p), ctypes.sizeof(self._regs))
+        self._mem = {}
+        self.stops = 0
+        self.syscalls = 0
+        self.decisions = 0
+        self.would_block = 0
+        self.tracees = 0
+        self.tracer_ns = 0
+        self.decide_ns = 0
+        self.wall_ns = 0
+
+    def run(self, argv, stdout=None, cpu=None):
+        """Trace argv (and its children) to completion; returns its exit status."""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                if stdout is not None:
+                    os.dup2(stdout.fileno(), 1)
+                if cpu is not None:
+                    os.sched_setaffinity(0, {cpu})
+                ptrace(PTRACE_TRACEME)
+                os.kill(os.getpid(), signal.SIGSTOP)
+                os.execvp(argv[0], argv)
+            finally:
+                os._exit(127)
+
+        start = time.perf_counter_ns()
+        _, status = os.waitpid(pid, 0)
+        if not os.WIFSTOPPED(status):
+            return os.waitstatus_to_exitcode(status)
+        ptrace(PTRACE_SETOPTIONS, pid, None, TRACE_OPTIONS)
+        ptrace(PTRACE_SYSCALL, pid, None, None)
+        returncode = self._trace(pid)
+        self.wall_ns = time.perf_counter_ns() - start
+        for fd in self._mem.values():
+            os.close(fd)
+        self._mem.clear()
+        return returncode
+
+    def _trace(self, root):
+        live = {root}
+        in_syscall = {}
+        new_children = set()
+        returncode = None
+        self.tracees = 1
+        while live:
+            pid, status = os.waitpid(-1, WAIT_ALL)
+            stopped = time.perf_counter_ns()
+            if os.WIFEXITED(status) or os.WIFSIGNALED(status):
+                live.discard(pid)
+                in_syscall.pop(pid, None)
+                self._forget_mem(pid)
+                if pid == root:
+                    returncode = os.waitstatus_to_exitcode(status)
+                continue
+            if pid not in live:
+                # a new child's first stop can arrive before its parent's event
+                live.add(pid)
+                self.tracees += 1
+                new_children.add(pid)
+
+            sig = os.WSTOPSIG(status)
+            inject = 0
+            if sig == SYSCALL_STOP:
+                self.stops += 1
+                entering = not in_syscall.get(pid, False)
+                in_syscall[pid] = entering
+                if entering:
+                    self.syscalls += 1
+                    if self.decide is not None:
+                        self._decide(pid)
+            elif sig == signal.SIGTRAP and status >> 16:
+                if status >> 16 == PTRACE_EVENT_EXEC:
+                    self._forget_mem(pid)       # the old /proc/<pid>/mem is the pre-exec image
+            elif sig == signal.SIGSTOP and pid in new_children:
+                new_children.discard(pid)       # initial stop of a followed child
+            else:
+                inject = sig                    # signal-delivery stop: pass it on
+            try:
+                ptrace(PTRACE_SYSCALL, pid, None, inject)
+            except ProcessLookupError:
+                pass                            # killed while stopped
+            self.tracer_ns += time.perf_counter_ns() - stopped
+        return returncode
+
+    def _decide(self, pid):
+        ptrace(PTRACE_GETREGSET, pid, NT_PRSTATUS, ctypes.addressof(self._iov))
+        regs = self._regs
+        entry = self.syscalls_table.get(regs[self.regs_index[0]])
+        if entry is None:
+            return
+        verb, path_arg = entry
+        path = self._read_path(pid, regs[self.regs_index[1 + path_arg]]) if path_arg is not None else ""
+        start = time.perf_counter_ns()
+        if self.decide(pid, verb, path):
+            self.would_block += 1
+        self.decide_ns += time.perf_counter_ns() - start
+        self.decisions += 1
+
+    def _forget_mem(self, pid):
+        fd = self._mem.pop(pid, None)
+        if fd is not None:
+            os.close(fd)
+
+    def _read_path(self, pid, addr):
+        """NUL-terminated string at addr in the tracee, read up to the next page boundary at a time."""
+        fd = self._mem.get(pid)
+        if fd is None:
+            try:
+                fd = self._mem[pid] = os.open(f"/proc/{pid}/mem", os.O_RDONLY)
+            except OSError:
+                return ""
+        chunks = []
+        total = 0
+        while total < PATH_MAX:
+            size = 4096 - (addr + total) % 4096
+            try:
+                chunk = os.pread(fd, size, addr + total)
+            except OSError:
+                break
+            end = chunk.find(b"\0")
+            if end >= 0:
+                chunks.append(chunk[:end])
+                break
+            chunks.append(chunk)
+            total += len(chunk)
+            if not chunk:
+                break
+        return b"".join(chunks).decode("utf-8", "surrogateescape")
+
+    def stats(self):
+        return {
+            "stops": self.stops,
+            "syscalls": self.syscalls,
+            "decisions": self.decisions,
+            "would_block": self.would_block,
+            "tracees": self.tracees,
+            "wall_sec": self.wall_ns / 1e9,
+            "tracer_sec": self.tracer_ns / 1e9,
+            "decide_sec": self.decide_ns / 1e9,
+            "tracer_us_per_stop": self.tracer_ns / self.stops / 1000 if self.stops else 0.0,
+            "decide_us_per_decision": self.decide_ns / self.decisions / 1000 if self.decisions else 0.0,
+        }
@@ -6,16 +6,27 @@ Run this script to measure actual Sentinel Brain latency.
 
 Usage:
     1. Copy to sentinel-runtime/scripts/benchmark.py
+       (together with latency_histogram.py, path_classifier.py,
+       sequence_detector.py, event_types.py, brain_startup.py and
+       brain_server.py)
     2. Run: python3 scripts/benchmark.py
 
 This will output measurements you can add to the dossier benchmarks doc.
 """
 
 import os
+import random
 import sys
 import time
 import json
-import statistics
+import tempfile
+import tracemalloc
+
+from brain_startup import forked_first_verdict, import_profile, spawn_baseline, time_to_first_verdict
+from latency_histogram import LatencyHistogram
+from path_classifier import ENGINES, M3_TAXONOMY, PathClassifier, classify_batch
+from sequence_detector import EventBatch, SequenceDetector, process_events
+from event_types import CONCEPT_NONE, verb_id
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'analysis'))
@@ -43,18 +54,152 @@ def benchmark_semantic_mapper(iterations=1000):
         "/dev/null",
     ]
     
-    latencies = []
+    latencies = LatencyHistogram()
     
     for _ in range(iterations):
         for path in test_paths:
             start = time.perf_counter_ns()
             _ = mapper.classify(path)
             end = time.perf_counter_ns()
-            latencies.append(end - start)
+            latencies.record(end - start)
     
     return latencies
 
 
+def directory_burst_paths(count=4096):
+    """Simulate a readdir+openat burst: a large listing plus the usual hot paths."""
+    paths = [
+        "/etc/passwd",
+        "/home/user/.ssh/id_rsa",
+        "/usr/bin/python3",
+        "/tmp/malware.exe",
+        "/proc/self/maps",
+        "/var/log/syslog",
+        "/dev/null",
+    ]
+    dirs = ["/home/user/project/src", "/home/user/.ssh", "/usr/bin", "/tmp/build", "/var/lib/dpkg/info"]
+    i = 0
+    while len(paths) < count:
+        paths.append(f"{dirs[i % len(dirs)]}/entry_{i}.dat")
+        i += 1
+    return paths
+
+
+def benchmark_classify_modes(iterations=50, batch_size=4096):
+    """
+    Per-path cost of single-call vs batch classification.
+    
+    Single-call modes time every classify() call; batch modes time each
+    classify_batch() call and record (batch time / batch size) per batch.
+    """
+    paths = directory_burst_paths(batch_size)
+    mapper = SemanticMapper()
+    single_modes = [
+        ("single / SemanticMapper", mapper.classify),
+        ("single / regex engine", PathClassifier(engine="regex").classify),
+        ("single / combined engine", PathClassifier(engine="combined").classify),
+    ]
+    batch_modes = [
+        ("batch / SemanticMapper", lambda batch: classify_batch(mapper, batch)),
+        ("batch / regex engine", PathClassifier(engine="regex").classify_batch),
+        ("batch / combined engine", PathClassifier(engine="combined").classify_batch),
+    ]
+    
+    modes = []
+    for name, classify in single_modes:
+        latencies = LatencyHistogram()
+        for _ in range(iterations):
+            for path in paths:
+                start = time.perf_counter_ns()
+                _ = classify(path)
+                end = time.perf_counter_ns()
+                latencies.record(end - start)
+        modes.append((name, latencies))
+    
+    for name, classify_many in batch_modes:
+        latencies = LatencyHistogram()
+        for _ in range(iterations):
+            start = time.perf_counter_ns()
+            _ = classify_many(paths)
+            end = time.perf_counter_ns()
+            latencies.record((end - start) // len(paths))
+        modes.append((name, latencies))
+    
+    return modes
+
+
+def synthetic_taxonomy(rule_count):
+    """
+    Generate rule_count synthetic rules ahead of the M3.0 taxonomy.
+    
+    The real rules sit at the lowest priority, so a prioritized regex list
+    has to try every synthetic rule before it reaches /etc/passwd.
+    """
+    rules = []
+    for i in range(rule_count):
+        kind = i % 4
+        if kind == 0:
+            rules.append((f"APP_CONFIG_{i}", rf"^/srv/app{i}/config/.*"))
+        elif kind == 1:
+            rules.append((f"USER_SECRET_{i}", rf"^/home/.*/\.app{i}/.*"))
+        elif kind == 2:
+            rules.append((f"VENDOR_{i}", rf"^/opt/vendor{i}/(bin|lib)"))
+        else:
+            rules.append((f"SVC_STATE_{i}", rf"^/var/lib/svc{i}/[^/]*/state$"))
+    return rules + M3_TAXONOMY
+
+
+def benchmark_rule_scaling(rule_counts=(10, 100, 1000, 10000), iterations=20):
+    """
+    Classify latency vs taxonomy size for each engine.
+    
+    The path set mixes real hits, synthetic hits, misses and the adversarial
+    shapes from the stress test (4096-byte and 50-level paths). The combined
+    alternation backtracks across every alternative on long paths, so it is
+    only measured up to 1,000 rules.
+    """
+    results = []
+    for rule_count in rule_counts:
+        taxonomy = synthetic_taxonomy(rule_count)
+        last = rule_count - 1
+        paths = [
+            "/etc/passwd",
+            "/home/user/.ssh/id_rsa",
+            "/usr/bin/python3",
+            f"/srv/app{last - last % 4}/config/db.yml",
+            "/home/user/Documents/secret.pdf",
+            "/dev/null",
+            "/" + "x" * 4095,
+            "/".join(["a" * 10] * 50),
+            "/home/" + "/".join(["nested"] * 50) + "/.ssh/id_rsa",
+        ]
+        for engine_name, engine_cls in ENGINES.items():
+            if engine_name == "combined" and rule_count > 1000:
+                continue
+            build_start = time.perf_counter_ns()
+            engine = engine_cls(taxonomy)
+            build_ns = time.perf_counter_ns() - build_start
+            
+            latencies = LatencyHistogram()
+            for _ in range(iterations):
+                for path in paths:
+                    start = time.perf_counter_ns()
+                    _ = engine.classify(path)
+                    end = time.perf_counter_ns()
+                    latencies.record(end - start)
+            
+            stats = latencies.summary()
+            results.append({
+                "rules": rule_count,
+                "engine": engine_name,
+                "build_ms": build_ns / 1_000_000,
+                "mean_us": stats["mean"],
+                "p99_us": stats["p99"],
+                "max_us": stats["max"],
+            })
+    return results
+
+
 def benchmark_state_machine(iterations=1000):
     """Measure ExfiltrationDetector.process_event() latency."""
     detector = ExfiltrationDetector()
@@ -68,14 +213,14 @@ def benchmark_state_machine(iterations=1000):
         (1234, "sendto", {"fd": "5", "ret": "1024"}, ""),
     ]
     
-    latencies = []
+    latencies = LatencyHistogram()
     
     for _ in range(iterations):
         for pid, verb, args, concept in events:
             start = time.perf_counter_ns()
             _ = detector.process_event(pid, verb, args, concept)
             end = time.perf_counter_ns()
-            latencies.append(end - start)
+            latencies.record(end - start)
     
     return latencies
 
@@ -95,7 +240,7 @@ def benchmark_full_decision(iterations=500):
         ("execve", "/usr/bin/bash", 9999),
     ]
     
-    latencies = []
+    latencies = LatencyHistogram()
     
     for _ in range(iterations):
         for verb, path, pid in test_events:
@@ -109,33 +254,250 @@ def benchmark_full_decision(iterations=500):
             verdict = detector.process_event(pid, verb, args, concept)
             
             end = time.perf_counter_ns()
-            latencies.append(end - start)
+            latencies.record(end - start)
     
     return latencies
 
 
-def print_stats(name, latencies_ns):
-    """Print statistics for a benchmark."""
-    latencies_us = [l / 1000 for l in latencies_ns]  # Convert to μs
+TYPED_DECISION_EVENTS = [
+    ("open", "/home/user/.ssh/id_rsa", 1234),
+    ("read", "", 1234),
+    ("socket", "", 1234),
+    ("connect", "192.168.1.1", 1234),
+    ("sendto", "", 1234),
+    ("unlink", "/tmp/test.txt", 5678),
+    ("execve", "/usr/bin/bash", 9999),
+]
+
+
+def _string_decision(classifier, detector, verb, path, pid):
+    concept = classifier.classify(path) if path else ""
+    return _string_detect(detector, verb, concept, pid)
+
+
+def _string_detect(detector, verb, concept, pid):
+    return detector.process_event(pid, verb, {"fd": "3", "ret": "0"}, concept)
+
+
+def _int_decision(classifier, detector, verb, path, pid):
+    concept = classifier.classify_id(path) if path else CONCEPT_NONE
+    return _int_detect(detector, verb, concept, pid)
+
+
+def _int_detect(detector, verb, concept, pid):
+    return detector.process_syscall(pid, verb, 3, 0, concept)
+
+
+def benchmark_typed_decision(iterations=500):
+    """
+    String-based vs int-based full decision loop (classify + detect).
+
+    Both modes use PathClassifier + SequenceDetector so the only difference
+    is the event representation: string verb / concept / args dict versus
+    the SyscallEvent fields as ints (interned verb and concept ids, int fd
+    and ret). Verb ids are resolved before timing, as the interceptor would
+    send them already numbered.
+    Returns [(name, histogram, bytes allocated per event), ...].
+    """
+    string_events = TYPED_DECISION_EVENTS
+    int_events = [(verb_id(verb), path, pid) for verb, path, pid in string_events]
+    
+    results = []
+    for name, decide, detect, events, classify in (
+            ("string verbs/concepts", _string_decision, _string_detect, string_events, "classify"),
+            ("interned int ids", _int_decision, _int_detect, int_events, "classify_id")):
+        classifier = PathClassifier()
+        detector = SequenceDetector()
+        latencies = LatencyHistogram()
+        for _ in range(iterations):
+            for verb, path, pid in events:
+                start = time.perf_counter_ns()
+                decide(classifier, detector, verb, path, pid)
+                latencies.record(time.perf_counter_ns() - start)
+        
+        # Allocation pass, untimed. Classification is done up front: its
+        # regex scratch space is identical in both modes and would mask the
+        # event representation in a peak measurement.
+        empty = "" if classify == "classify" else CONCEPT_NONE
+        classified = [(verb, getattr(classifier, classify)(path) if path else empty, pid)
+                      for verb, path, pid in events * 50]
+        allocated = peak_alloc_bytes(detect, detector, classified)
+        results.append((name, latencies, allocated / len(classified)))
+    return results
+
+
+def peak_alloc_bytes(detect, detector, events):
+    """
+    Sum of per-event peak transient allocation, in bytes.
+
+    Objects allocated and freed inside one call still count. The cost of
+    the measurement itself (taken from a no-op call) is subtracted. Small
+    dicts and tuples served from CPython's freelists never reach malloc,
+    so this is a lower bound on what the string representation costs.
+    """
+    def measure(fn):
+        total = 0
+        for verb, concept, pid in events:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(detector, verb, concept, pid)
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - before
+        return total
+    
+    # tracemalloc slows everything down, so it never overlaps a timed loop
+    tracemalloc.start()
+    try:
+        overhead = measure(lambda *_: None)
+        return max(measure(detect) - overhead, 0)
+    finally:
+        tracemalloc.stop()
+
+
+def ingest_workload(total_events=131072, num_pids=512, seed=7):
+    """Interleaved exfil chains and background noise as (pid, verb, fd, ret, concept) rows."""
+    rng = random.Random(seed)
+    chain = [
+        ("open", 3, 0, "SENSITIVE_USER_FILE"),
+        ("read", 3, 4096, ""),
+        ("socket", 5, 5, ""),
+        ("connect", 5, 0, ""),
+        ("sendto", 5, 1024, ""),
+    ]
+    noise = [
+        ("open", 3, 0, "UNKNOWN"),
+        ("read", 3, 512, ""),
+        ("write", 1, 64, ""),
+        ("close", 3, 0, ""),
+        ("mmap", -1, 0, ""),
+    ]
+    progress = {}
+    rows = []
+    for _ in range(total_events):
+        pid = 2000 + rng.randrange(num_pids)
+        if pid % 8 == 0:
+            step = progress.get(pid, 0)
+            verb, fd, ret, concept = chain[step]
+            progress[pid] = (step + 1) % len(chain)
+        else:
+            verb, fd, ret, concept = rng.choice(noise)
+        rows.append((pid, verb, fd, ret, concept))
+    return rows
+
+
+def benchmark_batch_ingest(batch_sizes=(1, 64, 1024, 65536), total_events=131072):
+    """
+    Events/sec through process_events() at several batch sizes.
+
+    The per-event rows replay the same stream the way the existing call
+    sites do: one process_event() call per event with a fresh args dict.
+    ExfiltrationDetector has no native batch API, so its batch rows go
+    through the generic process_events() fallback.
+    """
+    rows = ingest_workload(total_events)
+    full = EventBatch()
+    for pid, verb, fd, ret, concept in rows:
+        full.append(pid, verb, fd, ret, concept)
+    
+    results = []
+    for label, factory in (("ExfiltrationDetector", ExfiltrationDetector),
+                           ("SequenceDetector", SequenceDetector)):
+        detector = factory()
+        alerts = 0
+        start = time.perf_counter_ns()
+        for pid, verb, fd, ret, concept in rows:
+            verdict = detector.process_event(pid, verb, {"fd": str(fd), "ret": str(ret)}, concept)
+            if verdict and verdict.alert:
+                alerts += 1
+        elapsed_ns = time.perf_counter_ns() - start
+        results.append({
+            "detector": label,
+            "mode": "per-event",
+            "batch_size": 1,
+            "events": len(rows),
+            "alerts": alerts,
+            "events_per_sec": len(rows) / (elapsed_ns / 1e9),
+            "batch_p99_us": None,
+        })
+        
+        for size in batch_sizes:
+            batches = full.split(size)
+            detector = factory()
+            per_batch = LatencyHistogram()
+            alerts = 0
+            start = time.perf_counter_ns()
+            for batch in batches:
+                t0 = time.perf_counter_ns()
+                alerts += len(process_events(detector, batch))
+                per_batch.record(time.perf_counter_ns() - t0)
+            elapsed_ns = time.perf_counter_ns() - start
+            results.append({
+                "detector": label,
+                "mode": "batch",
+                "batch_size": size,
+                "events": len(full),
+                "alerts": alerts,
+                "events_per_sec": len(full) / (elapsed_ns / 1e9),
+                "batch_p99_us": per_batch.percentile(99) / 1000,
+            })
+    return results
+
+
+def benchmark_startup(runs=20, rule_count=5000):
+    """
+    Time-to-first-verdict of a freshly spawned brain (see brain_startup.py).
+    
+    Today's SemanticMapper brain against the lazy-import trie brain, with
+    and without a taxonomy snapshot on disk, without site (-S), and a
+    pre-built brain that forks one decider per session. The bare
+    fork/exec of /bin/true is the floor every spawned brain pays.
+    """
+    taxonomy = synthetic_taxonomy(rule_count)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="sentinel_startup_") as tmpdir:
+        m3_cache = os.path.join(tmpdir, "m3.trie")
+        big_cache = os.path.join(tmpdir, f"rules{rule_count}.trie")
+        for brain, flags, rules, cache in (
+            ("semantic", (), None, None),
+            ("trie", (), None, None),
+            ("trie", (), None, m3_cache),
+            ("trie", ("-S",), None, m3_cache),
+            ("trie", (), taxonomy, None),
+            ("trie", (), taxonomy, big_cache),
+        ):
+            results.append(time_to_first_verdict(brain, runs, flags, rules, cache))
+    results.append(forked_first_verdict("semantic", runs))
+    spawn_ms = spawn_baseline(runs)
+    profile = import_profile("semantic")
+    return results, spawn_ms, profile
+
+
+def print_stats(name, latencies):
+    """Print statistics for a benchmark (latencies is a LatencyHistogram in ns)."""
+    stats = latencies.summary()  # μs
     
     print(f"\n{'='*60}")
     print(f"  {name}")
     print(f"{'='*60}")
-    print(f"  Samples:    {len(latencies_us)}")
-    print(f"  Mean:       {statistics.mean(latencies_us):.2f} μs")
-    print(f"  Median:     {statistics.median(latencies_us):.2f} μs")
-    print(f"  Std Dev:    {statistics.stdev(latencies_us):.2f} μs")
-    print(f"  Min:        {min(latencies_us):.2f} μs")
-    print(f"  Max:        {max(latencies_us):.2f} μs")
-    print(f"  P95:        {statistics.quantiles(latencies_us, n=20)[18]:.2f} μs")
-    print(f"  P99:        {statistics.quantiles(latencies_us, n=100)[98]:.2f} μs")
+    print(f"  Samples:    {stats['samples']}")
+    print(f"  Mean:       {stats['mean']:.2f} μs")
+    print(f"  Median:     {stats['p50']:.2f} μs")
+    print(f"  Std Dev:    {stats['stdev']:.2f} μs")
+    print(f"  Min:        {stats['min']:.2f} μs")
+    print(f"  Max:        {stats['max']:.2f} μs")
+    print(f"  P95:        {stats['p95']:.2f} μs")
+    print(f"  P99:        {stats['p99']:.2f} μs")
+    print(f"  P99.9:      {stats['p999']:.2f} μs")
     
     return {
         "name": name,
-        "mean_us": statistics.mean(latencies_us),
-        "median_us": statistics.median(latencies_us),
-        "p95_us": statistics.quantiles(latencies_us, n=20)[18],
-        "p99_us": statistics.quantiles(latencies_us, n=100)[98],
+        "mean_us": stats["mean"],
+        "median_us": stats["p50"],
+        "p95_us": stats["p95"],
+        "p99_us": stats["p99"],
+        "p999_us": stats["p999"],
+        "max_us": stats["max"],
+        "histogram": latencies.to_dict(),
     }
 
 
@@ -165,6 +527,52 @@ def main():
     full_latencies = benchmark_full_decision(500)
     results.append(print_stats("Full Decision Loop (semantic + state)", full_latencies))
     
+    print("\n[*] Running string vs interned-id decision benchmark (500 iterations)...")
+    for name, latencies, alloc in benchmark_typed_decision(500):
+        stats = print_stats(f"decision: {name}", latencies)
+        print(f"  Alloc/event: {alloc:.0f} bytes")
+        stats["alloc_bytes_per_event"] = alloc
+        results.append(stats)
+    
+    print("\n[*] Running classify single vs batch benchmark (50 x 4096-path bursts)...")
+    for name, latencies in benchmark_classify_modes(50, 4096):
+        stats = print_stats(f"classify: {name}", latencies)
+        print(f"  Paths/sec:  {1_000_000 / max(stats['mean_us'], 1e-3):,.0f}")
+        results.append(stats)
+    
+    print("\n[*] Running taxonomy rule-count scaling benchmark (10 → 10,000 rules)...")
+    scaling = benchmark_rule_scaling()
+    print(f"\n  {'Rules':>7} │ {'Engine':<9} │ {'Build':>10} │ {'Mean':>11} │ {'P99':>11} │ {'Max':>11}")
+    print(f"  {'─'*7}─┼─{'─'*9}─┼─{'─'*10}─┼─{'─'*11}─┼─{'─'*11}─┼─{'─'*11}")
+    for r in scaling:
+        print(f"  {r['rules']:>7,} │ {r['engine']:<9} │ {r['build_ms']:>7.1f} ms │ "
+              f"{r['mean_us']:>8.2f} μs │ {r['p99_us']:>8.2f} μs │ {r['max_us']:>8.2f} μs")
+    
+    print("\n[*] Running batch event ingestion benchmark (batch sizes 1 → 64K)...")
+    ingest = benchmark_batch_ingest()
+    print(f"\n  {'Detector':<20} │ {'Mode':<9} │ {'Batch':>6} │ {'Events/sec':>12} │ {'Batch P99':>12} │ {'Alerts':>6}")
+    print(f"  {'─'*20}─┼─{'─'*9}─┼─{'─'*6}─┼─{'─'*12}─┼─{'─'*12}─┼─{'─'*6}")
+    for r in ingest:
+        p99 = f"{r['batch_p99_us']:>9.1f} μs" if r["batch_p99_us"] is not None else f"{'-':>12}"
+        print(f"  {r['detector']:<20} │ {r['mode']:<9} │ {r['batch_size']:>6,} │ "
+              f"{r['events_per_sec']:>12,.0f} │ {p99} │ {r['alerts']:>6,}")
+    
+    print("\n[*] Running brain cold-start benchmark (time to first verdict)...")
+    startup, spawn_ms, profile = benchmark_startup()
+    print(f"\n  {'Brain':<17} │ {'Flags':<5} │ {'Rules':>6} │ {'Cache':<5} │ {'TTFV P50':>10} │ "
+          f"{'P99':>10} │ {'Interp':>8} │ {'Imports':>8} │ {'Build':>8}")
+    print(f"  {'─'*17}─┼─{'─'*5}─┼─{'─'*6}─┼─{'─'*5}─┼─{'─'*10}─┼─{'─'*10}─┼─{'─'*8}─┼─{'─'*8}─┼─{'─'*8}")
+    for r in startup:
+        rules = f"{r['rules']:,}" if r["rules"] is not None else "M3"
+        phases = (f"{r['interpreter_ms']:>5.1f} ms │ {r['imports_ms']:>5.1f} ms │ {r['build_ms']:>5.1f} ms"
+                  if "imports_ms" in r else f"{'-':>8} │ {'-':>8} │ {'-':>8}")
+        print(f"  {r['brain']:<17} │ {r['flags']:<5} │ {rules:>6} │ {r['cache']:<5} │ "
+              f"{r['p50_ms']:>7.2f} ms │ {r['p99_ms']:>7.2f} ms │ {phases}")
+    print(f"\n  fork/exec /bin/true: {spawn_ms:.2f} ms")
+    print("  Slowest imports (semantic brain):")
+    for m in profile[:5]:
+        print(f"    {m['module']:<30} {m['self_ms']:>6.2f} ms self, {m['cumulative_ms']:>6.2f} ms cumulative")
+    
     # Summary for dossier
     print("\n")
     print("╔══════════════════════════════════════════════════════════════╗")
@@ -178,7 +586,9 @@ def main():
     
     # Save JSON
     with open("sentinel_benchmark_results.json", "w") as f:
-        json.dump(results, f, indent=2)
+        json.dump({"benchmarks": results, "rule_scaling": scaling, "batch_ingest": ingest,
+                   "startup": {"brains": startup, "spawn_baseline_ms": spawn_ms, "import_profile": profile}},
+                  f, indent=2)
     print(f"\n[+] Results saved to sentinel_benchmark_results.json")
 
 
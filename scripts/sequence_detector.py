@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+Sequence Detector - Table-driven attack-chain detection with bounded state
+===========================================================================
+An ExfiltrationDetector-compatible detector (src/analysis/state_machine.py)
+built for long-running tracers attached to fork-heavy process trees.
+
+    detector.process_event(pid, verb, args, concept) -> Verdict (.alert)
+
+Attack chains as data:
+    Every chain is a list of steps, each step a (verbs, concepts) pair;
+    concepts=None means "any concept". A chain fires when its steps are
+    seen in order for one PID (other syscalls may be interleaved). All
+    chains are compiled together into ONE transition table:
+
+        symbol = symbols[(verb, concept)]       # event class
+        entry  = delta[state << 16 | symbol]    # next state + alert bit
+
+    so process_event costs the same two lookups whether 1 or 500 chains
+    are loaded. A DFA state is every chain's progress packed into bytes.
+    States and transitions are built lazily the first time they are
+    reached (the same trick RE2 uses), and the table is flushed and
+    rebuilt from the live PIDs if it grows past max_states.
+
+Memory model:
+    * Only PIDs that are part-way through a chain are stored. A PID in the
+      idle state costs nothing, so a build system spawning millions of
+      short-lived compilers never accumulates state.
+    * A tracked PID is a single dict slot mapping pid -> state id. State ids
+      are small ints, so there is no per-PID object at all - no record,
+      no timestamp.
+    * exit / exit_group retire the PID immediately.
+    * Idle eviction is generational: PIDs live in a "young" and an "old"
+      dict. Touching a PID moves it to young; every ttl_sec / 2 the old
+      dict is dropped wholesale and young becomes old. A PID untouched for
+      ttl_sec is therefore always gone, with no per-event clock reads or
+      scans. Dropping a whole dict also returns its table memory, which
+      del on a dict never does.
+    * Past max_pids, each new PID evicts one PID untouched since the last
+      rotation (the last to enter old; popitem is O(1)), rotating first
+      when old is empty. Touched PIDs are never evicted, so max_pids live
+      chains always fit, and going past it costs one chain per extra PID
+      instead of a whole generation.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    detector = SequenceDetector(max_pids=1_000_000, ttl_sec=300)
+    verdict = detector.process_event(1234, "open", {"fd": "3"}, "SSH_KEYS")
+
+    detector = SequenceDetector(chains={"my_chain": [(["open"], ["SSH_KEYS"]),
+                                                     (["connect"], None)]})
+
+    batch = EventBatch.from_events(events)      # (pid, verb, args, concept)
+    for row, pid, reason in detector.process_events(batch):
+        ...
+
+    detector.process_syscall(1234, VERB_OPEN, 3, 0, CONCEPT_SSH_KEYS)   # event_types ids
+
+    detector.reload(new_chains)         # hot-swap rules, in-flight PIDs keep progress
+"""
+
+import time
+
+from event_types import CONCEPT_NAMES, VERB_EXIT, VERB_EXIT_GROUP, VERB_NAMES
+
+# Concepts that taint a process when opened (SemanticMapper tags + the
+# labels used by the stress-test attack chains)
+SENSITIVE_CONCEPTS = frozenset({
+    "CRITICAL_AUTH",
+    "SSH_KEYS",
+    "SENSITIVE_USER_FILE",
+    "SYSTEM_SECURITY_FILE",
+})
+
+EXIT_VERBS = frozenset({"exit", "exit_group"})
+
+# The attack chains exercised by the stress-test gauntlet, as data
+DEFAULT_CHAINS = {
+    "exfil": [
+        (["open"], sorted(SENSITIVE_CONCEPTS)),
+        (["read"], None),
+        (["socket", "connect"], None),
+        (["sendto", "sendmsg", "write"], None),
+    ],
+    "cred_theft": [
+        (["open"], ["SYSTEM_SECURITY_FILE", "CRITICAL_AUTH"]),
+        (["read"], None),
+        (["write"], None),
+        (["execve"], None),
+    ],
+    "ransomware": [
+        (["open"], ["SENSITIVE_USER_FILE"]),
+        (["read"], None),
+        (["open"], None),
+        (["write"], None),
+        (["unlink", "unlinkat"], None),
+    ],
+    "revshell": [
+        (["socket"], None),
+        (["connect"], None),
+        (["dup2", "dup3"], None),
+        (["dup2", "dup3"], None),
+        (["execve"], None),
+    ],
+    "log_tamper": [
+        (["open"], ["SYSTEM_LOG_FILE"]),
+        (["write", "unlink", "unlinkat"], None),
+    ],
+}
+
+IDLE = 0
+SYMBOL_BITS = 16
+_UNSEEN = -1
+
+
+class Verdict:
+    """Result of process_event(). Non-alert verdicts are a shared constant."""
+
+    __slots__ = ("alert", "reason", "pid")
+
+    def __init__(self, alert, reason="", pid=None):
+        self.alert = alert
+        self.reason = reason
+        self.pid = pid
+
+    def __repr__(self):
+        return f"<Verdict alert={self.alert} reason={self.reason!r} pid={self.pid}>"
+
+
+ALLOW = Verdict(False)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  CHAIN COMPILER
+# ═══════════════════════════════════════════════════════════════
+
+class ChainTable:
+    """
+    All chains compiled into one lazily-built DFA transition table.
+
+    Event classes: every step is a predicate over (verb, concept). Events
+    that satisfy exactly the same set of predicates are interchangeable,
+    so each distinct satisfaction signature becomes one symbol.
+    """
+
+    def __init__(self, chains, max_states=65536):
+        self.names = list(chains)
+        self.steps = []           # per chain: [(verbs, concepts-or-None), ...]
+        for name in self.names:
+            steps = [(frozenset(verbs), None if concepts is None else frozenset(concepts))
+                     for verbs, concepts in chains[name]]
+            if not 0 < len(steps) < 256:
+                raise ValueError(f"chain {name!r} must have 1-255 steps")
+            self.steps.append(steps)
+        self.max_states = max_states
+        self.flushes = 0
+        self._flush_at = max_states
+        self.symbols = {}         # (verb, concept) -> symbol id
+        self.id_symbols = []      # [verb id][concept id] -> symbol id or None
+        self._signatures = {}     # frozenset of (chain, step) -> symbol id
+        self._matches = []        # symbol id -> {chain: frozenset(step indices)}
+        self._reset_states()
+
+    def _reset_states(self):
+        self.delta = {}
+        self.fired_names = {}     # delta key -> names of chains completed
+        idle = bytes(len(self.steps))
+        self.state_ids = {idle: IDLE}
+        self.states = [idle]
+
+    def symbol(self, verb, concept):
+        """Event class for (verb, concept); computed once per distinct pair."""
+        matched = frozenset(
+            (c, i)
+            for c, steps in enumerate(self.steps)
+            for i, (verbs, concepts) in enumerate(steps)
+            if verb in verbs and (concepts is None or concept in concepts)
+        )
+        sym = self._signatures.get(matched)
+        if sym is None:
+            sym = len(self._matches)
+            if sym >= 1 << SYMBOL_BITS:
+                raise OverflowError("too many distinct event classes")
+            self._signatures[matched] = sym
+            by_chain = {}
+            for c, i in matched:
+                by_chain.setdefault(c, set()).add(i)
+            self._matches.append({c: frozenset(s) for c, s in by_chain.items()})
+        self.symbols[(verb, concept)] = sym
+        return sym
+
+    def symbol_for_ids(self, verb, concept):
+        """Event class for interned (verb id, concept id) - see event_types.py."""
+        sym = self.symbols.get((VERB_NAMES[verb], CONCEPT_NAMES[concept]))
+        if sym is None:
+            sym = self.symbol(VERB_NAMES[verb], CONCEPT_NAMES[concept])
+        # nested lists rather than a dict keyed on verb << 16 | concept:
+        # indexing allocates nothing, building a wide int key would
+        rows = self.id_symbols
+        while len(rows) <= verb:
+            rows.append([])
+        row = rows[verb]
+        if len(row) <= concept:
+            row.extend([None] * (concept + 1 - len(row)))
+        row[concept] = sym
+        return sym
+
+    def compile(self, state, sym):
+        """Build the table entry for (state, sym): (next_state << 1) | alert."""
+        progress = bytearray(self.states[state])
+        fired = []
+        for c, step_indices in self._matches[sym].items():
+            if progress[c] in step_indices:
+                progress[c] += 1
+                if progress[c] == len(self.steps[c]):
+                    progress[c] = 0
+                    fired.append(self.names[c])
+        target = bytes(progress)
+        next_state = self.state_ids.get(target)
+        if next_state is None:
+            next_state = len(self.states)
+            self.state_ids[target] = next_state
+            self.states.append(target)
+        key = (state << SYMBOL_BITS) | sym
+        entry = (next_state << 1) | bool(fired)
+        self.delta[key] = entry
+        if fired:
+            self.fired_names[key] = "attack chain: " + ", ".join(sorted(fired))
+        return entry
+
+    def fired(self, state, sym):
+        """Alert reason for the chains completed by taking sym from state."""
+        return self.fired_names[(state << SYMBOL_BITS) | sym]
+
+    def needs_flush(self):
+        return len(self.states) > self._flush_at
+
+    def flush(self, live_states):
+        """
+        Drop the table, keeping only states still held by PIDs.
+
+        Returns {old state id: new state id} for the caller to remap.
+        """
+        live = sorted(set(live_states) - {IDLE})
+        kept = [(s, self.states[s]) for s in live]
+        self._reset_states()
+        remap = {IDLE: IDLE}
+        for old_id, progress in kept:
+            new_id = len(self.states)
+            self.state_ids[progress] = new_id
+            self.states.append(progress)
+            remap[old_id] = new_id
+        self.flushes += 1
+        # if the live set alone is near the cap, back off instead of thrashing
+        self._flush_at = max(self.max_states, 2 * len(self.states))
+        return remap
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COLUMNAR EVENT BATCHES
+# ═══════════════════════════════════════════════════════════════
+
+class EventBatch:
+    """
+    Events stored column-wise for offline replay and async enforcement.
+
+    One typed array per field (pid, verb id, fd, ret, concept id) instead of
+    a (pid, verb, args_dict, concept) tuple per event. Verb and concept
+    strings are interned into per-batch vocabularies, so a 64K-event batch
+    holds a handful of strings and five flat arrays.
+    """
+
+    def __init__(self, verbs=(), concepts=()):
+        self.verbs = list(verbs)          # verb id -> verb
+        self.concepts = list(concepts)    # concept id -> concept
+        self.verb_ids = {v: i for i, v in enumerate(self.verbs)}
+        self.concept_ids = {c: i for i, c in enumerate(self.concepts)}
+        # imported here: array pulls in collections.abc, a few ms of brain
+        # startup that the per-event path never needs
+        from array import array
+        self.pid = array("i")
+        self.verb = array("H")
+        self.fd = array("i")
+        self.ret = array("q")
+        self.concept = array("H")
+
+    def __len__(self):
+        return len(self.pid)
+
+    def _intern(self, ids, names, name):
+        index = ids.get(name)
+        if index is None:
+            index = ids[name] = len(names)
+            names.append(name)
+        return index
+
+    def append(self, pid, verb, fd=-1, ret=0, concept=""):
+        self.pid.append(pid)
+        self.verb.append(self._intern(self.verb_ids, self.verbs, verb))
+        self.fd.append(fd)
+        self.ret.append(ret)
+        self.concept.append(self._intern(self.concept_ids, self.concepts, concept or ""))
+
+    @classmethod
+    def from_events(cls, events):
+        """Build from process_event-style (pid, verb, args, concept) tuples."""
+        batch = cls()
+        for pid, verb, args, concept in events:
+            batch.append(pid, verb, int(args.get("fd", -1)), int(args.get("ret", 0)), concept)
+        return batch
+
+    def slice(self, start, stop):
+        """Rows [start, stop) as a new batch sharing this batch's vocabularies."""
+        part = EventBatch.__new__(EventBatch)
+        part.verbs, part.concepts = self.verbs, self.concepts
+        part.verb_ids, part.concept_ids = self.verb_ids, self.concept_ids
+        part.pid = self.pid[start:stop]
+        part.verb = self.verb[start:stop]
+        part.fd = self.fd[start:stop]
+        part.ret = self.ret[start:stop]
+        part.concept = self.concept[start:stop]
+        return part
+
+    def split(self, size):
+        """Consecutive batches of at most size rows."""
+        return [self.slice(i, i + size) for i in range(0, len(self), size)]
+
+
+def process_syscall(detector, event):
+    """
+    Run one SyscallEvent through any detector.
+
+    Uses the detector's native process_syscall() when it has one, otherwise
+    converts back to strings for process_event().
+    """
+    native = getattr(detector, "process_syscall", None)
+    if native is not None:
+        return native(*event)
+    return detector.process_event(*event.as_strings())
+
+
+def process_events(detector, batch):
+    """
+    Run a batch through any detector, returning (row, pid, reason) alerts.
+
+    Uses the detector's native process_events() when it has one, otherwise
+    falls back to one process_event() call per row.
+    """
+    native = getattr(detector, "process_events", None)
+    if native is not None:
+        return native(batch)
+    alerts = []
+    verbs, concepts = batch.verbs, batch.concepts
+    for row, (pid, v, fd, ret, c) in enumerate(
+            zip(batch.pid, batch.verb, batch.fd, batch.ret, batch.concept)):
+        verdict = detector.process_event(pid, verbs[v], {"fd": str(fd), "ret": str(ret)}, concepts[c])
+        if verdict and verdict.alert:
+            alerts.append((row, pid, getattr(verdict, "reason", "")))
+    return alerts
+
+
+# ═══════════════════════════════════════════════════════════════
+#  DETECTOR
+# ═══════════════════════════════════════════════════════════════
+
+class SequenceDetector:
+    """Table-driven chain detector with per-PID retirement and bounded state."""
+
+    def __init__(self, chains=None, max_pids=100_000, ttl_sec=300.0, check_every=4096,
+                 max_states=65536, clock=time.monotonic):
+        self.table = ChainTable(DEFAULT_CHAINS if chains is None else chains, max_states)
+        self.max_pids = max_pids
+        self.ttl_sec = ttl_sec
+        self.check_every = check_every
+        self.clock = clock
+        self.young = {}
+        self.old = {}
+        self.retired = 0
+        self.evicted_ttl = 0
+        self.evicted_capacity = 0
+        self._until_check = check_every
+        self._next_rotation = clock() + ttl_sec / 2 if ttl_sec is not None else None
+
+    def __len__(self):
+        return len(self.young) + len(self.old)
+
+    def process_event(self, pid, verb, args, concept):
+        """Advance pid's state for one syscall. args is accepted for API parity."""
+        self._until_check -= 1
+        if self._until_check <= 0:
+            self._check_clock()
+
+        if verb in EXIT_VERBS:
+            self.retire(pid)
+            return ALLOW
+
+        table = self.table
+        sym = table.symbols.get((verb, concept))
+        if sym is None:
+            sym = table.symbol(verb, concept)
+        return self._step(pid, sym)
+
+    def process_syscall(self, pid, verb, fd, ret, concept):
+        """
+        process_event() for interned ids (event_types.py) - no string compares.
+
+        Takes the SyscallEvent fields positionally: process_syscall(*event).
+        fd and ret are accepted for API parity.
+        """
+        self._until_check -= 1
+        if self._until_check <= 0:
+            self._check_clock()
+
+        if verb == VERB_EXIT or verb == VERB_EXIT_GROUP:
+            self.retire(pid)
+            return ALLOW
+
+        table = self.table
+        try:
+            sym = table.id_symbols[verb][concept]
+        except IndexError:
+            sym = None
+        if sym is None:
+            sym = table.symbol_for_ids(verb, concept)
+        return self._step(pid, sym)
+
+    def _step(self, pid, sym):
+        table = self.table
+        young = self.young
+        state = young.get(pid)
+        if state is None:
+            state = self.old.pop(pid, IDLE) if self.old else IDLE
+
+        entry = table.delta.get((state << SYMBOL_BITS) | sym, _UNSEEN)
+        if entry == _UNSEEN:
+            entry = table.compile(state, sym)
+            if table.needs_flush():
+                return self._flush_after(pid, state, sym, entry)
+
+        return self._apply(pid, state, sym, entry)
+
+    def process_events(self, batch):
+        """
+        Advance every PID in an EventBatch in one pass.
+
+        Equivalent to calling process_event() row by row, but event classes
+        are resolved once per distinct (verb id, concept id) pair and no
+        Verdict or args dict is built for non-alert rows. Returns only the
+        alert rows, as (row, pid, reason) tuples.
+        """
+        table = self.table
+        classes = {}
+        exit_ids = {i for i, verb in enumerate(batch.verbs) if verb in EXIT_VERBS}
+        verbs, concepts = batch.verbs, batch.concepts
+        pids, verb_col, concept_col = batch.pid, batch.verb, batch.concept
+        alerts = []
+        row, total = 0, len(batch)
+
+        while row < total:
+            # same clock cadence as process_event(), which checks on the
+            # event that takes _until_check to 0 and does not count it
+            if self._until_check <= 1:
+                self._check_clock()
+                self._until_check += 1
+            stop = min(total, row + self._until_check - 1)
+            self._until_check -= stop - row
+
+            delta = table.delta
+            young, old = self.young, self.old
+            for row in range(row, stop):
+                pid = pids[row]
+                v = verb_col[row]
+                if v in exit_ids:
+                    if young.pop(pid, None) is not None or old.pop(pid, None) is not None:
+                        self.retired += 1
+                    continue
+                key = (v << 16) | concept_col[row]
+                sym = classes.get(key)
+                if sym is None:
+                    pair = (verbs[v], concepts[concept_col[row]])
+                    sym = table.symbols.get(pair)
+                    if sym is None:
+                        sym = table.symbol(*pair)
+                    classes[key] = sym
+
+                state = young.get(pid)
+                if state is None:
+                    state = old.pop(pid, IDLE) if old else IDLE
+                entry = delta.get((state << SYMBOL_BITS) | sym, _UNSEEN)
+                if entry == _UNSEEN:
+                    entry = table.compile(state, sym)
+                    if table.needs_flush():
+                        verdict = self._flush_after(pid, state, sym, entry)
+                        if verdict.alert:
+                            alerts.append((row, pid, verdict.reason))
+                        delta = table.delta
+                        young, old = self.young, self.old
+                        continue
+
+                next_state = entry >> 1
+                if next_state == IDLE:
+                    young.pop(pid, None)
+                else:
+                    young[pid] = next_state
+                    if len(young) + len(old) > self.max_pids:
+                        self.evicted_capacity += self._evict_stale(pid)
+                        young, old = self.young, self.old
+                if entry & 1:
+                    alerts.append((row, pid, table.fired(state, sym)))
+            row = stop
+
+        if not self.young:
+            self.young = {}
+        return alerts
+
+    def _apply(self, pid, state, sym, entry):
+        next_state = entry >> 1
+        young = self.young
+        if next_state == IDLE:
+            young.pop(pid, None)
+        else:
+            young[pid] = next_state
+            if len(young) + len(self.old) > self.max_pids:
+                self.evicted_capacity += self._evict_stale(pid)
+        if entry & 1:
+            return Verdict(True, self.table.fired(state, sym), pid)
+        return ALLOW
+
+    def _flush_after(self, pid, state, sym, entry):
+        # Resolve this event against the old table first, then remap every
+        # tracked PID (including this one) onto the rebuilt table.
+        verdict = self._apply(pid, state, sym, entry)
+        remap = self.table.flush([*self.young.values(), *self.old.values()])
+        self.young = {p: remap[s] for p, s in self.young.items()}
+        self.old = {p: remap[s] for p, s in self.old.items()}
+        return verdict
+
+    def reload(self, chains):
+        """
+        Swap in a new chain set without dropping in-flight PIDs.
+
+        A PID's progress in every chain that exists in both sets with the
+        same steps carries over; new or changed chains start from step 0,
+        and PIDs left with no progress at all are released. The new table
+        compiles lazily, so the swap costs one pass over the distinct live
+        states plus one dict rebuild per generation. Returns
+        {"carried": PIDs kept, "released": PIDs dropped}.
+        """
+        old_table = self.table
+        table = ChainTable(chains, old_table.max_states)
+        old_index = {name: c for c, name in enumerate(old_table.names)}
+        keep = [(c, old_index[name]) for c, name in enumerate(table.names)
+                if name in old_index and table.steps[c] == old_table.steps[old_index[name]]]
+
+        remap = {}
+        for state in {*self.young.values(), *self.old.values()}:
+            source = old_table.states[state]
+            progress = bytearray(len(table.steps))
+            for c, old_c in keep:
+                progress[c] = source[old_c]
+            target = bytes(progress)
+            new_state = table.state_ids.get(target)
+            if new_state is None:
+                new_state = len(table.states)
+                table.state_ids[target] = new_state
+                table.states.append(target)
+            remap[state] = new_state
+
+        tracked = len(self)
+        self.young = {p: remap[s] for p, s in self.young.items() if remap[s] != IDLE}
+        self.old = {p: remap[s] for p, s in self.old.items() if remap[s] != IDLE}
+        self.table = table
+        return {"carried": len(self), "released": tracked - len(self)}
+
+    def retire(self, pid):
+        """Forget a PID (process exited)."""
+        if self.young.pop(pid, None) is not None or self.old.pop(pid, None) is not None:
+            self.retired += 1
+            if not self.young:
+                self.young = {}  # a drained dict keeps its table; start afresh
+
+    def _rotate(self):
+        """Drop the old generation; young becomes old. Returns PIDs evicted."""
+        dropped = len(self.old)
+        self.old = self.young
+        self.young = {}
+        return dropped
+
+    def _evict_stale(self, keep):
+        """Drop one PID untouched since the last rotation, never keep. Returns PIDs evicted."""
+        if not self.old:
+            self._rotate()      # old is empty: nothing is dropped here
+        old = self.old
+        pid, state = old.popitem()
+        if pid == keep:         # just rotated in with young: it stays live
+            self.young[pid] = state
+            if not old:
+                return 0
+            old.popitem()
+        return 1
+
+    def _check_clock(self):
+        self._until_check = self.check_every
+        if self._next_rotation is None:
+            return
+        now = self.clock()
+        if now >= self._next_rotation:
+            self.evicted_ttl += self._rotate()
+            self._next_rotation = now + self.ttl_sec / 2
+
+    def stats(self):
+        return {
+            "tracked_pids": len(self),
+            "retired": self.retired,
+            "evicted_ttl": self.evicted_ttl,
+            "evicted_capacity": self.evicted_capacity,
+            "chains": len(self.table.names),
+            "dfa_states": len(self.table.states),
+            "dfa_transitions": len(self.table.delta),
+            "dfa_flushes": self.table.flushes,
+        }
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Sharded Brain - PID-affinity routing across N worker processes
+===============================================================
+The decision path (SemanticMapper.classify + ExfiltrationDetector
+.process_event) is pure Python, so threads cannot scale it past one core.
+Here a dispatcher hashes each event's PID - or the root of its process
+tree - to one of N worker processes. Every worker owns its own mapper and
+detector, i.e. one shard of the per-PID sequence state, and sees all
+events of the PIDs routed to it in order, so chain detection gives the
+same alerts as one detector seeing everything.
+
+    dispatcher ──batch──▶ worker 0   mapper + detector (PIDs with hash 0)
+               ──batch──▶ worker 1   mapper + detector (PIDs with hash 1)
+               ...
+
+Affinity:
+    "pid"    hash of the PID; any chain that stays inside one process
+    "tree"   hash of the process-tree root; fork/vfork/clone events
+             (ret = child PID) move the child into its parent's tree, so
+             chains that hop across a fork still land in one shard
+
+The dispatcher only hashes and appends; classification runs in the
+workers. Events cross to a worker in pickled batches of batch_size, which
+also applies back-pressure when a worker falls behind. Alerts are collected
+when the brain is closed, tagged with the dispatcher's sequence number.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    with ShardedBrain(4, SemanticMapper, ExfiltrationDetector) as brain:
+        for pid, verb, args, path in events:
+            brain.submit(pid, verb, args, path)
+    brain.alerts        # [(seq, pid, reason)] in submission order
+    brain.stats         # per-worker events / alerts / busy seconds
+"""
+
+import multiprocessing
+import time
+
+AFFINITIES = ("pid", "tree")
+FORK_VERBS = frozenset({"fork", "vfork", "clone", "clone3"})
+EXIT_VERBS = frozenset({"exit", "exit_group"})
+
+_GOLDEN = 0x9E3779B1
+
+
+def shard_of(key, workers):
+    """Shard index for a PID / tree root (Fibonacci hash, spreads runs of PIDs)."""
+    return ((key * _GOLDEN) & 0xFFFFFFFF) * workers >> 32
+
+
+def _serve_shard(conn, mapper_factory, detector_factory):
+    """Worker loop: decide every event of every batch until the None sentinel."""
+    classify = mapper_factory().classify
+    process_event = detector_factory().process_event
+    alerts = []
+    events = 0
+    busy_ns = 0
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        start = time.perf_counter_ns()
+        for seq, pid, verb, args, path in batch:
+            verdict = process_event(pid, verb, args, classify(path) if path else "")
+            if verdict and verdict.alert:
+                alerts.append((seq, pid, getattr(verdict, "reason", "")))
+        busy_ns += time.perf_counter_ns() - start
+        events += len(batch)
+    conn.send({"events": events, "alerts": alerts, "busy_sec": busy_ns / 1e9})
+    conn.close()
+
+
+class ShardedBrain:
+    """Dispatcher over N forked decision workers, one state shard each."""
+
+    def __init__(self, workers, mapper_factory, detector_factory, batch_size=256, affinity="pid"):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if affinity not in AFFINITIES:
+            raise ValueError(f"unknown affinity {affinity!r} (choose from {', '.join(AFFINITIES)})")
+        self.workers = workers
+        self.batch_size = batch_size
+        self.affinity = affinity
+        self.roots = {}
+        self.alerts = None
+        self.stats = None
+        self._seq = 0
+        self._batches = [[] for _ in range(workers)]
+        self._conns = []
+        self._procs = []
+        # fork, so factories need not be picklable (lambdas, sys.path imports)
+        ctx = multiprocessing.get_context("fork")
+        for _ in range(workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_serve_shard, args=(child, mapper_factory, detector_factory),
+                               daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def route(self, pid, verb, args):
+        """Shard for an event, tracking process trees under "tree" affinity."""
+        if self.affinity == "pid":
+            return shard_of(pid, self.workers)
+        roots = self.roots
+        root = roots.get(pid, pid)
+        if verb in FORK_VERBS:
+            child = int(args.get("ret", 0))
+            if child > 0:
+                roots[child] = root
+        elif verb in EXIT_VERBS:
+            roots.pop(pid, None)
+        return shard_of(root, self.workers)
+
+    def submit(self, pid, verb, args, path=""):
+        """Queue one event for its shard; returns its sequence number."""
+        self._seq += 1
+        shard = self.route(pid, verb, args)
+        batch = self._batches[shard]
+        batch.append((self._seq, pid, verb, args, path))
+        if len(batch) >= self.batch_size:
+            self._send(shard)
+        return self._seq
+
+    def _send(self, shard):
+        self._conns[shard].send(self._batches[shard])
+        self._batches[shard] = []
+
+    def flush(self):
+        """Hand every partially filled batch to its worker."""
+        for shard, batch in enumerate(self._batches):
+            if batch:
+                self._send(shard)
+
+    def close(self):
+        """Flush, stop the workers and collect alerts and per-worker stats."""
+        if self.stats is not None:
+            return
+        self.flush()
+        for conn in self._conns:
+            conn.send(None)
+        shards = [conn.recv() for conn in self._conns]
+        for conn, proc in zip(self._conns, self._procs):
+            conn.close()
+            proc.join()
+        self.alerts = sorted(alert for shard in shards for alert in shard["alerts"])
+        self.stats = [{"events": shard["events"], "alerts": len(shard["alerts"]),
+                       "busy_sec": shard["busy_sec"]} for shard in shards]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Shared-Memory Ring - SPSC ring buffer transport for the interceptor↔brain bridge
+================================================================================
+An alternative to the named-pipe bridge (/tmp/sentinel_req, /tmp/sentinel_resp).
+With FIFOs every verdict costs a write() and a read() on each side plus the
+context switches between them. Here requests and verdicts are copied into
+fixed-size slots of an mmap'ed single-producer / single-consumer ring, and
+a syscall is only made when the other side is actually asleep.
+
+Layout (one mmap per direction, x86 little-endian):
+
+    0    header     magic, version, slot_size, slot_count
+    64   head       u64, written only by the producer
+    128  tail       u64, written only by the consumer
+    192  waiting    u64, consumer is (about to be) blocked on the doorbell
+    256  slots      slot_count x slot_size, slot = u16 length + payload
+
+Head and tail sit on separate cache lines so the two sides never write the
+same line. Slots are published by writing the payload first and then
+bumping head, which is ordered on x86 (TSO); weaker architectures would
+need an explicit barrier on the C side.
+
+Doorbell:
+    An eventfd per ring. The consumer spins for a bounded number of polls,
+    then raises "waiting", re-checks the ring and sleeps on the eventfd.
+    The producer only writes the eventfd when "waiting" is set, so under
+    load the bridge runs without syscalls. Python cannot issue the fence
+    that closes the flag/head race, so the sleep is a poll() with a 1 ms
+    backstop timeout rather than an unbounded read; a futex would replace
+    the eventfd in the C interceptor.
+
+Request slot:   seq u32, pid u32, verb u16 (event_types id), arg_len u16, argument
+Verdict slot:   seq u32, verdict u8 (1 = ALLOW, 0 = BLOCK)
+
+The default slot (REQUEST_SLOT_SIZE) holds a request with a PATH_MAX
+argument. Only the bytes written are touched, so the large slots cost
+address space, not cache traffic.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    requests, verdicts = ShmRing(), ShmRing(slot_size=16)   # before fork()
+    # brain process
+    serve_ring(requests, verdicts, lambda pid, verb, arg: verb != VERB_UNLINK)
+    # interceptor stand-in
+    client = RingClient(requests, verdicts)
+    client.send(1234, VERB_OPEN, b"/etc/passwd")
+    client.recv()        # -> (seq, allow)
+"""
+
+import mmap
+import os
+import select
+import struct
+
+MAGIC = 0x53524E47          # "SRNG"
+VERSION = 1
+
+HEADER = struct.Struct("<IHHII")
+LENGTH_SIZE = 2
+HEAD = 64 // 8              # indices into the header viewed as u64 words
+TAIL = 128 // 8
+WAITING = 192 // 8
+SLOTS_OFFSET = 256
+
+REQUEST = struct.Struct("<IIHH")   # seq, pid, verb id, arg_len (+ argument)
+VERDICT = struct.Struct("<IB")     # seq, verdict
+
+PATH_MAX = 4096
+# u16 length + request header + PATH_MAX argument, rounded up to a cache line
+REQUEST_SLOT_SIZE = (LENGTH_SIZE + REQUEST.size + PATH_MAX + 63) & ~63
+DEFAULT_SLOT_SIZE = REQUEST_SLOT_SIZE
+DEFAULT_SLOTS = 1024
+
+# Busy-polling only helps when the other side runs on another CPU
+DEFAULT_SPIN = 0 if (os.cpu_count() or 1) < 2 else 2000
+BACKSTOP_MS = 1
+
+
+class RingFull(Exception):
+    """try_push() found no free slot."""
+
+
+class ShmRing:
+    """
+    One direction of the bridge: a fixed-slot SPSC ring in shared memory.
+
+    Created with path=None the ring is an anonymous shared mapping and is
+    shared by fork(). With a path (e.g. under /dev/shm) an unrelated
+    process can attach(), given the creator's doorbell eventfd: inherited
+    (subprocess pass_fds) or sent over a Unix socket (socket.send_fds).
+    """
+
+    def __init__(self, slot_size=DEFAULT_SLOT_SIZE, slots=DEFAULT_SLOTS, path=None, spin=DEFAULT_SPIN):
+        if slots & (slots - 1):
+            raise ValueError("slots must be a power of two")
+        if slot_size < LENGTH_SIZE + VERDICT.size or slot_size % 2:
+            raise ValueError("slot_size must be even and hold at least a verdict")
+        self.slot_size = slot_size
+        self.slots = slots
+        self.spin = spin
+        size = SLOTS_OFFSET + slot_size * slots
+        if path is None:
+            self.buf = mmap.mmap(-1, size, mmap.MAP_SHARED)
+        else:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.ftruncate(fd, size)
+                self.buf = mmap.mmap(fd, size, mmap.MAP_SHARED)
+            finally:
+                os.close(fd)
+        HEADER.pack_into(self.buf, 0, MAGIC, VERSION, 0, slot_size, slots)
+        self.doorbell = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+        self._map_views()
+
+    def _map_views(self):
+        # Typed views over the mapping: indexing a cast memoryview is far
+        # cheaper than struct.pack_into() on the mmap object each time
+        self._mask = self.slots - 1
+        self._poll = None
+        self.view = memoryview(self.buf)
+        self.ctrl = self.view[:SLOTS_OFFSET].cast("Q")
+        self.lengths = self.view.cast("H")
+
+    @classmethod
+    def attach(cls, path, doorbell, spin=DEFAULT_SPIN):
+        """Map an existing ring file created by another process; the ring owns doorbell."""
+        fd = os.open(path, os.O_RDWR)
+        try:
+            size = os.fstat(fd).st_size
+            buf = mmap.mmap(fd, size, mmap.MAP_SHARED)
+        finally:
+            os.close(fd)
+        magic, version, _, slot_size, slots = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} shm ring")
+        ring = cls.__new__(cls)
+        ring.buf, ring.slot_size, ring.slots, ring.spin = buf, slot_size, slots, spin
+        ring.doorbell = doorbell
+        ring._map_views()
+        return ring
+
+    def close(self):
+        os.close(self.doorbell)
+        for view in (self.lengths, self.ctrl, self.view):
+            view.release()
+        self.buf.close()
+
+    # ───────────────────────────────────────────────────────────────
+    #  Producer side
+    # ───────────────────────────────────────────────────────────────
+
+    def try_push(self, payload):
+        """Publish one payload; raises RingFull if the consumer is a lap behind."""
+        ctrl = self.ctrl
+        head = ctrl[HEAD]
+        if head - ctrl[TAIL] >= self.slots:
+            raise RingFull()
+        length = len(payload)
+        if length > self.slot_size - LENGTH_SIZE:
+            raise ValueError(f"payload of {length} bytes does not fit a {self.slot_size}-byte slot")
+        offset = SLOTS_OFFSET + (head & self._mask) * self.slot_size
+        self.lengths[offset >> 1] = length
+        self.view[offset + LENGTH_SIZE:offset + LENGTH_SIZE + length] = payload
+        ctrl[HEAD] = head + 1                    # publish
+        if ctrl[WAITING]:
+            # claim the wake-up so a burst rings the doorbell once, not per item
+            ctrl[WAITING] = 0
+            os.eventfd_write(self.doorbell, 1)
+
+    def push(self, payload):
+        """Publish one payload, yielding the CPU while the ring is full."""
+        while True:
+            try:
+                return self.try_push(payload)
+            except RingFull:
+                os.sched_yield()
+
+    # ───────────────────────────────────────────────────────────────
+    #  Consumer side
+    # ───────────────────────────────────────────────────────────────
+
+    def __len__(self):
+        return self.ctrl[HEAD] - self.ctrl[TAIL]
+
+    def pop(self):
+        """Take the oldest payload, sleeping on the doorbell while empty."""
+        ctrl = self.ctrl
+        tail = ctrl[TAIL]
+        if ctrl[HEAD] == tail:
+            self._wait(tail)
+        offset = SLOTS_OFFSET + (tail & self._mask) * self.slot_size
+        start = offset + LENGTH_SIZE
+        payload = self.buf[start:start + self.lengths[offset >> 1]]
+        ctrl[TAIL] = tail + 1
+        return payload
+
+    def _wait(self, tail):
+        ctrl = self.ctrl
+        for _ in range(self.spin):
+            if ctrl[HEAD] != tail:
+                return
+        if self._poll is None:
+            self._poll = select.poll()
+            self._poll.register(self.doorbell, select.POLLIN)
+        while True:
+            ctrl[WAITING] = 1
+            if ctrl[HEAD] != tail:
+                break
+            if self._poll.poll(BACKSTOP_MS):
+                try:
+                    os.eventfd_read(self.doorbell)
+                except BlockingIOError:
+                    pass
+            if ctrl[HEAD] != tail:
+                break
+        ctrl[WAITING] = 0
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BRIDGE ENDPOINTS
+# ═══════════════════════════════════════════════════════════════
+
+def encode_request(seq, pid, verb, argument):
+    return REQUEST.pack(seq, pid, verb, len(argument)) + argument
+
+
+def decode_request(payload):
+    seq, pid, verb, length = REQUEST.unpack_from(payload)
+    return seq, pid, verb, payload[REQUEST.size:REQUEST.size + length]
+
+
+def serve_ring(requests, verdicts, decide, stop_verb=None):
+    """
+    Brain-side reader: answer every request with decide(pid, verb, argument).
+
+    Runs until a request with verb == stop_verb arrives (never, if None).
+    """
+    while True:
+        seq, pid, verb, argument = decode_request(requests.pop())
+        if verb == stop_verb:
+            return
+        verdicts.push(VERDICT.pack(seq, 1 if decide(pid, verb, argument) else 0))
+
+
+class RingClient:
+    """Interceptor-side stand-in writer: numbered requests, in-order verdicts."""
+
+    def __init__(self, requests, verdicts):
+        self.requests = requests
+        self.verdicts = verdicts
+        self.seq = 0
+
+    def send(self, pid, verb, argument):
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        self.requests.push(encode_request(self.seq, pid, verb, argument))
+        return self.seq
+
+    def recv(self):
+        """Next (seq, allow) verdict."""
+        seq, verdict = VERDICT.unpack(self.verdicts.pop())
+        return seq, verdict == 1
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Syscall Mix - Weighted syscall workloads replayed at a target rate
+===================================================================
+benchmark_syscall_storm in head_to_head.py issues nothing but getpid(),
+and a tracer's cost differs a lot between syscall types: a getpid stop is
+all context switch, an openat stop also has a path for the brain, and a
+clone drags a new tracee in. A profile describes the mix a real workload
+issues, so the overhead can be quoted for that workload instead.
+
+Ops (each one is exactly the syscall named, except where noted):
+    openat    os.open() of a scratch file; the fd joins the open set
+              (at most max_open; a full set closes its oldest fd first)
+    read      io_size bytes from /dev/zero
+    write     io_size bytes to /dev/null
+    close     the oldest fd of the open set (skipped when the set is empty)
+    stat      stat() of a scratch file
+    mmap      anonymous io_size mapping, touched once (+ munmap)
+    connect   UDP connect() to a loopback receiver
+    sendto    one UDP datagram (≤ io_size, ≤ 65000 bytes) to the receiver
+    clone     fork() of a child that exits at once (+ wait4)
+
+Profile (JSON file, or one of PROFILES by name):
+    {
+      "name": "web_server",
+      "description": "...",
+      "rate": 20000,              # ops/sec; null = as fast as possible
+      "io_size": 4096,
+      "mix": {"read": 25, "sendto": 25, "openat": 10, ...}
+    }
+
+The op sequence is drawn up front from the weights, so no RNG runs in the
+timed loop. With a rate the loop is open: op i is due at start + i / rate
+and its latency counts from then, queueing behind a slow op included.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    python3 scripts/syscall_mix.py list
+    python3 scripts/syscall_mix.py run web_server [iterations] [rate]
+    python3 scripts/syscall_mix.py run my_profile.json
+
+    with SyscallMix(load_profile("ransomware")) as mix:
+        result = mix.run(20000)
+"""
+
+import json
+import mmap
+import os
+import random
+import socket
+import sys
+import tempfile
+import time
+from collections import deque
+
+from latency_histogram import LatencyHistogram
+
+OPS = ("openat", "read", "write", "close", "stat", "mmap", "connect", "sendto", "clone")
+
+PROFILES = {
+    "build_server": {
+        "name": "build_server",
+        "description": "compiler / linker churn: header stats, short reads, tool spawns",
+        "rate": None,
+        "io_size": 16384,
+        "mix": {"stat": 30, "openat": 18, "read": 22, "close": 18, "mmap": 6, "write": 5, "clone": 1},
+    },
+    "web_server": {
+        "name": "web_server",
+        "description": "static files and upstream calls: reads and sends dominate",
+        "rate": None,
+        "io_size": 4096,
+        "mix": {"read": 25, "sendto": 25, "openat": 10, "close": 10, "stat": 10, "write": 10,
+                "connect": 5, "mmap": 5},
+    },
+    "ransomware": {
+        "name": "ransomware",
+        "description": "walk, read, overwrite: open/read/write/close over many files",
+        "rate": None,
+        "io_size": 65536,
+        "mix": {"openat": 22, "read": 25, "write": 25, "close": 22, "stat": 6},
+    },
+}
+
+SEQUENCE_LENGTH = 65536         # pre-drawn ops, replayed round robin (power of two)
+MAX_DATAGRAM = 65000
+
+
+class ProfileError(ValueError):
+    """Unknown profile name, unreadable profile file or invalid mix."""
+
+
+def load_profile(name_or_path):
+    """A built-in profile by name, or a profile JSON file; validated."""
+    if name_or_path in PROFILES:
+        profile = dict(PROFILES[name_or_path])
+    else:
+        try:
+            with open(name_or_path) as f:
+                profile = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ProfileError(f"{name_or_path}: not a built-in profile "
+                               f"({', '.join(PROFILES)}) or a readable profile file: {e}")
+        profile.setdefault("name", os.path.splitext(os.path.basename(name_or_path))[0])
+    mix = profile.get("mix") or {}
+    unknown = set(mix) - set(OPS)
+    if unknown:
+        raise ProfileError(f"{profile['name']}: unknown ops {', '.join(sorted(unknown))} "
+                           f"(choose from {', '.join(OPS)})")
+    if not mix or any(weight < 0 for weight in mix.values()) or not sum(mix.values()):
+        raise ProfileError(f"{profile['name']}: mix needs positive weights")
+    profile.setdefault("rate", None)
+    profile.setdefault("io_size", 4096)
+    profile.setdefault("description", "")
+    return profile
+
+
+# ═══════════════════════════════════════════════════════════════
+#  WORKLOAD ENGINE
+# ═══════════════════════════════════════════════════════════════
+
+class SyscallMix:
+    """Scratch files, fds and sockets for one profile, and the timed loop over them."""
+
+    def __init__(self, profile, seed=0, scratch_files=64, max_open=32):
+        self.profile = profile
+        self.io_size = profile["io_size"]
+        self.max_open = max_open
+        rng = random.Random(seed)
+        ops = list(profile["mix"])
+        self.sequence = rng.choices(ops, weights=[profile["mix"][op] for op in ops],
+                                    k=SEQUENCE_LENGTH)
+
+        self.scratch = tempfile.TemporaryDirectory(prefix="syscall_mix_")
+        self.paths = []
+        for i in range(scratch_files):
+            path = os.path.join(self.scratch.name, f"file_{i}.dat")
+            with open(path, "wb") as f:
+                f.write(b"\0" * self.io_size)
+            self.paths.append(path)
+        self.next_path = 0
+        self.open_fds = deque()
+        self.zero_fd = os.open("/dev/zero", os.O_RDONLY)
+        self.null_fd = os.open("/dev/null", os.O_WRONLY)
+        self.payload = b"M" * self.io_size
+
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(("127.0.0.1", 0))
+        self.address = self.receiver.getsockname()
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sender.setblocking(False)
+        self.datagram = self.payload[:MAX_DATAGRAM]
+        self.connector = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+        self.handlers = {
+            "openat": self.op_openat, "read": self.op_read, "write": self.op_write,
+            "close": self.op_close, "stat": self.op_stat, "mmap": self.op_mmap,
+            "connect": self.op_connect, "sendto": self.op_sendto, "clone": self.op_clone,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        while self.open_fds:
+            os.close(self.open_fds.popleft())
+        for fd in (self.zero_fd, self.null_fd):
+            os.close(fd)
+        for sock in (self.receiver, self.sender, self.connector):
+            sock.close()
+        self.scratch.cleanup()
+
+    # ── ops (one call each; False = nothing to do) ──
+
+    def _scratch_path(self):
+        path = self.paths[self.next_path]
+        self.next_path = (self.next_path + 1) % len(self.paths)
+        return path
+
+    def op_openat(self):
+        if len(self.open_fds) >= self.max_open:
+            os.close(self.open_fds.popleft())
+        self.open_fds.append(os.open(self._scratch_path(), os.O_RDONLY))
+
+    def op_read(self):
+        os.read(self.zero_fd, self.io_size)
+
+    def op_write(self):
+        os.write(self.null_fd, self.payload)
+
+    def op_close(self):
+        if not self.open_fds:
+            return False
+        os.close(self.open_fds.popleft())
+
+    def op_stat(self):
+        os.stat(self._scratch_path())
+
+    def op_mmap(self):
+        region = mmap.mmap(-1, self.io_size)
+        region[0] = 1
+        region.close()
+
+    def op_connect(self):
+        self.connector.connect(self.address)
+
+    def op_sendto(self):
+        try:
+            self.sender.sendto(self.datagram, self.address)
+        except BlockingIOError:
+            pass        # receiver queue full: the datagram is dropped, the syscall still ran
+
+    def op_clone(self):
+        pid = os.fork()
+        if pid == 0:
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+    # ── timed loop ──
+
+    def run(self, iterations, rate=None):
+        """
+        Issue iterations ops of the mix; rate (ops/sec) overrides the profile's.
+
+        Latency runs from each op's intended start when paced, from its
+        actual start otherwise; per-op histograms hold service time.
+        """
+        rate = rate if rate is not None else self.profile.get("rate")
+        interval_ns = 1e9 / rate if rate else 0
+        handlers = self.handlers
+        sequence = self.sequence
+        mask = SEQUENCE_LENGTH - 1
+        latencies = LatencyHistogram()
+        per_op = {op: LatencyHistogram() for op in self.profile["mix"]}
+        skipped = 0
+
+        start = time.perf_counter_ns()
+        for i in range(iterations):
+            op = sequence[i & mask]
+            if interval_ns:
+                intended = start + int(i * interval_ns)
+                while time.perf_counter_ns() < intended:
+                    pass
+            began = time.perf_counter_ns()
+            if handlers[op]() is False:
+                skipped += 1
+                continue
+            end = time.perf_counter_ns()
+            latencies.record(end - (intended if interval_ns else began))
+            per_op[op].record(end - began)
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+
+        stats = latencies.summary()
+        return {
+            "test": f"mix_{self.profile['name']}",
+            "profile": self.profile["name"],
+            "iterations": iterations,
+            "skipped": skipped,
+            "target_rate": rate,
+            "total_time_sec": elapsed,
+            "ops_per_sec": (iterations - skipped) / elapsed,
+            "mean_us": stats["mean"],
+            "p50_us": stats["p50"],
+            "p99_us": stats["p99"],
+            "p999_us": stats["p999"],
+            "max_us": stats["max"],
+            "ops": {op: {"count": h.count, **{f"{k}_us": v for k, v in h.summary().items()
+                                              if k in ("mean", "p99")}}
+                    for op, h in per_op.items() if h.count},
+            "histogram": latencies.to_dict(),
+        }
+
+
+def run_profile(name_or_path, iterations, rate=None, seed=0):
+    """Load a profile, run it once and clean up; returns the result dict."""
+    with SyscallMix(load_profile(name_or_path), seed) as mix:
+        return mix.run(iterations, rate)
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COMMAND LINE
+# ═══════════════════════════════════════════════════════════════
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    cmd = sys.argv[1].lower()
+
+    if cmd == "list":
+        for name, profile in PROFILES.items():
+            mix = ", ".join(f"{op} {w}" for op, w in profile["mix"].items())
+            print(f"  {name:<13} {profile['description']}")
+            print(f"  {'':<13} io_size {profile['io_size']:,} B │ {mix}")
+    elif cmd == "run" and len(sys.argv) > 2:
+        iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+        rate = float(sys.argv[4]) if len(sys.argv) > 4 else None
+        try:
+            result = run_profile(sys.argv[2], iterations, rate)
+        except ProfileError as e:
+            print(f"[!] {e}")
+            sys.exit(1)
+        pace = f"{result['target_rate']:,.0f} ops/sec target" if result["target_rate"] else "as fast as possible"
+        print(f"  Profile:       {result['profile']} ({iterations:,} ops, {pace})")
+        print(f"  Throughput:    {result['ops_per_sec']:,.0f} ops/sec")
+        print(f"  P99 latency:   {result['p99_us']:.2f} μs")
+        print()
+        print(f"  {'Op':<8} │ {'Count':>7} │ {'Mean':>10} │ {'P99':>10}")
+        print(f"  {'─'*8}─┼─{'─'*7}─┼─{'─'*10}─┼─{'─'*10}")
+        for op, s in result["ops"].items():
+            print(f"  {op:<8} │ {s['count']:>7,} │ {s['mean_us']:>7.2f} μs │ {s['p99_us']:>7.2f} μs")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Trace Pipeline - Constant-memory streaming analysis of huge syscall traces
+===========================================================================
+Forensics runs the brain over day-long captures that do not fit in memory.
+Every stage here is a generator, so events are pulled through one at a time
+(or one chunk at a time) and nothing grows with the size of the trace:
+
+    read      TraceReader.raw(), mmap pages dropped behind the cursor
+    decode    verb id → name, path bytes → str
+    classify  SemanticMapper.classify, in-line or in a process pool
+    detect    ExfiltrationDetector.process_event
+    emit      (index, pid, reason) for every alert
+
+Bounded buffers:
+    In-line, at most one event is in flight between stages. The parallel
+    classify stage cuts the stream into chunks of `chunk` events and keeps
+    at most `max_pending` chunks in the pool; results are reassembled in
+    stream order, which also keeps every PID's events in order for the
+    detector. multiprocessing.Pool.imap() is not used because its feeder
+    thread consumes the whole input up front.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/)
+    (together with trace_replay.py, wire_format.py, event_types.py and
+    latency_histogram.py).
+
+    python3 scripts/trace_pipeline.py                 # 100M synthetic events
+    python3 scripts/trace_pipeline.py 10000000 4      # 10M events, 4 classify workers
+
+    for index, pid, reason in analyze("capture.trace", SemanticMapper, ExfiltrationDetector()):
+        print(index, pid, reason)
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from collections import deque
+from itertools import islice
+
+from trace_replay import TraceReader, TraceWriter, load_brain
+
+RELEASE_BEHIND = 16 << 20    # drop mapped trace pages every 16 MB read
+
+
+# ═══════════════════════════════════════════════════════════════
+#  STAGES
+# ═══════════════════════════════════════════════════════════════
+
+def read_stage(trace, release_behind=RELEASE_BEHIND):
+    return trace.raw(release_behind)
+
+
+def decode_stage(records, verbs):
+    """(pid, verb, fd, ret, path) with names and str paths."""
+    for _, pid, verb, fd, ret, path in records:
+        yield pid, verbs[verb], fd, ret, str(path, "utf-8", "surrogateescape")
+
+
+def classify_stage(events, mapper):
+    """(pid, verb, args, concept), classified in-line."""
+    classify = mapper.classify
+    for pid, verb, fd, ret, path in events:
+        yield pid, verb, {"fd": str(fd), "ret": str(ret)}, classify(path) if path else ""
+
+
+_worker_mapper = None
+
+
+def _start_classifier(mapper_factory):
+    global _worker_mapper
+    _worker_mapper = mapper_factory()
+
+
+def _classify_paths(paths):
+    classify = _worker_mapper.classify
+    return [classify(path) if path else "" for path in paths]
+
+
+def parallel_classify_stage(events, mapper_factory, workers, chunk=4096, max_pending=None):
+    """
+    classify_stage() with the mapper calls spread over a process pool.
+
+    Only the paths cross to the workers; at most max_pending chunks
+    (default 2 per worker) are outstanding at any time.
+    """
+    max_pending = max_pending or 2 * workers
+    pending = deque()
+    ctx = multiprocessing.get_context("fork")
+    with ctx.Pool(workers, initializer=_start_classifier, initargs=(mapper_factory,)) as pool:
+        events = iter(events)
+        while True:
+            batch = list(islice(events, chunk))
+            if batch:
+                pending.append((batch, pool.apply_async(_classify_paths, ([e[4] for e in batch],))))
+            if pending and (len(pending) >= max_pending or not batch):
+                batch_done, result = pending.popleft()
+                for (pid, verb, fd, ret, _), concept in zip(batch_done, result.get()):
+                    yield pid, verb, {"fd": str(fd), "ret": str(ret)}, concept
+            elif not batch:
+                return
+
+
+def detect_stage(events, detector):
+    """(index, pid, reason) for every event the detector alerts on."""
+    process_event = detector.process_event
+    for index, (pid, verb, args, concept) in enumerate(events):
+        verdict = process_event(pid, verb, args, concept)
+        if verdict and verdict.alert:
+            yield index, pid, getattr(verdict, "reason", "")
+
+
+def analyze(trace_path, mapper_factory, detector, workers=0, chunk=4096, tap=None):
+    """
+    Stream a trace file through the whole pipeline, yielding alerts.
+
+    mapper_factory builds the SemanticMapper (once in-line, once per pool
+    worker). tap, if given, wraps the decoded event stream - handy for
+    progress reporting without touching the stages.
+
+    Every stage is closed, outermost first, before the reader is: a stage
+    suspended mid-trace still holds a view of the mapped file, and
+    closing the map under it raises BufferError.
+    """
+    with TraceReader(trace_path) as trace:
+        stages = [read_stage(trace)]
+        try:
+            stages.append(decode_stage(stages[-1], trace.verbs))
+            if tap is not None:
+                stages.append(tap(stages[-1]))
+            if workers:
+                stages.append(parallel_classify_stage(stages[-1], mapper_factory, workers, chunk))
+            else:
+                stages.append(classify_stage(stages[-1], mapper_factory()))
+            stages.append(detect_stage(stages[-1], detector))
+            yield from stages[-1]
+        finally:
+            for stage in reversed(stages):
+                close = getattr(stage, "close", None)
+                if close is not None:
+                    close()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BENCHMARK
+# ═══════════════════════════════════════════════════════════════
+
+def rss_kb():
+    """(current RSS, peak RSS) of this process in KB, from /proc/self/status."""
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                fields[key] = int(value.split()[0])
+    return fields["VmRSS"], fields["VmHWM"]
+
+
+def write_synthetic_trace(path, events, seed=1337):
+    """Burst-storm mix with 1% complete exfil chains, 10 μs apart."""
+    verbs = ["open", "read", "write", "close", "socket", "connect", "sendto", "recvfrom"]
+    paths = ["/etc/passwd", "/home/user/.ssh/id_rsa", "/tmp/test", "/dev/null"]
+    chain = [("open", "/home/user/.ssh/id_rsa"), ("read", ""), ("socket", ""),
+             ("connect", ""), ("sendto", "")]
+    rng = random.Random(seed)
+    # pre-drawn noise so generation is not dominated by the RNG
+    noise = [(rng.randint(1000, 9999), rng.choice(verbs), rng.choice(paths)) for _ in range(65536)]
+    with TraceWriter(path) as trace:
+        record = trace.record
+        n = 0
+        while n < events:
+            if n % 100 == 0:
+                pid = 20000 + (n // 100) % 10000
+                for verb, target in chain[:events - n]:
+                    record(pid, verb, 3, 0, target, n * 10_000)
+                    n += 1
+            else:
+                pid, verb, target = noise[n & 0xFFFF]
+                record(pid, verb, 3, 0, target, n * 10_000)
+                n += 1
+
+
+def benchmark_pipeline(trace_path, events, mapper_factory, detector_factory, workers=0, samples=10):
+    """Run the pipeline once; returns throughput, alert count and RSS samples."""
+    every = max(events // samples, 1)
+    rss_samples = []
+
+    def sample_rss(stream):
+        for n, event in enumerate(stream, 1):
+            if n % every == 0:
+                rss_samples.append((n, rss_kb()[0]))
+            yield event
+
+    start = time.perf_counter()
+    alerts = sum(1 for _ in analyze(trace_path, mapper_factory, detector_factory(),
+                                    workers, tap=sample_rss))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "workers": workers,
+        "events": events,
+        "events_per_sec": events / elapsed,
+        "elapsed_sec": elapsed,
+        "alerts": alerts,
+        "rss_samples_kb": rss_samples,
+        "peak_rss_kb": rss_kb()[1],
+        "children_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    }
+
+
+def main():
+    print("╔══════════════════════════════════════════════════════════════╗")
+    print("║           STREAMING TRACE PIPELINE BENCHMARK                ║")
+    print("╚══════════════════════════════════════════════════════════════╝")
+    print()
+
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    mapper_cls, detector_cls = load_brain()
+
+    tmpdir = tempfile.mkdtemp(prefix="sentinel_pipeline_")
+    trace_path = os.path.join(tmpdir, "synthetic.trace")
+    try:
+        print(f"[*] Writing synthetic trace ({events:,} events)...")
+        start = time.perf_counter()
+        write_synthetic_trace(trace_path, events)
+        size = os.path.getsize(trace_path)
+        print(f"  {size / 2**30:.2f} GB in {time.perf_counter() - start:.1f}s")
+
+        _, baseline_hwm = rss_kb()
+        mode = f"{workers} classify workers" if workers else "in-line classify"
+        print(f"\n[*] Streaming read → decode → classify → detect ({mode})...")
+        result = benchmark_pipeline(trace_path, events, mapper_cls, detector_cls, workers)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+    rss = [kb for _, kb in result["rss_samples_kb"]]
+    print(f"  Events:        {result['events']:,} in {result['elapsed_sec']:.1f}s")
+    print(f"  Throughput:    {result['events_per_sec']:,.0f} events/sec")
+    print(f"  Alerts:        {result['alerts']:,}")
+    print(f"  RSS over run:  {min(rss) / 1024:.1f} → {max(rss) / 1024:.1f} MB "
+          f"({len(rss)} samples, trace is {size / 2**20:,.0f} MB)")
+    print(f"  Peak RSS:      {result['peak_rss_kb'] / 1024:.1f} MB "
+          f"(before pipeline: {baseline_hwm / 1024:.1f} MB)")
+    if workers:
+        print(f"  Worker peak:   {result['children_peak_rss_kb'] / 1024:.1f} MB")
+
+    print("\n" + "="*60)
+    print("SUMMARY FOR DOSSIER:")
+    print(f"  {'Progress':>12} │ {'RSS':>10}")
+    print(f"  {'─'*12}─┼─{'─'*10}")
+    for n, kb in result["rss_samples_kb"]:
+        print(f"  {n:>12,} │ {kb / 1024:>7.1f} MB")
+    print("="*60)
+
+    result["trace_bytes"] = size
+    with open("trace_pipeline_results.json", "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n[+] Results saved to trace_pipeline_results.json")
+
+
+if __name__ == "__main__":
+    main()
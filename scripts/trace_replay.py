@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Trace Replay - Record a syscall workload once, replay it against any brain
+===========================================================================
+The stress tests synthesize events with random.choice() inside the timed
+loop, so RNG cost is measured with the brain and no two runs see the same
+workload. A trace file fixes both: capture a real workload once (a kernel
+build, a ransomware sample run), then replay it deterministically against
+every brain version, at full speed or with the original timing.
+
+File layout (little-endian):
+
+    0    header     magic "SNTRACE\\0", version u16, flags u16, reserved u32,
+                    start_ns u64 (wall clock), records u64, verb_table u64
+    40   records    back to back: delta_ns u64 + one wire_format message
+                    (version, flags, verb, pid, ret, fd, path_len, path)
+    ...  verb table newline-separated verb names, index = verb id
+
+Each record is 32 bytes plus the raw path bytes, so paths survive exactly
+as the interceptor saw them. Verb ids are the event_types ones; the table
+at the end maps them back to names, so verbs interned at record time
+(not built in) still replay under the right name.
+
+The reader mmaps the file and decodes records in place; nothing is loaded
+up front, so traces larger than RAM replay fine.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    python3 scripts/trace_replay.py import-strace build.strace build.trace
+    python3 scripts/trace_replay.py info build.trace
+    python3 scripts/trace_replay.py replay build.trace [speed]
+
+    with TraceWriter("run.trace") as trace:
+        trace.record(1234, "open", 3, 0, "/etc/passwd")
+    result = replay(TraceReader("run.trace"), SemanticMapper(), ExfiltrationDetector())
+
+strace capture (-f pid prefix, -ttt timestamps, full strings):
+    strace -f -ttt -s 4096 -o build.strace make -j8
+"""
+
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+
+import wire_format
+from event_types import VERB_NAMES, verb_id
+from latency_histogram import LatencyHistogram
+
+TRACE_MAGIC = b"SNTRACE\0"
+TRACE_VERSION = 1
+
+HEADER = struct.Struct("<8sHHIQQQ")    # magic, version, flags, reserved, start_ns, records, verb_table
+TIMESTAMP = struct.Struct("<Q")         # ns since start_ns
+
+
+class TraceError(ValueError):
+    """Not a trace file, or a truncated / corrupt one."""
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RECORDER
+# ═══════════════════════════════════════════════════════════════
+
+class TraceWriter:
+    """Append-only trace recorder; the header is finalized by close()."""
+
+    def __init__(self, path, start_ns=None):
+        self.path = path
+        self.start_ns = time.time_ns() if start_ns is None else start_ns
+        self._clock_origin = time.perf_counter_ns()
+        self.records = 0
+        self._max_verb = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, 0, self.start_ns, 0, 0))
+
+    def record(self, pid, verb, fd=-1, ret=0, path=b"", timestamp_ns=None):
+        """
+        Append one event. verb is a name or an event_types id.
+
+        timestamp_ns is nanoseconds since the start of the trace; by default
+        the time elapsed since the writer was opened.
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.perf_counter_ns() - self._clock_origin
+        if isinstance(verb, str):
+            verb = verb_id(verb)
+        self._max_verb = max(self._max_verb, verb)
+        self._file.write(TIMESTAMP.pack(timestamp_ns) + wire_format.encode(verb, pid, fd, ret, path))
+        self.records += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        table_offset = self._file.tell()
+        self._file.write("\n".join(VERB_NAMES[:self._max_verb + 1]).encode())
+        self._file.seek(0)
+        self._file.write(HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, 0, self.start_ns,
+                                     self.records, table_offset))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  READER
+# ═══════════════════════════════════════════════════════════════
+
+class TraceReader:
+    """mmap-backed trace; iterate for (timestamp_ns, pid, verb, fd, ret, path)."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            raise TraceError(f"{path}: too short for a trace header")
+        magic, version, _, _, self.start_ns, self.records, table_offset = HEADER.unpack_from(self._map)
+        if magic != TRACE_MAGIC:
+            raise TraceError(f"{path}: not a Sentinel trace")
+        if version != TRACE_VERSION:
+            raise TraceError(f"{path}: unsupported trace version {version}")
+        if not HEADER.size <= table_offset <= len(self._map):
+            raise TraceError(f"{path}: truncated (recorder not closed?)")
+        self.verbs = self._map[table_offset:].decode().split("\n")
+        self._end = table_offset
+        self.view = memoryview(self._map)
+
+    def __len__(self):
+        return self.records
+
+    def raw(self, release_behind=None):
+        """
+        Records as (timestamp_ns, pid, verb id, fd, ret, path view) - no decoding.
+
+        Mapped file pages count towards RSS once touched. With
+        release_behind=N, every N bytes the pages already read are dropped
+        from the mapping (MADV_DONTNEED), so a multi-gigabyte trace streams
+        in constant memory.
+        """
+        view, end = self.view, self._end
+        unpack_ts = TIMESTAMP.unpack_from
+        decode = wire_format.decode
+        offset = HEADER.size
+        if release_behind:
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+            released = 0
+            next_release = release_behind
+        while offset < end:
+            timestamp_ns, = unpack_ts(view, offset)
+            verb, pid, fd, ret, path, offset = decode(view, offset + TIMESTAMP.size)
+            yield timestamp_ns, pid, verb, fd, ret, path
+            if release_behind and offset >= next_release:
+                upto = offset - offset % mmap.PAGESIZE
+                self._map.madvise(mmap.MADV_DONTNEED, released, upto - released)
+                released = upto
+                next_release = offset + release_behind
+
+    def __iter__(self):
+        """Records with the verb as its name and the path as a str."""
+        verbs = self.verbs
+        decode_path = wire_format.decode_path
+        for timestamp_ns, pid, verb, fd, ret, path in self.raw():
+            yield timestamp_ns, pid, verbs[verb], fd, ret, decode_path(path)
+
+    def duration_ns(self):
+        last = 0
+        for last, *_ in self.raw():
+            pass
+        return last
+
+    def close(self):
+        self.view.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ═══════════════════════════════════════════════════════════════
+#  REPLAY
+# ═══════════════════════════════════════════════════════════════
+
+def replay(trace, mapper, detector, speed=None, limit=None):
+    """
+    Feed a trace through mapper.classify + detector.process_event.
+
+    speed=None replays at full speed; speed=1.0 keeps the recorded timing
+    (2.0 twice as fast, ...). Per-event decision latency is timed around
+    the brain calls only, so decoding and pacing are not counted. With
+    timing, lateness is how far behind schedule each event was delivered.
+    """
+    latencies = LatencyHistogram()
+    lateness = LatencyHistogram()
+    alerts = []
+    events = 0
+    classify = mapper.classify
+    process_event = detector.process_event
+
+    start = time.perf_counter_ns()
+    for timestamp_ns, pid, verb, fd, ret, path in trace:
+        if speed is not None:
+            due = start + int(timestamp_ns / speed)
+            now = time.perf_counter_ns()
+            if due - now > 200_000:
+                time.sleep((due - now - 100_000) / 1e9)
+            while time.perf_counter_ns() < due:
+                pass
+            lateness.record(time.perf_counter_ns() - due)
+        args = {"fd": str(fd), "ret": str(ret)}
+
+        event_start = time.perf_counter_ns()
+        concept = classify(path) if path else ""
+        verdict = process_event(pid, verb, args, concept)
+        latencies.record(time.perf_counter_ns() - event_start)
+
+        if verdict and verdict.alert:
+            alerts.append((events, pid, getattr(verdict, "reason", "")))
+        events += 1
+        if events == limit:
+            break
+    elapsed_ns = time.perf_counter_ns() - start
+
+    return {
+        "events": events,
+        "alerts": alerts,
+        "elapsed_sec": elapsed_ns / 1e9,
+        "events_per_sec": events / (elapsed_ns / 1e9) if elapsed_ns else 0.0,
+        "latency": latencies,
+        "lateness": lateness if speed is not None else None,
+    }
+
+
+# ═══════════════════════════════════════════════════════════════
+#  STRACE IMPORT
+# ═══════════════════════════════════════════════════════════════
+
+# 1234  1700000000.123456 openat(AT_FDCWD, "/etc/passwd", O_RDONLY|O_CLOEXEC) = 3
+STRACE_LINE = re.compile(rb'^(?:\[pid\s+)?(\d+)\]?\s+(\d+\.\d+)\s+(\w+)\((.*)\)\s+=\s+(-?\d+|\?)')
+STRACE_STRING = re.compile(rb'"((?:[^"\\]|\\.)*)"')
+# verb -> index of its path argument; every other syscall's strings are data
+# (read/write/sendto buffers) and are not imported. The arguments before the
+# path are plain numbers / constants, so a comma split finds it.
+STRACE_PATH_ARGS = {
+    b"open": 0, b"creat": 0, b"openat": 1, b"execve": 0, b"execveat": 1,
+    b"stat": 0, b"lstat": 0, b"newfstatat": 1, b"statx": 1,
+    b"access": 0, b"faccessat": 1, b"faccessat2": 1, b"readlink": 0, b"readlinkat": 1,
+    b"unlink": 0, b"unlinkat": 1, b"rename": 0, b"renameat": 1, b"renameat2": 1,
+    b"link": 0, b"linkat": 1,
+    b"chmod": 0, b"fchmodat": 1, b"chown": 0, b"lchown": 0, b"fchownat": 1,
+    b"mkdir": 0, b"mkdirat": 1, b"rmdir": 0, b"chdir": 0, b"truncate": 0,
+    b"mknod": 0, b"mknodat": 1,
+}
+_STRACE_ESCAPES = re.compile(rb'\\(x[0-9a-fA-F]{2}|[0-7]{1,3}|.)')
+_SIMPLE_ESCAPES = {b"n": b"\n", b"t": b"\t", b"r": b"\r", b"v": b"\v", b"f": b"\f",
+                   b'"': b'"', b"\\": b"\\"}
+
+
+def _unescape(text):
+    def replace(match):
+        esc = match.group(1)
+        if esc[:1] == b"x":
+            return bytes([int(esc[1:], 16)])
+        if esc[:1].isdigit():
+            return bytes([int(esc, 8) & 0xFF])
+        return _SIMPLE_ESCAPES.get(esc, esc)
+    return _STRACE_ESCAPES.sub(replace, text)
+
+
+def import_strace(lines, writer):
+    """
+    Convert `strace -f -ttt -s 4096` output into trace records.
+
+    The path is taken only for the syscalls in STRACE_PATH_ARGS; fd is the
+    first argument when it is a plain number. Unfinished / resumed pairs
+    and signals are skipped.
+    Returns the number of records written.
+    """
+    origin = None
+    written = 0
+    for line in lines:
+        match = STRACE_LINE.match(line)
+        if match is None:
+            continue
+        pid, stamp, verb, arguments, ret = match.groups()
+        seconds, fraction = stamp.split(b".")
+        # integers all the way: a float loses sub-microsecond digits of epoch times
+        stamp_ns = int(seconds) * 1_000_000_000 + int(fraction[:9].ljust(9, b"0"))
+        if origin is None:
+            origin = stamp_ns
+        path = b""
+        index = STRACE_PATH_ARGS.get(verb)
+        if index is not None:
+            fields = arguments.split(b",", index)
+            string = STRACE_STRING.match(fields[index].lstrip()) if len(fields) > index else None
+            if string:
+                path = _unescape(string.group(1))
+        first = arguments.split(b",", 1)[0].strip()
+        writer.record(int(pid), verb.decode(), int(first) if first.isdigit() else -1,
+                      0 if ret == b"?" else int(ret), path, timestamp_ns=stamp_ns - origin)
+        written += 1
+    return written
+
+
+# ═══════════════════════════════════════════════════════════════
+#  COMMAND LINE
+# ═══════════════════════════════════════════════════════════════
+
+def load_brain():
+    """The SemanticMapper and ExfiltrationDetector classes from sentinel-runtime's src/analysis."""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'analysis'))
+    try:
+        from semantic import SemanticMapper
+        from state_machine import ExfiltrationDetector
+    except ImportError:
+        print(f"[!] Run this from sentinel-runtime root: python3 scripts/{os.path.basename(sys.argv[0])}")
+        sys.exit(1)
+    return SemanticMapper, ExfiltrationDetector
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return
+
+    cmd, path = sys.argv[1].lower(), sys.argv[2]
+
+    if cmd == "import-strace" and len(sys.argv) == 4:
+        with open(path, "rb") as f, TraceWriter(sys.argv[3]) as writer:
+            count = import_strace(f, writer)
+        print(f"[+] {count:,} syscalls written to {sys.argv[3]}")
+    elif cmd == "info":
+        with TraceReader(path) as trace:
+            print(f"  Records:   {len(trace):,}")
+            print(f"  Duration:  {trace.duration_ns() / 1e9:.3f} s")
+            print(f"  Recorded:  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(trace.start_ns / 1e9))}")
+            print(f"  Size:      {os.path.getsize(path) / 1024:.1f} KB")
+    elif cmd == "replay":
+        speed = float(sys.argv[3]) if len(sys.argv) > 3 else None
+        mapper_cls, detector_cls = load_brain()
+        with TraceReader(path) as trace:
+            result = replay(trace, mapper_cls(), detector_cls(), speed)
+        stats = result["latency"].summary()
+        print(f"  Events:        {result['events']:,} in {result['elapsed_sec']:.2f}s "
+              f"({'full speed' if speed is None else f'{speed:g}x recorded timing'})")
+        print(f"  Throughput:    {result['events_per_sec']:,.0f} events/sec")
+        print(f"  Alerts:        {len(result['alerts']):,}")
+        print(f"  Mean latency:  {stats['mean']:.2f} μs")
+        print(f"  P99 latency:   {stats['p99']:.2f} μs")
+        if result["lateness"] is not None:
+            print(f"  P99 lateness:  {result['lateness'].summary()['p99']:.2f} μs behind schedule")
+    else:
+        print(__doc__)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+UDP Batch - Batched, multi-socket UDP loopback load with sendmmsg/recvmmsg
+===========================================================================
+benchmark_network_loopback in head_to_head.py sends one datagram per
+sendto() and blocks in recvfrom() for it, so it measures Python's syscall
+latency (~50K PPS) long before any packet filter cost shows. This drives
+loopback at packet rates where per-packet cost matters:
+
+    batching     sendmmsg() / recvmmsg() move up to `batch` datagrams per
+                 syscall (ctypes; Linux only)
+    pairs        N sender → receiver socket pairs, one process each. All
+                 receivers share one port through SO_REUSEPORT; each is
+                 connect()ed to its sender, so the kernel hands every flow
+                 to its own receiver instead of hashing them across the
+                 group
+    sizes        packet-size sweeps, reported as PPS and Gbps of UDP payload
+
+Every datagram carries its send time (perf_counter_ns, first 8 bytes), so
+the latency distribution includes the time a packet waits for the rest of
+its batch. A pair sends one batch, then drains it (closed loop); datagrams
+not back within RECV_TIMEOUT_SEC count as lost, and the wait for them is
+left out of the throughput time.
+
+A batch only fits if the receive queue can hold it. The kernel silently
+caps SO_RCVBUF at net.core.rmem_max (212992 on a stock kernel) and charges
+each datagram its buffer's true size, not its payload, so every pair reads
+back its real SO_RCVBUF and shrinks the batch to what it holds (the batch
+column shows the size actually used).
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    python3 scripts/udp_batch.py                          # default sweep
+    python3 scripts/udp_batch.py --pairs 4 --batch 64 --duration 2 64 1472 8192
+
+    run_udp(packet_size=1024, batch=64, pairs=4, duration_sec=1.0)
+    run_udp(packet_size=64, packets=200000)               # fixed count per pair
+"""
+
+import argparse
+import ctypes
+import json
+import os
+import socket
+import struct
+import sys
+import time
+import traceback
+
+from latency_histogram import LatencyHistogram
+
+PACKET_SIZES = (64, 256, 1024, 1472, 8192)
+DEFAULT_BATCH = 64
+MAX_BATCH = 1024                   # UIO_MAXIOV
+RECV_TIMEOUT_SEC = 0.005           # loopback delivers within sendmmsg(); longer is loss
+SOCKET_BUFFER = 4 * 1024 * 1024    # asked for; the kernel caps it at rmem_max / wmem_max
+SKB_HEADROOM = 320                 # headers + skb_shared_info in a datagram's allocation
+SKB_OVERHEAD = 512                 # struct sk_buff, charged on top
+MSG_WAITFORONE = 0x10000
+SO_REUSEPORT = getattr(socket, "SO_REUSEPORT", 15)
+
+STAMP = struct.Struct("Q")
+
+
+# ═══════════════════════════════════════════════════════════════
+#  sendmmsg / recvmmsg (ctypes)
+# ═══════════════════════════════════════════════════════════════
+
+class IoVec(ctypes.Structure):
+    _fields_ = [("base", ctypes.c_void_p), ("len", ctypes.c_size_t)]
+
+
+class MsgHdr(ctypes.Structure):
+    _fields_ = [("name", ctypes.c_void_p), ("namelen", ctypes.c_uint32),
+                ("iov", ctypes.POINTER(IoVec)), ("iovlen", ctypes.c_size_t),
+                ("control", ctypes.c_void_p), ("controllen", ctypes.c_size_t),
+                ("flags", ctypes.c_int)]
+
+
+class MMsgHdr(ctypes.Structure):
+    _fields_ = [("hdr", MsgHdr), ("len", ctypes.c_uint)]
+
+
+_libc = ctypes.CDLL(None, use_errno=True)
+if not all(hasattr(_libc, name) for name in ("sendmmsg", "recvmmsg")):
+    raise ImportError("udp_batch needs sendmmsg() / recvmmsg() (Linux)")
+_libc.sendmmsg.restype = ctypes.c_int
+_libc.sendmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+_libc.recvmmsg.restype = ctypes.c_int
+_libc.recvmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+
+
+class MessageVector:
+    """`batch` mmsghdr entries of `size` bytes each, over one contiguous buffer (or one shared slot)."""
+
+    def __init__(self, batch, size, shared=False):
+        self.buffer = ctypes.create_string_buffer(size if shared else size * batch)
+        self.iovs = (IoVec * batch)()
+        self.msgs = (MMsgHdr * batch)()
+        base = ctypes.addressof(self.buffer)
+        for i in range(batch):
+            self.iovs[i].base = base if shared else base + i * size
+            self.iovs[i].len = size
+            self.msgs[i].hdr.iov = ctypes.pointer(self.iovs[i])
+            self.msgs[i].hdr.iovlen = 1
+        self.address = ctypes.addressof(self.msgs)
+
+
+def _check(result):
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════
+#  ONE PAIR (runs in its own process)
+# ═══════════════════════════════════════════════════════════════
+
+def open_pair(port):
+    """(sender, receiver): receiver on the shared REUSEPORT port, connected to the sender."""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, SO_REUSEPORT, 1)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVTIMEO,
+                        struct.pack("ll", 0, int(RECV_TIMEOUT_SEC * 1e6)))
+    receiver.bind(("127.0.0.1", port))
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sender.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER)
+    sender.bind(("127.0.0.1", 0))
+    sender.connect(("127.0.0.1", port))
+    # a connected socket outranks the rest of its reuseport group for its 4-tuple
+    receiver.connect(sender.getsockname())
+    return sender, receiver
+
+
+def datagram_truesize(packet_size):
+    """Receive-buffer charge for one datagram: its power-of-two allocation plus the sk_buff."""
+    return (1 << (packet_size + SKB_HEADROOM - 1).bit_length()) + SKB_OVERHEAD
+
+
+def fitting_batch(receiver, packet_size, batch):
+    """batch, shrunk so one whole batch fits the receiver's real (capped) SO_RCVBUF."""
+    rcvbuf = receiver.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+    return max(1, min(batch, rcvbuf // datagram_truesize(packet_size)))
+
+
+def run_pair(sender, receiver, packet_size, batch, duration_sec=None, packets=None):
+    """
+    Closed-loop batches until duration_sec or `packets` sent; returns the pair's counters.
+
+    batch is first shrunk to fit the receive buffer. stalled_ns is the time
+    spent in receive timeouts waiting for lost datagrams.
+    """
+    batch = fitting_batch(receiver, packet_size, batch)
+    send = MessageVector(batch, packet_size, shared=True)
+    recv = MessageVector(batch, packet_size)
+    send_fd, recv_fd = sender.fileno(), receiver.fileno()
+    sendmmsg, recvmmsg = _libc.sendmmsg, _libc.recvmmsg
+    stamp_into, stamp_from = STAMP.pack_into, STAMP.unpack_from
+    recv_buffer = recv.buffer
+    latencies = LatencyHistogram()
+    sent = received = syscalls = stalled_ns = 0
+
+    start = time.perf_counter_ns()
+    deadline = start + int(duration_sec * 1e9) if duration_sec else None
+    while True:
+        if packets is not None and sent >= packets:
+            break
+        if deadline is not None and time.perf_counter_ns() >= deadline:
+            break
+        # one buffer backs every message of the batch: one stamp per sendmmsg()
+        stamp_into(send.buffer, 0, time.perf_counter_ns())
+        n = _check(sendmmsg(send_fd, send.address, batch, 0))
+        sent += n
+        syscalls += 1
+        pending = n
+        while pending:
+            before = time.perf_counter_ns()
+            got = recvmmsg(recv_fd, recv.address, pending, MSG_WAITFORONE, None)
+            syscalls += 1
+            now = time.perf_counter_ns()
+            if got < 0:
+                stalled_ns += now - before
+                break           # SO_RCVTIMEO expired: the rest of the batch is lost
+            for i in range(got):
+                latencies.record(now - stamp_from(recv_buffer, i * packet_size)[0])
+            received += got
+            pending -= got
+    elapsed_ns = time.perf_counter_ns() - start
+
+    return {"batch": batch, "sent": sent, "received": received, "syscalls": syscalls,
+            "elapsed_ns": elapsed_ns, "stalled_ns": stalled_ns, "histogram": latencies.to_dict()}
+
+
+# ═══════════════════════════════════════════════════════════════
+#  RUNNER
+# ═══════════════════════════════════════════════════════════════
+
+def run_udp(packet_size=1024, batch=DEFAULT_BATCH, pairs=1, duration_sec=1.0, packets=None):
+    """
+    Drive `pairs` sender/receiver processes at once; aggregate PPS, Gbps, latency.
+
+    With packets every pair sends that many datagrams (rounded up to whole
+    batches) and duration_sec is ignored.
+    """
+    if not 8 <= packet_size <= 65507:
+        raise ValueError(f"packet_size {packet_size} outside 8 .. 65507 bytes")
+    batch = max(1, min(batch, MAX_BATCH))
+    if packets is not None:
+        duration_sec = None
+
+    # hold the port while the pairs bind to it
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    probe.setsockopt(socket.SOL_SOCKET, SO_REUSEPORT, 1)
+    probe.bind(("127.0.0.1", 0))
+    port = probe.getsockname()[1]
+
+    ready_r, ready_w = os.pipe()
+    release_r, release_w = os.pipe()
+    children = []
+    for _ in range(pairs):
+        result_r, result_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                for fd in (ready_r, release_w, result_r):
+                    os.close(fd)
+                # closed before waiting for release: a pair still holding
+                # it would keep the parent from seeing one that failed here
+                try:
+                    sender, receiver = open_pair(port)
+                    os.write(ready_w, b"r")
+                finally:
+                    os.close(ready_w)
+                if not os.read(release_r, 1):
+                    os._exit(1)         # EOF, not a release: another pair failed
+                result = run_pair(sender, receiver, packet_size, batch, duration_sec, packets)
+                result["finished_ns"] = time.perf_counter_ns()
+                with os.fdopen(result_w, "w") as f:
+                    json.dump(result, f)
+                status = 0
+            except Exception:
+                traceback.print_exc()
+                sys.stderr.flush()      # os._exit() skips it
+            finally:
+                os._exit(status)
+        os.close(result_w)
+        children.append((pid, result_r))
+    for fd in (ready_w, release_r):
+        os.close(fd)
+    ready = 0
+    while ready < pairs:
+        chunk = os.read(ready_r, pairs)
+        if not chunk:
+            break
+        ready += len(chunk)
+    os.close(ready_r)
+    probe.close()
+    if ready < pairs:
+        os.close(release_w)
+        for pid, result_r in children:
+            os.waitpid(pid, 0)
+            os.close(result_r)
+        raise RuntimeError(f"{pairs - ready} of {pairs} UDP pairs could not open their sockets")
+    released = time.perf_counter_ns()
+    os.write(release_w, b"x" * pairs)
+    os.close(release_w)
+
+    results = []
+    for pid, result_r in children:
+        with os.fdopen(result_r) as f:
+            data = f.read()
+        os.waitpid(pid, 0)
+        if data:
+            results.append(json.loads(data))
+    if len(results) < pairs:
+        raise RuntimeError(f"{pairs - len(results)} of {pairs} UDP pairs failed")
+
+    latencies = LatencyHistogram()
+    for r in results:
+        latencies.merge(LatencyHistogram.from_dict(r["histogram"]))
+    # each pair's end moved up by its own timeout waits
+    wall_sec = (max(r["finished_ns"] - r["stalled_ns"] for r in results) - released) / 1e9
+    sent = sum(r["sent"] for r in results)
+    received = sum(r["received"] for r in results)
+    syscalls = sum(r["syscalls"] for r in results)
+    stats = latencies.summary()
+    return {
+        "test": "network_batched",
+        "packet_size": packet_size,
+        "batch": min(r["batch"] for r in results),
+        "pairs": pairs,
+        "iterations": received,
+        "sent": sent,
+        "loss_pct": (sent - received) / sent * 100 if sent else 0.0,
+        "stalled_sec": sum(r["stalled_ns"] for r in results) / 1e9,
+        "total_time_sec": wall_sec,
+        "pps": received / wall_sec,
+        "gbps": received * packet_size * 8 / wall_sec / 1e9,
+        "packets_per_syscall": (sent + received) / syscalls if syscalls else 0.0,
+        "mean_us": stats["mean"],
+        "p50_us": stats["p50"],
+        "p99_us": stats["p99"],
+        "p999_us": stats["p999"],
+        "max_us": stats["max"],
+        "histogram": latencies.to_dict(),
+    }
+
+
+def sweep(packet_sizes=PACKET_SIZES, batch=DEFAULT_BATCH, pairs=1, duration_sec=1.0):
+    """run_udp() at every packet size."""
+    return [run_udp(size, batch, pairs, duration_sec) for size in packet_sizes]
+
+
+def print_sweep(results):
+    print(f"  {'Size':>6} │ {'Pairs':>5} │ {'Batch':>5} │ {'PPS':>11} │ {'Gbps':>7} │ "
+          f"{'P50':>9} │ {'P99':>9} │ {'Loss':>6}")
+    print(f"  {'─'*6}─┼─{'─'*5}─┼─{'─'*5}─┼─{'─'*11}─┼─{'─'*7}─┼─{'─'*9}─┼─{'─'*9}─┼─{'─'*6}")
+    for r in results:
+        print(f"  {r['packet_size']:>5}B │ {r['pairs']:>5} │ {r['batch']:>5} │ {r['pps']:>11,.0f} │ "
+              f"{r['gbps']:>7.2f} │ {r['p50_us']:>6.1f} μs │ {r['p99_us']:>6.1f} μs │ {r['loss_pct']:>5.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched multi-socket UDP loopback benchmark")
+    parser.add_argument("sizes", nargs="*", type=int, default=list(PACKET_SIZES),
+                        help="packet sizes in bytes (default: %(default)s)")
+    parser.add_argument("--pairs", type=int, default=min(4, os.cpu_count() or 1),
+                        help="sender/receiver socket pairs, one process each (default: %(default)s)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help="datagrams per sendmmsg/recvmmsg (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=1.0,
+                        help="seconds per packet size (default: %(default)s)")
+    options = parser.parse_args()
+
+    print(f"\n[*] UDP loopback sweep: {options.pairs} pair(s), batch {options.batch}, "
+          f"{options.duration:g} s per size\n")
+    print_sweep(sweep(options.sizes, options.batch, options.pairs, options.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Wire Format - Fixed-width binary bridge messages
+=================================================
+A versioned binary layout for interceptor → brain requests, replacing both
+the JSON dicts ({"verb", "path", "pid", "fd", "ret"}) and the colon-text
+SYSCALL:<verb>:<argument> lines. The C side fills one struct; the brain
+reads the fields in place with struct.unpack_from() and gets the path as a
+memoryview slice, so nothing is split, tokenised or copied before the
+classifier needs the path as a str.
+
+Layout (little-endian, naturally aligned, 24-byte header):
+
+    offset  size  field
+    0       1     version       WIRE_VERSION
+    1       1     flags         FLAG_* bits
+    2       2     verb          event_types verb id
+    4       4     pid
+    8       8     ret           signed
+    16      4     fd            signed, -1 if none
+    20      4     path_len      bytes of path that follow
+    24      n     path          raw bytes, not NUL-terminated
+
+Paths are raw bytes end to end: NULs, newlines, colons and invalid UTF-8
+(all legal in Linux paths, all fatal to the text protocol) survive intact.
+decode_path() turns them into a str with surrogateescape, so the original
+bytes can always be recovered.
+
+Usage:
+    Copy next to the benchmark scripts (sentinel-runtime/scripts/).
+
+    wire = encode(VERB_OPEN, 1234, 3, 0, "/etc/passwd")
+    view = memoryview(received)              # decode zero-copy from a view
+    verb, pid, fd, ret, path, end = decode(view)
+    classifier.classify(decode_path(path))
+"""
+
+import struct
+
+WIRE_VERSION = 1
+
+HEADER = struct.Struct("<BBHIqiI")    # version, flags, verb, pid, ret, fd, path_len
+HEADER_SIZE = HEADER.size             # 24
+
+FLAG_PATH_TRUNCATED = 0x01            # interceptor clipped the path to MAX_PATH_LEN
+
+MAX_PATH_LEN = 1 << 20
+
+
+class WireError(ValueError):
+    """Malformed or unsupported bridge message."""
+
+
+def encode(verb, pid, fd, ret, path=b"", flags=0):
+    """One request message; path may be str (UTF-8, surrogateescape) or bytes."""
+    if isinstance(path, str):
+        path = path.encode("utf-8", "surrogateescape")
+    if len(path) > MAX_PATH_LEN:
+        path = path[:MAX_PATH_LEN]
+        flags |= FLAG_PATH_TRUNCATED
+    return HEADER.pack(WIRE_VERSION, flags, verb, pid, ret, fd, len(path)) + path
+
+
+def encode_into(buf, offset, verb, pid, fd, ret, path=b"", flags=0):
+    """
+    Write one message into a writable buffer (ring slot, batch frame).
+
+    path must already be bytes. Returns the offset just past the message.
+    """
+    end = offset + HEADER_SIZE + len(path)
+    if len(path) > MAX_PATH_LEN or end > len(buf):
+        raise WireError("message does not fit the buffer")
+    HEADER.pack_into(buf, offset, WIRE_VERSION, flags, verb, pid, ret, fd, len(path))
+    buf[offset + HEADER_SIZE:end] = path
+    return end
+
+
+def decode(view, offset=0):
+    """
+    Parse one message at offset.
+
+    Returns (verb, pid, fd, ret, path, next_offset). Pass a memoryview and
+    path is a zero-copy slice of it; pass bytes and it is a copy.
+    """
+    try:
+        version, flags, verb, pid, ret, fd, path_len = HEADER.unpack_from(view, offset)
+    except struct.error:
+        raise WireError("truncated header") from None
+    if version != WIRE_VERSION:
+        raise WireError(f"unsupported wire version {version}")
+    start = offset + HEADER_SIZE
+    end = start + path_len
+    if end > len(view):
+        raise WireError("truncated path")
+    return verb, pid, fd, ret, view[start:end], end
+
+
+def decode_all(view):
+    """Every message in a buffer of back-to-back messages."""
+    messages = []
+    offset, size = 0, len(view)
+    while offset < size:
+        *message, offset = decode(view, offset)
+        messages.append(message)
+    return messages
+
+
+def decode_path(path):
+    """Path bytes (or a memoryview of them) as the str the classifier expects."""
+    return str(path, "utf-8", "surrogateescape")